@@ -1,37 +1,28 @@
-import mcp.types as types
 from mcp.server.lowlevel import Server
 from mcp.server.stdio import stdio_server
 
-server = Server("mcp-simple-stdio")
+from tool_registry import ToolRegistry
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    return [
-        types.Tool(
-            name="add",
-            description="두 정수를 더합니다.",
-            inputSchema={
-                "type": "object",
-                "required": ["a", "b"],
-                "properties": {
-                    "a": {"type": "integer", "description": "첫 번째 정수"},
-                    "b": {"type": "integer", "description": "두 번째 정수"},
-                },
-            },
-        )
-    ]
+server = Server("mcp-simple-stdio")
+tools = ToolRegistry()
 
-@server.call_tool()
-async def handle_call_tool(
-    name: str, arguments: dict | None
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    if name == "add":
+@tools.tool(
+    name="add",
+    description="두 정수를 더합니다.",
+    input_schema={
+        "type": "object",
+        "required": ["a", "b"],
+        "properties": {
+            "a": {"type": "integer", "description": "첫 번째 정수"},
+            "b": {"type": "integer", "description": "두 번째 정수"},
+        },
+    },
+)
+async def add(a: int, b: int) -> int:
+    return a + b
 
-        a = arguments.get("a")
-        b = arguments.get("b")
-        
-        result = a + b
-        return [types.TextContent(type="text", text=str(result))]
+# tools/list는 미리 만들어 둔 응답을, tools/call은 이름으로 바로 찾은 도구를 사용
+tools.attach(server)
 
 async def main() -> None:
     async with stdio_server() as (read_stream, write_stream):
@@ -39,4 +30,4 @@ async def main() -> None:
 
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
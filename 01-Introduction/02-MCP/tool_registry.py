@@ -0,0 +1,119 @@
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import mcp.types as types
+from mcp.server.lowlevel import Server
+
+# JSON Schema 타입 → 허용되는 파이썬 타입
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "integer": (int,),
+    "number": (int, float),
+    "string": (str,),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+@dataclass
+class _RegisteredTool:
+    definition: types.Tool
+    handler: Callable[..., Any]
+    required: tuple[str, ...]
+    property_types: dict[str, tuple[str, tuple[type, ...]]]
+    allow_extra: bool
+
+
+class ToolRegistry:
+    """저수준 `Server`용 도구 레지스트리
+
+    도구를 이름으로 딕셔너리에 등록해 O(1)로 찾고, `list_tools` 응답은
+    등록 시점에 한 번만 만들어 매 요청마다 그대로 재사용합니다.
+    인자 검증(필수 인자, 타입)도 도구 호출 직전에 이곳에서 한 번에 처리합니다.
+    """
+
+    def __init__(self):
+        self._tools: dict[str, _RegisteredTool] = {}
+        self._list_result: types.ServerResult | None = None
+
+    def tool(self, name: str, description: str, input_schema: dict[str, Any]):
+        """도구 등록 데코레이터"""
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            properties = input_schema.get("properties", {})
+            self._tools[name] = _RegisteredTool(
+                definition=types.Tool(name=name, description=description, inputSchema=input_schema),
+                handler=fn,
+                required=tuple(input_schema.get("required", ())),
+                property_types={
+                    key: (prop["type"], _JSON_TYPES[prop["type"]])
+                    for key, prop in properties.items()
+                    if prop.get("type") in _JSON_TYPES
+                },
+                allow_extra=input_schema.get("additionalProperties", True) is not False,
+            )
+            # 도구 목록이 바뀌었으므로 캐시된 응답을 버림
+            self._list_result = None
+            return fn
+
+        return decorator
+
+    def attach(self, server: Server) -> None:
+        """`server`의 tools/list, tools/call 요청 핸들러를 이 레지스트리로 연결합니다."""
+        server.request_handlers[types.ListToolsRequest] = self._handle_list_tools
+        server.request_handlers[types.CallToolRequest] = self._handle_call_tool
+
+    def list_tools(self) -> list[types.Tool]:
+        return [registered.definition for registered in self._tools.values()]
+
+    async def call_tool(self, name: str, arguments: dict[str, Any] | None) -> list[types.ContentBlock]:
+        """이름으로 도구를 찾아 인자를 검증한 뒤 실행합니다.
+
+        Raises:
+            ValueError: 알 수 없는 도구이거나 인자가 스키마와 맞지 않는 경우
+        """
+        registered = self._tools.get(name)
+        if registered is None:
+            raise ValueError(f"알 수 없는 도구입니다: {name}")
+
+        arguments = arguments or {}
+        self._validate(registered, arguments)
+
+        result = registered.handler(**arguments)
+        if inspect.isawaitable(result):
+            result = await result
+
+        if isinstance(result, list):
+            return result
+        return [types.TextContent(type="text", text=str(result))]
+
+    async def _handle_list_tools(self, _: types.ListToolsRequest) -> types.ServerResult:
+        if self._list_result is None:
+            self._list_result = types.ServerResult(types.ListToolsResult(tools=self.list_tools()))
+        return self._list_result
+
+    async def _handle_call_tool(self, request: types.CallToolRequest) -> types.ServerResult:
+        try:
+            content = await self.call_tool(request.params.name, request.params.arguments)
+        except Exception as e:
+            return types.ServerResult(
+                types.CallToolResult(content=[types.TextContent(type="text", text=str(e))], isError=True)
+            )
+        return types.ServerResult(types.CallToolResult(content=content, isError=False))
+
+    def _validate(self, registered: _RegisteredTool, arguments: dict[str, Any]) -> None:
+        missing = [key for key in registered.required if arguments.get(key) is None]
+        if missing:
+            raise ValueError(f"필수 인자가 없습니다: {', '.join(missing)}")
+
+        for key, value in arguments.items():
+            expected = registered.property_types.get(key)
+            if expected is None:
+                if not registered.allow_extra:
+                    raise ValueError(f"알 수 없는 인자입니다: {key}")
+                continue
+            type_name, python_types = expected
+            # bool은 int의 하위 클래스이므로 integer/number 자리에는 따로 막음
+            if not isinstance(value, python_types) or (isinstance(value, bool) and type_name != "boolean"):
+                raise ValueError(f"인자 '{key}'는 {type_name} 타입이어야 합니다")
@@ -0,0 +1,80 @@
+"""Benchmark: stdio throughput of the SDK transport vs fast_stdio.
+
+Spawns bench_server.py for the low-level `Server` and for `FastMCP`, calls
+`add` many times, and reports calls/sec and JSON-RPC messages/sec (one
+request plus one response per call). Each combination is run sequentially
+and with `concurrency` calls in flight.
+
+    sdk          SDK stdio_server()  + SDK stdio_client()
+    fast-server  fast_stdio_server() + SDK stdio_client()
+    fast         fast_stdio_server() + fast_stdio_client()
+
+Usage:
+    python bench.py [calls] [concurrency]   # default: 2000 64
+"""
+import asyncio
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from fast_stdio import fast_stdio_client
+
+MODES = ["sdk", "fast-server", "fast"]
+
+
+def open_streams(kind: str, mode: str):
+    server_transport = "sdk" if mode == "sdk" else "fast"
+    args = ["bench_server.py", kind, server_transport]
+    if mode == "fast":
+        return fast_stdio_client(sys.executable, args)
+    return stdio_client(StdioServerParameters(command=sys.executable, args=args))
+
+
+async def run_calls(session: ClientSession, calls: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            result = await session.call_tool("add", {"a": i, "b": 1})
+            assert result.content[0].text == str(i + 1)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return time.perf_counter() - start
+
+
+async def measure(kind: str, mode: str, calls: int, concurrency: int) -> dict:
+    async with open_streams(kind, mode) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await run_calls(session, 100, concurrency)  # warm-up
+            return {
+                "sequential": await run_calls(session, calls, 1),
+                "concurrent": await run_calls(session, calls, concurrency),
+            }
+
+
+async def main(calls: int, concurrency: int) -> None:
+    print(f"{calls} add calls, concurrency 1 and {concurrency}")
+    print(f"{'server':>9} {'mode':>12} {'seq calls/s':>12} {'conc calls/s':>13} {'conc msgs/s':>12} {'vs sdk':>7}")
+    print("-" * 70)
+    for kind in ("lowlevel", "fastmcp"):
+        baseline = None
+        for mode in MODES:
+            result = await measure(kind, mode, calls, concurrency)
+            sequential = calls / result["sequential"]
+            concurrent = calls / result["concurrent"]
+            baseline = baseline or concurrent
+            print(
+                f"{kind:>9} {mode:>12} {sequential:>12.0f} {concurrent:>13.0f}"
+                f" {concurrent * 2:>12.0f} {concurrent / baseline:>6.2f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    asyncio.run(main(calls, concurrency))
@@ -0,0 +1,55 @@
+"""Benchmark: short sessions with a fresh subprocess each vs StdioServerPool.
+
+Each session makes one `add` call, like client.py.
+
+Usage:
+    python bench_pool.py [sessions] [pool_size]   # default: 20 2
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from fastmcp import Client
+
+from pool import StdioServerPool
+
+
+async def cold_session() -> float:
+    start = time.perf_counter()
+    async with Client("server.py") as client:
+        await client.call_tool("add", {"a": 5, "b": 3})
+    return time.perf_counter() - start
+
+
+async def pooled_session(pool: StdioServerPool) -> float:
+    start = time.perf_counter()
+    async with pool.session() as client:
+        await client.call_tool("add", {"a": 5, "b": 3})
+    return time.perf_counter() - start
+
+
+async def main(sessions: int, pool_size: int) -> None:
+    cold = [await cold_session() for _ in range(sessions)]
+
+    async with StdioServerPool("server.py", size=pool_size) as pool:
+        warm = [await pooled_session(pool) for _ in range(sessions)]
+        stats = pool.stats()
+
+    print(f"{sessions} sessions, one add call each")
+    print(f"{'':>8} {'median ms':>10} {'p95 ms':>8} {'total s':>8}")
+    for label, times in (("cold", cold), ("pooled", warm)):
+        p95 = sorted(times)[int(len(times) * 0.95) - 1]
+        print(f"{label:>8} {statistics.median(times) * 1000:>10.1f} {p95 * 1000:>8.1f} {sum(times):>8.2f}")
+    print()
+    print(
+        f"pool: {stats['cold_starts']} subprocess starts ({stats['cold_start_avg'] * 1000:.0f} ms avg),"
+        f" {stats['acquire_wait_avg'] * 1000:.1f} ms avg wait,"
+        f" {stats['saved_seconds']:.2f} s of cold start saved"
+    )
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pool_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    asyncio.run(main(sessions, pool_size))
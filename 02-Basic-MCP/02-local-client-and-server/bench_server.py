@@ -0,0 +1,85 @@
+"""`add` server used by bench.py and bench_uds.py.
+
+Usage:
+    python bench_server.py {lowlevel|fastmcp} {sdk|fast}
+    python bench_server.py {lowlevel|fastmcp} uds PATH
+    python bench_server.py fastmcp http PORT
+"""
+import sys
+
+import anyio
+import mcp.types as types
+from mcp.server.lowlevel import Server
+from mcp.server.stdio import stdio_server
+
+from fast_stdio import fast_stdio_server, run_fastmcp_stdio
+from uds import run_uds, serve_uds
+
+
+def build_lowlevel() -> Server:
+    server = Server("BenchLowLevel")
+
+    @server.list_tools()
+    async def list_tools() -> list[types.Tool]:
+        return [
+            types.Tool(
+                name="add",
+                description="Adds two integer numbers together.",
+                inputSchema={
+                    "type": "object",
+                    "required": ["a", "b"],
+                    "properties": {"a": {"type": "integer"}, "b": {"type": "integer"}},
+                },
+            )
+        ]
+
+    # Installed directly instead of @server.call_tool(): the decorator runs
+    # jsonschema.validate() on every call, which would dwarf the transport cost
+    async def call_tool(request: types.CallToolRequest) -> types.ServerResult:
+        arguments = request.params.arguments or {}
+        text = str(arguments["a"] + arguments["b"])
+        return types.ServerResult(types.CallToolResult(content=[types.TextContent(type="text", text=text)]))
+
+    server.request_handlers[types.CallToolRequest] = call_tool
+
+    return server
+
+
+def build_fastmcp():
+    # Imported here so the low-level server does not pay for loading fastmcp
+    from fastmcp import FastMCP
+
+    mcp = FastMCP(name="BenchFastMCP")
+
+    @mcp.tool
+    def add(a: int, b: int) -> int:
+        """Adds two integer numbers together."""
+        return a + b
+
+    return mcp
+
+
+async def main(kind: str, transport: str, address: str | None = None) -> None:
+    if kind == "fastmcp":
+        mcp = build_fastmcp()
+        if transport == "uds":
+            await run_uds(mcp, address)
+        elif transport == "http":
+            await mcp.run_http_async(show_banner=False, host="127.0.0.1", port=int(address), log_level="warning")
+        elif transport == "fast":
+            await run_fastmcp_stdio(mcp)
+        else:
+            await mcp.run_stdio_async(show_banner=False)
+        return
+
+    server = build_lowlevel()
+    if transport == "uds":
+        await serve_uds(server, address)
+        return
+    open_streams = fast_stdio_server if transport == "fast" else stdio_server
+    async with open_streams() as (read_stream, write_stream):
+        await server.run(read_stream, write_stream, server.create_initialization_options())
+
+
+if __name__ == "__main__":
+    anyio.run(main, *sys.argv[1:4])
@@ -0,0 +1,111 @@
+"""Benchmark: FastMCP over a Unix domain socket vs loopback streamable HTTP.
+
+Starts bench_server.py once per transport and opens `sessions` concurrent
+client sessions to that single server process. Each session calls `add`
+sequentially; reports per-call latency (p50/p99 over all calls) and total
+calls/sec.
+
+    http       Client("http://127.0.0.1:PORT/mcp")
+    uds        Client(UnixSocketTransport(PATH))
+
+Usage:
+    python bench_uds.py [calls_per_session] [sessions ...]   # default: 500 1 8 32
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from fastmcp import Client
+
+from uds import UnixSocketTransport
+
+PORT = 8766
+SOCKET = os.path.join(tempfile.gettempdir(), "bench_uds.sock")
+
+
+def start_server(transport: str) -> subprocess.Popen:
+    address = SOCKET if transport == "uds" else str(PORT)
+    return subprocess.Popen(
+        [sys.executable, "bench_server.py", "fastmcp", transport, address],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def make_client(transport: str) -> Client:
+    if transport == "uds":
+        return Client(UnixSocketTransport(SOCKET))
+    return Client(f"http://127.0.0.1:{PORT}/mcp")
+
+
+async def connect(transport: str, process: subprocess.Popen, timeout: float = 30) -> Client:
+    deadline = time.monotonic() + timeout
+    while True:
+        client = make_client(transport)
+        try:
+            await client.__aenter__()
+            return client
+        except Exception:
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_session(client: Client, calls: int) -> list[float]:
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        result = await client.call_tool("add", {"a": i, "b": 1})
+        latencies.append(time.perf_counter() - start)
+        assert result.data == i + 1
+    return latencies
+
+
+async def measure(transport: str, process: subprocess.Popen, sessions: int, calls: int) -> dict:
+    clients = await asyncio.gather(*(connect(transport, process) for _ in range(sessions)))
+    try:
+        await asyncio.gather(*(run_session(client, 20) for client in clients))  # warm-up
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_session(client, calls) for client in clients))
+        elapsed = time.perf_counter() - start
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+    latencies = sorted(latency for result in results for latency in result)
+    return {
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "throughput": len(latencies) / elapsed,
+    }
+
+
+async def main(calls: int, session_counts: list[int]) -> None:
+    print(f"FastMCP add server, {calls} sequential calls per session, one server process")
+    print(f"{'sessions':>8} {'transport':>9} {'p50 ms':>8} {'p99 ms':>8} {'calls/s':>8} {'vs http':>8}")
+    print("-" * 55)
+    results = {}
+    for transport in ("http", "uds"):
+        process = start_server(transport)
+        try:
+            for sessions in session_counts:
+                results[sessions, transport] = await measure(transport, process, sessions, calls)
+        finally:
+            process.terminate()
+            process.wait()
+    for sessions in session_counts:
+        baseline = results[sessions, "http"]["throughput"]
+        for transport in ("http", "uds"):
+            result = results[sessions, transport]
+            print(
+                f"{sessions:>8} {transport:>9} {result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f}"
+                f" {result['throughput']:>8.0f} {result['throughput'] / baseline:>7.2f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    session_counts = [int(arg) for arg in sys.argv[2:]] or [1, 8, 32]
+    asyncio.run(main(calls, session_counts))
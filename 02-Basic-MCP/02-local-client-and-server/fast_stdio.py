@@ -0,0 +1,254 @@
+"""Line-delimited JSON-RPC over stdio with fewer thread hops and syscalls.
+
+The SDK's `stdio_server()` wraps stdin/stdout in `anyio.wrap_file`, so every
+line read and every write + flush is handed to a worker thread, and each
+message is written with its own syscall. This module reads the pipes with
+asyncio directly, parses every complete line in a chunk at once, and writes
+all responses that are ready in a single `write()`.
+
+Server:
+    async with fast_stdio_server() as (read_stream, write_stream):
+        await server.run(read_stream, write_stream, server.create_initialization_options())
+
+Client:
+    async with Client(FastStdioTransport("python", ["server.py"])) as client:
+        ...
+"""
+import asyncio
+import contextlib
+import os
+import sys
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Protocol
+
+import anyio
+import mcp.types as types
+import pydantic_core
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.server.lowlevel import NotificationOptions
+from mcp.server.stdio import stdio_server
+from mcp.shared.message import SessionMessage
+
+try:
+    import orjson
+except ImportError:  # optional faster codec
+    orjson = None
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+READ_CHUNK = 64 * 1024
+STREAM_LIMIT = 16 * 1024 * 1024
+# Messages allowed to wait between the pipes and the session in each direction
+STREAM_BUFFER = 64
+# Upper bound on messages coalesced into one write
+MAX_WRITE_BATCH = 256
+
+ReadStream = MemoryObjectReceiveStream[SessionMessage | Exception]
+WriteStream = MemoryObjectSendStream[SessionMessage]
+
+
+class Codec(Protocol):
+    def decode(self, line: bytes) -> types.JSONRPCMessage: ...
+
+    def encode(self, message: types.JSONRPCMessage) -> bytes: ...
+
+
+class PydanticCodec:
+    """The SDK's own encoding, but straight to bytes."""
+
+    def decode(self, line: bytes) -> types.JSONRPCMessage:
+        return types.JSONRPCMessage.model_validate_json(line)
+
+    def encode(self, message: types.JSONRPCMessage) -> bytes:
+        return pydantic_core.to_json(message, by_alias=True, exclude_none=True) + b"\n"
+
+
+class OrjsonCodec:
+    """orjson for the text <-> dict step, pydantic only for validation."""
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("OrjsonCodec requires the orjson package")
+
+    def decode(self, line: bytes) -> types.JSONRPCMessage:
+        return types.JSONRPCMessage.model_validate(orjson.loads(line))
+
+    def encode(self, message: types.JSONRPCMessage) -> bytes:
+        return orjson.dumps(
+            message.model_dump(by_alias=True, exclude_none=True),
+            default=pydantic_core.to_jsonable_python,
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+
+
+def default_codec() -> Codec:
+    return OrjsonCodec() if orjson is not None else PydanticCodec()
+
+
+@contextlib.asynccontextmanager
+async def fast_stdio_server(codec: Codec | None = None) -> AsyncIterator[tuple[ReadStream, WriteStream]]:
+    """Drop-in replacement for `mcp.server.stdio.stdio_server()`.
+
+    Falls back to the SDK transport when stdin/stdout are not pipes
+    (e.g. redirected from a regular file), which asyncio cannot watch.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=STREAM_LIMIT)
+    # Duplicate the descriptors so closing the transports leaves sys.stdin/stdout alone
+    stdin = os.fdopen(os.dup(sys.stdin.fileno()), "rb", buffering=0)
+    stdout = os.fdopen(os.dup(sys.stdout.fileno()), "wb", buffering=0)
+    try:
+        read_transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stdin)
+        write_transport, write_protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, stdout)
+    except ValueError:
+        stdin.close()
+        stdout.close()
+        async with stdio_server() as streams:
+            yield streams
+        return
+
+    writer = asyncio.StreamWriter(write_transport, write_protocol, None, loop)
+    try:
+        async with _framed_streams(reader, writer, codec or default_codec()) as streams:
+            yield streams
+    finally:
+        read_transport.close()
+
+
+@contextlib.asynccontextmanager
+async def fast_stdio_client(
+    command: str,
+    args: list[str] | None = None,
+    env: dict[str, str] | None = None,
+    cwd: str | None = None,
+    codec: Codec | None = None,
+) -> AsyncIterator[tuple[ReadStream, WriteStream]]:
+    """Spawn a stdio server and talk to it like `mcp.client.stdio.stdio_client()`."""
+    process = await asyncio.create_subprocess_exec(
+        command,
+        *(args or []),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        env=env,
+        cwd=cwd,
+        limit=STREAM_LIMIT,
+    )
+    try:
+        async with _framed_streams(process.stdout, process.stdin, codec or default_codec()) as streams:
+            yield streams
+    finally:
+        if process.stdin is not None and not process.stdin.is_closing():
+            process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=2)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+
+def __getattr__(name: str):
+    # FastStdioTransport subclasses a fastmcp class. Building it on first access
+    # keeps fastmcp (and its HTTP and auth stacks) out of low-level servers that
+    # only need fast_stdio_server().
+    if name == "FastStdioTransport":
+        globals()[name] = _build_fast_stdio_transport()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _build_fast_stdio_transport() -> type:
+    from fastmcp.client.transports import ClientTransport
+    from mcp import ClientSession
+
+    class FastStdioTransport(ClientTransport):
+        """fastmcp `Client` transport backed by `fast_stdio_client()`."""
+
+        def __init__(
+            self,
+            command: str,
+            args: list[str] | None = None,
+            env: dict[str, str] | None = None,
+            cwd: str | None = None,
+            codec: Codec | None = None,
+        ):
+            self.command = command
+            self.args = args or []
+            self.env = env
+            self.cwd = cwd
+            self.codec = codec
+
+        @contextlib.asynccontextmanager
+        async def connect_session(self, **session_kwargs) -> AsyncIterator[ClientSession]:
+            async with fast_stdio_client(self.command, self.args, self.env, self.cwd, self.codec) as (read, write):
+                async with ClientSession(read, write, **session_kwargs) as session:
+                    yield session
+
+        def __repr__(self) -> str:
+            return f"<FastStdio(command='{self.command}', args={self.args})>"
+
+    FastStdioTransport.__module__ = __name__
+    FastStdioTransport.__qualname__ = "FastStdioTransport"
+    return FastStdioTransport
+
+
+async def run_fastmcp_stdio(mcp: "FastMCP", codec: Codec | None = None) -> None:
+    """`mcp.run()` for stdio, on the fast transport."""
+    async with fast_stdio_server(codec) as (read_stream, write_stream):
+        await mcp._mcp_server.run(
+            read_stream,
+            write_stream,
+            mcp._mcp_server.create_initialization_options(NotificationOptions(tools_changed=True)),
+        )
+
+
+@contextlib.asynccontextmanager
+async def _framed_streams(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    codec: Codec,
+) -> AsyncIterator[tuple[ReadStream, WriteStream]]:
+    read_send, read_receive = anyio.create_memory_object_stream[SessionMessage | Exception](STREAM_BUFFER)
+    write_send, write_receive = anyio.create_memory_object_stream[SessionMessage](STREAM_BUFFER)
+
+    async def read_loop():
+        async with read_send:
+            pending = b""
+            while chunk := await reader.read(READ_CHUNK):
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    await _deliver(line)
+            await _deliver(pending)
+
+    async def _deliver(line: bytes):
+        if not line.strip():
+            return
+        try:
+            message = codec.decode(line)
+        except Exception as exc:
+            await read_send.send(exc)
+            return
+        await read_send.send(SessionMessage(message))
+
+    async def write_loop():
+        try:
+            async with write_receive:
+                async for session_message in write_receive:
+                    batch = [codec.encode(session_message.message)]
+                    # Everything already queued goes out in the same write
+                    while len(batch) < MAX_WRITE_BATCH:
+                        try:
+                            batch.append(codec.encode(write_receive.receive_nowait().message))
+                        except (anyio.WouldBlock, anyio.EndOfStream):
+                            break
+                    writer.write(b"".join(batch))
+                    await writer.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(read_loop)
+        tg.start_soon(write_loop)
+        yield read_receive, write_send
@@ -0,0 +1,214 @@
+"""Pool of prewarmed stdio server subprocesses.
+
+`Client("server.py")` starts a fresh interpreter per session, which then
+imports fastmcp and completes the MCP handshake before the first call can
+run. `StdioServerPool` keeps `size` initialized clients ready and hands them
+out, so a short session skips that cold start entirely.
+
+    async with StdioServerPool("server.py", size=4) as pool:
+        async with pool.session() as client:
+            await client.call_tool("add", {"a": 5, "b": 3})
+"""
+import asyncio
+import contextlib
+import logging
+import statistics
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+logger = logging.getLogger(__name__)
+
+
+class StdioServerPool:
+    """Keeps `size` initialized stdio server subprocesses warm.
+
+    A subprocess is recycled (closed and replaced in the background) when:
+
+    - it has served `max_uses` sessions,
+    - the session body raised, so its state is unknown,
+    - it no longer answers a ping when it is handed out,
+    - `reset` is given and raises.
+
+    A subprocess that fails to start is retried up to `start_attempts`
+    times with exponential backoff from `retry_delay`. Once no subprocess
+    is running or starting, waiting sessions raise instead of hanging, and
+    the next `session()` starts the subprocesses afresh.
+
+    `reset(client)` runs when a session returns its client, for servers that
+    keep per-session state. `stats()` reports how much cold-start latency
+    the pool saved.
+    """
+
+    def __init__(
+        self,
+        script: str,
+        size: int = 2,
+        max_uses: int = 100,
+        args: list[str] | None = None,
+        reset: Callable[[Client], Awaitable[None]] | None = None,
+        start_timeout: float = 30,
+        start_attempts: int = 5,
+        retry_delay: float = 0.5,
+    ):
+        self.script = script
+        self.size = size
+        self.max_uses = max_uses
+        self.args = args or []
+        self.reset = reset
+        self.start_timeout = start_timeout
+        self.start_attempts = start_attempts
+        self.retry_delay = retry_delay
+
+        self._ready: asyncio.Queue[Client | None] = asyncio.Queue()  # None: no server left
+        self._uses: dict[Client, int] = {}
+        self._spawning: set[asyncio.Task] = set()
+        self._closed = False
+        self.last_start_error: BaseException | None = None
+
+        self.cold_starts: list[float] = []
+        self.acquire_waits: list[float] = []
+        self.recycled = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def start(self) -> None:
+        """Start all subprocesses and wait until they are initialized."""
+        for _ in range(self.size):
+            self._spawn()
+        try:
+            await asyncio.gather(*self._spawning)
+        except BaseException:
+            # __aexit__ does not run when __aenter__ fails: stop the servers that did start
+            await self.aclose()
+            raise
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[Client]:
+        """Borrow a warm, connected client for one session."""
+        client = await self._acquire()
+        try:
+            yield client
+        except BaseException:
+            await self._recycle(client)
+            raise
+        await self._release(client)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        spawning = list(self._spawning)
+        for task in spawning:
+            task.cancel()
+        await asyncio.gather(*spawning, return_exceptions=True)
+        while not self._ready.empty():
+            client = self._ready.get_nowait()
+            if client is not None:
+                await self._close(client)
+
+    def stats(self) -> dict:
+        """Cold-start cost, time spent waiting for a warm server, and the difference saved.
+
+        `saved_seconds` is an estimate: each session is assumed to have cost one
+        average cold start without the pool. Starts measured while several
+        subprocesses boot at once run slower, which inflates the estimate.
+        """
+        cold_start = statistics.mean(self.cold_starts) if self.cold_starts else 0.0
+        waited = sum(self.acquire_waits)
+        return {
+            "sessions": len(self.acquire_waits),
+            "cold_starts": len(self.cold_starts),
+            "recycled": self.recycled,
+            "cold_start_avg": cold_start,
+            "acquire_wait_avg": waited / len(self.acquire_waits) if self.acquire_waits else 0.0,
+            "saved_seconds": max(0.0, cold_start * len(self.acquire_waits) - waited),
+        }
+
+    async def _acquire(self) -> Client:
+        start = time.perf_counter()
+        if not self._uses and not self._spawning and not self._closed:
+            # Every server failed earlier: drop the marker and try starting them again
+            while not self._ready.empty():
+                self._ready.get_nowait()
+            for _ in range(self.size):
+                self._spawn()
+        while True:
+            # No timeout: borrowed clients come back, and failed starts queue the marker
+            client = await self._ready.get()
+            if client is None:
+                # No subprocess left: pass the marker on to the other waiting sessions
+                self._ready.put_nowait(None)
+                raise RuntimeError(f"No {self.script} server could be started") from self.last_start_error
+            try:
+                await client.ping()
+            except Exception:
+                await self._recycle(client)
+                continue
+            self.acquire_waits.append(time.perf_counter() - start)
+            return client
+
+    async def _release(self, client: Client) -> None:
+        self._uses[client] += 1
+        if self._uses[client] >= self.max_uses or self._closed:
+            await self._recycle(client)
+            return
+        if self.reset is not None:
+            try:
+                await self.reset(client)
+            except Exception:
+                await self._recycle(client)
+                return
+        self._ready.put_nowait(client)
+
+    async def _recycle(self, client: Client) -> None:
+        self.recycled += 1
+        await self._close(client)
+        if not self._closed:
+            self._spawn()
+
+    def _spawn(self) -> None:
+        task = asyncio.create_task(self._start_one())
+        self._spawning.add(task)
+        task.add_done_callback(self._spawned)
+
+    def _spawned(self, task: asyncio.Task) -> None:
+        self._spawning.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error("Giving up on a %s server: %r", self.script, task.exception())
+        if not self._uses and not self._spawning and not self._closed:
+            # Wake waiting sessions with a marker instead of letting them time out
+            self._ready.put_nowait(None)
+
+    async def _start_one(self) -> None:
+        for attempt in range(self.start_attempts):
+            if attempt:
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            client = Client(PythonStdioTransport(self.script, args=self.args, keep_alive=False))
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(client.__aenter__(), timeout=self.start_timeout)
+            except asyncio.CancelledError:
+                await self._close(client)
+                raise
+            except Exception as e:
+                self.last_start_error = e
+                logger.warning("Starting %s failed (attempt %d/%d): %r", self.script, attempt + 1, self.start_attempts, e)
+                await self._close(client)
+                continue
+            self.cold_starts.append(time.perf_counter() - start)
+            self._uses[client] = 0
+            self._ready.put_nowait(client)
+            return
+        raise RuntimeError(f"{self.script} failed to start {self.start_attempts} times") from self.last_start_error
+
+    async def _close(self, client: Client) -> None:
+        self._uses.pop(client, None)
+        with contextlib.suppress(Exception):
+            await client.close()
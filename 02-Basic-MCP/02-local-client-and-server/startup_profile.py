@@ -0,0 +1,156 @@
+"""Startup profile for a server entry point: import-time breakdown and time-to-ready.
+
+Time to ready is measured from spawning the interpreter until the server
+answers `initialize` (stdio) or accepts connections (HTTP), as the median of
+`--runs` plain runs. One extra run under `python -X importtime` gives the
+import breakdown, grouped by stack and by top-level module.
+
+Usage:
+    python startup_profile.py server.py
+    python startup_profile.py bench_server.py --runs 5 -- lowlevel fast
+    python startup_profile.py ../03-remote-client-and-server/server.py --transport http -- http
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+# Top-level packages → the stack they belong to
+STACKS = {
+    "http": {"starlette", "uvicorn", "sse_starlette", "httpx", "httpcore", "h11", "h2", "websockets", "multipart", "python_multipart"},
+    "auth": {"authlib", "cryptography", "jwt", "cffi"},
+    "validation": {"pydantic", "pydantic_core", "pydantic_settings", "jsonschema", "jsonschema_specifications", "referencing", "rpds", "annotated_types", "typing_inspection", "dotenv"},
+    "console": {"rich", "typer", "click", "pygments", "markdown_it", "mdurl"},
+    "async": {"anyio", "sniffio", "asyncio", "concurrent"},
+    "mcp": {"mcp"},
+    "fastmcp": {"fastmcp", "openapi_pydantic", "exceptiongroup"},
+}
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-profile", "version": "1.0"},
+    },
+}
+
+
+def stack_of(module: str) -> str:
+    top = module.split(".", 1)[0]
+    for stack, packages in STACKS.items():
+        if top in packages:
+            return stack
+    return "stdlib/other"
+
+
+def time_to_ready(command: list[str], transport: str, port: int, timeout: float = 60) -> tuple[float, str]:
+    """Spawn the server and return (seconds until ready, captured stderr)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    try:
+        if transport == "stdio":
+            process.stdin.write((json.dumps(INITIALIZE) + "\n").encode())
+            process.stdin.flush()
+            while True:
+                line = process.stdout.readline()
+                if not line:
+                    raise RuntimeError(f"Server exited before answering initialize (code {process.wait()})")
+                if json.loads(line).get("id") == 1:
+                    break
+        else:
+            deadline = start + timeout
+            while True:
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                    break
+                except OSError:
+                    if time.perf_counter() > deadline or process.poll() is not None:
+                        raise RuntimeError(f"Server did not start listening on port {port}")
+                    time.sleep(0.005)
+        ready = time.perf_counter() - start
+    finally:
+        # communicate() closes stdin, which ends a stdio server
+        if transport != "stdio":
+            process.terminate()
+        try:
+            _, stderr = process.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            _, stderr = process.communicate()
+    return ready, stderr.decode(errors="replace")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every `-X importtime` line."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        self_us, cumulative_us, module = int(fields[0]), int(fields[1]), fields[2].strip()
+        imports.append((module, self_us, cumulative_us))
+    return imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("script", nargs="?", default="server.py")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    argv, script_args = sys.argv[1:], []
+    if "--" in argv:
+        argv, script_args = argv[: argv.index("--")], argv[argv.index("--") + 1 :]
+    options = parser.parse_args(argv)
+
+    command = [sys.executable, options.script, *script_args]
+    ready_times = [time_to_ready(command, options.transport, options.port)[0] for _ in range(options.runs)]
+    ready = statistics.median(ready_times)
+
+    # `-X importtime` slows imports down, so its numbers are only compared with each other
+    traced_ready, stderr = time_to_ready(
+        [sys.executable, "-X", "importtime", options.script, *script_args], options.transport, options.port
+    )
+    imports = parse_importtime(stderr)
+    import_total = sum(self_us for _, self_us, _ in imports) / 1e6
+
+    by_stack: Counter = Counter()
+    by_package: Counter = Counter()
+    for module, self_us, _ in imports:
+        by_stack[stack_of(module)] += self_us / 1e6
+        by_package[module.split(".", 1)[0]] += self_us / 1e6
+
+    print(f"{' '.join(command[1:])} ({options.transport})")
+    print(f"time to ready: {ready * 1000:.0f} ms (median of {options.runs}, min {min(ready_times) * 1000:.0f} ms)")
+    print(
+        f"under -X importtime: {traced_ready * 1000:.0f} ms to ready,"
+        f" {import_total * 1000:.0f} ms importing {len(imports)} modules"
+        f" ({import_total / traced_ready:.0%}), the rest is interpreter start, setup and handshake"
+    )
+    print()
+    print(f"{'stack':<14} {'ms':>8} {'share':>6}")
+    for stack, seconds in by_stack.most_common():
+        print(f"{stack:<14} {seconds * 1000:>8.0f} {seconds / import_total:>6.0%}")
+    print()
+    print(f"{'package':<24} {'stack':<14} {'ms':>8}")
+    for package, seconds in by_package.most_common(options.top):
+        print(f"{package:<24} {stack_of(package):<14} {seconds * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Line-delimited JSON-RPC over a Unix domain socket.
+
+For a client and server on the same host: no TCP, no HTTP framing and no
+SSE, just the stdio wire format on a socket. Unlike stdio, one server
+process accepts any number of connections, and each connection is its own
+MCP session. The framing, batching and codecs are the ones in fast_stdio.
+
+Server:
+    anyio.run(run_uds, mcp, "/tmp/calculator.sock")
+
+Client:
+    async with Client(UnixSocketTransport("/tmp/calculator.sock")) as client:
+        ...
+"""
+import asyncio
+import contextlib
+import os
+import socket
+import stat
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
+
+from mcp.server.lowlevel import NotificationOptions, Server
+
+from fast_stdio import STREAM_LIMIT, Codec, ReadStream, WriteStream, _framed_streams, default_codec
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+
+async def serve_uds(
+    server: Server,
+    path: str,
+    codec: Codec | None = None,
+    initialization_options: Any = None,
+    mode: int = 0o600,
+) -> None:
+    """Accept connections on `path` forever, running one `server` session per connection.
+
+    The socket file is created with `mode` (owner only by default) and
+    removed on exit. A stale socket left by a crashed server is replaced;
+    one that still accepts connections is not.
+    """
+    codec = codec or default_codec()
+    options = initialization_options or server.create_initialization_options()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async with _framed_streams(reader, writer, codec) as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options)
+
+    _remove_stale_socket(path)
+    old_umask = os.umask(0o777 & ~mode)
+    try:
+        listener = await asyncio.start_unix_server(handle, path, limit=STREAM_LIMIT)
+    finally:
+        os.umask(old_umask)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+async def run_uds(mcp: "FastMCP", path: str, codec: Codec | None = None) -> None:
+    """`mcp.run()` for a Unix domain socket."""
+    await serve_uds(
+        mcp._mcp_server,
+        path,
+        codec,
+        mcp._mcp_server.create_initialization_options(NotificationOptions(tools_changed=True)),
+    )
+
+
+@contextlib.asynccontextmanager
+async def uds_client(path: str, codec: Codec | None = None) -> AsyncIterator[tuple[ReadStream, WriteStream]]:
+    """Connect to a `serve_uds()` server; yields streams for `ClientSession`."""
+    reader, writer = await asyncio.open_unix_connection(path, limit=STREAM_LIMIT)
+    async with _framed_streams(reader, writer, codec or default_codec()) as streams:
+        yield streams
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(path)
+            return
+    raise OSError(f"another server is already listening on {path}")
+
+
+def __getattr__(name: str):
+    # Built on first access for the same reason as fast_stdio.FastStdioTransport
+    if name == "UnixSocketTransport":
+        globals()[name] = _build_unix_socket_transport()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _build_unix_socket_transport() -> type:
+    from fastmcp.client.transports import ClientTransport
+    from mcp import ClientSession
+
+    class UnixSocketTransport(ClientTransport):
+        """fastmcp `Client` transport backed by `uds_client()`."""
+
+        def __init__(self, path: str, codec: Codec | None = None):
+            self.path = path
+            self.codec = codec
+
+        @contextlib.asynccontextmanager
+        async def connect_session(self, **session_kwargs) -> AsyncIterator[ClientSession]:
+            async with uds_client(self.path, self.codec) as (read, write):
+                async with ClientSession(read, write, **session_kwargs) as session:
+                    yield session
+
+        def __repr__(self) -> str:
+            return f"<UnixSocket(path='{self.path}')>"
+
+    UnixSocketTransport.__module__ = __name__
+    UnixSocketTransport.__qualname__ = "UnixSocketTransport"
+    return UnixSocketTransport
@@ -0,0 +1,145 @@
+"""Many tool calls in one request.
+
+MCP dropped JSON-RPC batching from the protocol (2025-06-18), so batches
+travel as a regular tool call: the server exposes a `call_tools_batch`
+tool that runs each call through its own middleware and tool manager and
+returns the results in the same order. Because it is just a tool, it works
+over every transport (stdio, HTTP, SSE).
+
+Server:
+    enable_batch_calls(mcp)
+
+Client:
+    results = await call_tools_batch(client, [("add", {"a": 1, "b": 2}), ...])
+"""
+import asyncio
+from functools import partial
+from typing import Any
+
+import fastmcp
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import NotFoundError, ToolError
+from fastmcp.server.dependencies import get_context
+from fastmcp.server.middleware import MiddlewareContext
+from mcp.types import CallToolRequestParams
+
+BATCH_TOOL = "call_tools_batch"
+
+
+def enable_batch_calls(
+    mcp: FastMCP,
+    max_calls: int = 1000,
+    max_concurrency: int = 16,
+    mask_error_details: bool | None = None,
+) -> None:
+    """Register the `call_tools_batch` tool on `mcp`.
+
+    Calls run concurrently, at most `max_concurrency` at a time. Sync tools
+    run inline, so for cheap tools like `add` the batch is effectively
+    sequential and costs one round trip instead of `len(calls)`.
+
+    Errors are reported as a single call would report them: a `ToolError`
+    message as-is, any other exception masked when `mask_error_details`
+    is set (default: `fastmcp.settings.mask_error_details`).
+    """
+    if mask_error_details is None:
+        mask_error_details = fastmcp.settings.mask_error_details
+    output_wrapped: dict[str, bool] = {}
+
+    async def run_tool(context: MiddlewareContext) -> Any:
+        name = context.message.name
+        try:
+            tool = await mcp.get_tool(name)
+        except NotFoundError:
+            raise ToolError(f"Unknown tool: {name}") from None
+        if not tool.enabled:
+            raise ToolError(f"Unknown tool: {name}")
+        try:
+            return await tool.run(context.message.arguments or {})
+        except ToolError:
+            raise
+        except Exception as e:
+            if mask_error_details:
+                raise ToolError(f"Error calling tool {name!r}") from e
+            raise ToolError(f"Error calling tool {name!r}: {e}") from e
+
+    async def call_through_middleware(name: str, arguments: dict[str, Any]) -> Any:
+        # The same middleware chain a tools/call request goes through
+        chain = run_tool
+        for middleware in reversed(mcp.middleware):
+            chain = partial(middleware, call_next=chain)
+        return await chain(
+            MiddlewareContext(
+                message=CallToolRequestParams(name=name, arguments=arguments),
+                source="client",
+                type="request",
+                method="tools/call",
+                fastmcp_context=get_context(),
+            )
+        )
+
+    async def run_one(name: str, arguments: dict[str, Any], semaphore: asyncio.Semaphore) -> dict[str, Any]:
+        if name == BATCH_TOOL:
+            return {"error": "Batches cannot be nested"}
+        async with semaphore:
+            try:
+                result = await call_through_middleware(name, arguments)
+            except Exception as e:
+                # ToolErrors carry the (possibly masked) message from run_tool; anything
+                # else came from middleware and is reported as the tools/call handler would
+                return {"error": str(e)}
+
+        if result.structured_content is None:
+            return {"content": [block.model_dump(exclude_none=True) for block in result.content]}
+        if name not in output_wrapped:
+            schema = (await mcp.get_tool(name)).output_schema or {}
+            output_wrapped[name] = bool(schema.get("x-fastmcp-wrap-result"))
+        if output_wrapped[name]:
+            return {"data": result.structured_content["result"]}
+        return {"data": result.structured_content}
+
+    @mcp.tool(name=BATCH_TOOL)
+    async def call_tools_batch(calls: list[dict[str, Any]]) -> dict[str, Any]:
+        """Run many tool calls in one request.
+
+        Each call is {"name": ..., "arguments": {...}}. Results are returned in
+        the same order, each either {"data": ...}, {"content": [...]} for tools
+        without structured output, or {"error": "..."}.
+        """
+        if len(calls) > max_calls:
+            raise ToolError(f"Batch too large: {len(calls)} calls (max {max_calls})")
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results = await asyncio.gather(
+            *(run_one(call.get("name", ""), call.get("arguments") or {}, semaphore) for call in calls)
+        )
+        return {"results": results}
+
+
+async def call_tools_batch(
+    client: Client,
+    calls: list[tuple[str, dict[str, Any]]],
+    chunk_size: int = 1000,
+    return_exceptions: bool = False,
+    timeout: float | None = None,
+) -> list[Any]:
+    """Call many tools in as few round trips as possible.
+
+    `calls` is a list of (tool name, arguments). Returns one value per call,
+    in order: the tool's structured data, or its content blocks when it has
+    none. A failed call raises `ToolError`, or is returned in its place when
+    `return_exceptions` is true. Large batches are split into `chunk_size`
+    requests, which must not exceed the server's `max_calls`.
+    """
+    results: list[Any] = []
+    for start in range(0, len(calls), chunk_size):
+        chunk = [{"name": name, "arguments": arguments} for name, arguments in calls[start : start + chunk_size]]
+        response = await client.call_tool(BATCH_TOOL, {"calls": chunk}, timeout=timeout)
+        for (name, _), item in zip(calls[start : start + chunk_size], response.structured_content["results"]):
+            if "error" in item:
+                error = ToolError(f"{name}: {item['error']}")
+                if not return_exceptions:
+                    raise error
+                results.append(error)
+            else:
+                results.append(item["data"] if "data" in item else item["content"])
+    return results
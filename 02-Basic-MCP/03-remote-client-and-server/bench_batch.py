@@ -0,0 +1,77 @@
+"""Benchmark: N separate `add` calls vs one `call_tools_batch` request.
+
+Starts server.py itself, once over stdio and once over HTTP (port 8000).
+
+Usage:
+    python bench_batch.py [calls]   # default: 1000
+"""
+import asyncio
+import subprocess
+import sys
+import time
+
+import httpx
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+from batch import call_tools_batch
+
+URL = "http://localhost:8000/mcp"
+
+
+async def wait_for_http(url: str, timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while True:
+            try:
+                await http.get(url)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+async def measure(client: Client, calls: int) -> dict:
+    arguments = [{"a": i, "b": 1} for i in range(calls)]
+
+    start = time.perf_counter()
+    for args in arguments:
+        await client.call_tool("add", args)
+    separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await call_tools_batch(client, [("add", args) for args in arguments])
+    batched = time.perf_counter() - start
+
+    assert results == [i + 1 for i in range(calls)]
+    return {"separate": separate, "batched": batched}
+
+
+async def main(calls: int) -> None:
+    rows = []
+    async with Client(PythonStdioTransport("server.py", args=["stdio"])) as client:
+        rows.append(("stdio", await measure(client, calls)))
+
+    server = subprocess.Popen([sys.executable, "server.py", "http"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        await wait_for_http(URL)
+        async with Client(URL) as client:
+            rows.append(("http", await measure(client, calls)))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{calls} add calls")
+    print(f"{'transport':>9} {'separate s':>11} {'batched s':>10} {'calls/s sep':>12} {'calls/s batch':>14} {'speedup':>8}")
+    print("-" * 69)
+    for transport, result in rows:
+        print(
+            f"{transport:>9} {result['separate']:>11.3f} {result['batched']:>10.3f}"
+            f" {calls / result['separate']:>12.0f} {calls / result['batched']:>14.0f}"
+            f" {result['separate'] / result['batched']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -1,11 +1,18 @@
 from fastmcp import Client
 
+from batch import call_tools_batch
+
 async def main():
-    # Connect via stdio to a local script
+    # Connect via HTTP to a running server
     async with Client("http://localhost:8000/mcp") as client:
         tools = await client.list_tools()
         print(f"Available tools: {tools}")
 
+        # 1,000 add calls in a single round trip, results in the same order
+        calls = [("add", {"a": i, "b": i}) for i in range(1000)]
+        results = await call_tools_batch(client, calls)
+        print(f"Batch results: {results[:5]} ... {results[-1]} ({len(results)} calls)")
+
 if __name__ == '__main__':
     import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -1,5 +1,9 @@
+import sys
+
 from fastmcp import FastMCP
 
+from batch import enable_batch_calls
+
 mcp = FastMCP(name="CalculatorServer")
 
 @mcp.tool
@@ -7,4 +11,8 @@ def add(a: int, b: int) -> int:
     """Adds two integer numbers together."""
     return a + b
 
-mcp.run(transport="http")
\ No newline at end of file
+# Lets clients send many tool calls in one request (see batch.py)
+enable_batch_calls(mcp)
+
+# python server.py stdio 로 실행하면 stdio로도 같은 서버를 띄울 수 있음
+mcp.run(transport=sys.argv[1] if len(sys.argv) > 1 else "http")
@@ -0,0 +1,144 @@
+"""Benchmark: connecting to many MCP servers one by one vs with ToolRouter.
+
+Serves `servers` FastMCP HTTP apps from this process (every one has `add`,
+so the name collides, plus a tool of its own), each request delayed by
+`latency_ms` to stand in for a network round trip. Then it opens and lists
+them the way client.py does for its single server, sequentially and with
+ToolRouter: first all healthy, then with one endpoint that accepts
+connections but never answers and one port with nothing listening, using
+the same connect timeout for both.
+
+Usage:
+    python bench_router.py [servers] [latency_ms] [connect_timeout]   # default: 12 50 3
+"""
+import asyncio
+import contextlib
+import sys
+import time
+
+import uvicorn
+from fastmcp import Client, FastMCP
+from starlette.middleware import Middleware
+
+from router import ToolRouter
+
+BASE_PORT = 8810
+
+
+class Latency:
+    """Delays every HTTP request, like a round trip to a remote host."""
+
+    def __init__(self, app, seconds: float):
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await asyncio.sleep(self.seconds)
+        await self.app(scope, receive, send)
+
+
+def build_server(i: int) -> FastMCP:
+    mcp = FastMCP(name=f"server{i}")
+
+    @mcp.tool
+    def add(a: int, b: int) -> int:
+        """Adds two integer numbers together."""
+        return a + b
+
+    @mcp.tool(name=f"tool_{i}")
+    def own_tool() -> str:
+        """A tool only this server has."""
+        return f"server{i}"
+
+    return mcp
+
+
+async def start_servers(count: int, latency: float) -> tuple[list[uvicorn.Server], asyncio.Server]:
+    servers = []
+    for i in range(count):
+        app = build_server(i).http_app(middleware=[Middleware(Latency, seconds=latency)])
+        config = uvicorn.Config(app, host="127.0.0.1", port=BASE_PORT + i, log_level="critical")
+        servers.append(uvicorn.Server(config))
+        servers[-1].task = asyncio.create_task(servers[-1].serve())
+
+    async def never_answer(reader, writer):
+        await reader.read()
+
+    hung = await asyncio.start_server(never_answer, "127.0.0.1", BASE_PORT + count)
+    while not all(server.started for server in servers):
+        await asyncio.sleep(0.05)
+    return servers, hung
+
+
+async def connect_sequentially(urls: dict[str, str], timeout: float) -> tuple[int, list[Client]]:
+    tools, clients = 0, []
+    for url in urls.values():
+        client = Client(url)
+        try:
+            async with asyncio.timeout(timeout):
+                await client.__aenter__()
+                tools += len(await client.list_tools())
+            clients.append(client)
+        except Exception:
+            # close() waits for a stuck connect; cancelling it cancels the connect as well
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(client.close(), 0.1)
+    return tools, clients
+
+
+async def compare(urls: dict[str, str], timeout: float) -> ToolRouter:
+    start = time.perf_counter()
+    tools, clients = await connect_sequentially(urls, timeout)
+    sequential = time.perf_counter() - start
+    await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+    print(f"  sequential: {sequential:6.2f}s  {tools} tools from {len(clients)} servers")
+
+    router = ToolRouter(urls, connect_timeout=timeout)
+    start = time.perf_counter()
+    await router.__aenter__()
+    concurrent = time.perf_counter() - start
+    print(
+        f"  ToolRouter: {concurrent:6.2f}s  {len(router.openai_tools)} tools from {len(router.clients)} servers"
+        f"  ({sequential / concurrent:.1f}x faster)"
+    )
+    if router.failed:
+        print(f"  failed: {router.failed}")
+    return router
+
+
+async def main(count: int, latency_ms: float, timeout: float) -> None:
+    servers, hung = await start_servers(count, latency_ms / 1000)
+    urls = {f"server{i}": f"http://127.0.0.1:{BASE_PORT + i}/mcp" for i in range(count)}
+    print(f"{count} servers, {latency_ms:.0f} ms per request, connect timeout {timeout}s\n")
+    try:
+        print("all healthy")
+        router = await compare(urls, timeout)
+        await router.__aexit__(None, None, None)
+
+        print("\nwith one server that never answers and one that is down")
+        urls["hung"] = f"http://127.0.0.1:{BASE_PORT + count}/mcp"
+        urls["dead"] = f"http://127.0.0.1:{BASE_PORT + count + 1}/mcp"
+        router = await compare(urls, timeout)
+        async with router:
+            names = [tool["function"]["name"] for tool in router.openai_tools]
+            print(f"\nexposed names: {', '.join(names[:4])}, ...")
+            print(f"server1__add(2, 3) -> {(await router.call_tool('server1__add', {'a': 2, 'b': 3})).data}")
+            print(f"tool_1() -> {(await router.call_tool('tool_1')).data}")
+
+            lookups = 100_000
+            start = time.perf_counter()
+            for i in range(lookups):
+                router.route(names[i % len(names)])
+            print(f"route lookup: {(time.perf_counter() - start) / lookups * 1e9:.0f} ns")
+    finally:
+        hung.close()
+        for server in servers:
+            server.should_exit = True
+        await asyncio.gather(*(server.task for server in servers))
+
+
+if __name__ == "__main__":
+    args = [float(arg) for arg in sys.argv[1:]]
+    count, latency_ms, timeout = args + [12, 50, 3][len(args):]
+    asyncio.run(main(int(count), latency_ms, timeout))
@@ -1,7 +1,21 @@
 import json
 import asyncio
-from fastmcp import Client
+import os
 from openai import AsyncOpenAI
+from router import ToolRouter
+
+# 연결할 MCP 서버들 (servers.json이 있으면 그 파일의 "mcpServers"를 사용)
+DEFAULT_SERVERS = {
+    "calculator": "http://127.0.0.1:8000/mcp",
+}
+
+
+def load_servers(path="servers.json"):
+    """연결할 MCP 서버 목록 읽기"""
+    if not os.path.exists(path):
+        return DEFAULT_SERVERS
+    with open(path) as f:
+        return json.load(f)["mcpServers"]
 
 
 async def ask_llm_and_get_response(llm_client, messages, available_tools):
@@ -30,7 +44,7 @@ async def ask_llm_and_get_response(llm_client, messages, available_tools):
     return response
 
 
-async def run_tools_and_get_results(llm_response, mcp_server, messages):
+async def run_tools_and_get_results(llm_response, router, messages):
     """LLM이 요청한 도구들을 실행하고 결과 얻기"""
     
     # LLM이 도구 사용을 요청했는지 확인
@@ -38,47 +52,24 @@ async def run_tools_and_get_results(llm_response, mcp_server, messages):
     if not tool_calls:
         return
     
-    # 요청된 각 도구를 실행
     for tool_call in tool_calls:
-        tool_name = tool_call.function.name
-        tool_arguments = tool_call.function.arguments
-        
-        print(f"[🔧 도구 실행] {tool_name}({tool_arguments})")
-        
-        # 도구 실행하기
-        arguments = json.loads(tool_arguments)
-        result = await mcp_server.call_tool(tool_name, arguments)
-        
+        print(f"[🔧 도구 실행] {tool_call.function.name}({tool_call.function.arguments})")
+    
+    # 요청된 도구들을 각 도구의 서버에서 동시에 실행
+    results = await router.call_tools(tool_calls)
+    
+    for tool_call, result in zip(tool_calls, results):
         print(f"[✅ 실행 결과] {result}")
         
         # 도구 실행 결과를 대화 기록에 저장
         tool_result_message = {
             "role": "tool",
             "tool_call_id": tool_call.id,
-            "content": str(result)
+            "content": result
         }
         messages.append(tool_result_message)
 
 
-def convert_mcp_tools_to_openai_format(mcp_tools):
-    """MCP 도구들을 OpenAI 형식으로 변환"""
-    
-    openai_tools = []
-    
-    for tool in mcp_tools:
-        openai_tool = {
-            "type": "function",
-            "function": {
-                "name": tool.name,
-                "description": tool.description,
-                "parameters": tool.inputSchema if hasattr(tool, 'inputSchema') else {}
-            }
-        }
-        openai_tools.append(openai_tool)
-    
-    return openai_tools
-
-
 def check_if_llm_wants_to_use_tools(llm_response):
     """LLM이 도구를 사용하고 싶어하는지 확인"""
     return llm_response.choices[0].message.tool_calls is not None
@@ -93,14 +84,15 @@ async def main():
     # 대화 기록을 저장할 리스트
     conversation_history = []
     
-    # MCP 서버에 연결
-    async with Client("http://127.0.0.1:8000/mcp") as mcp_server:
+    # 모든 MCP 서버에 동시에 연결하고 도구 목록을 하나로 합치기
+    async with ToolRouter(load_servers()) as router:
         
-        # 사용 가능한 도구들 가져오기
-        mcp_tools = await mcp_server.list_tools()
+        # 연결하지 못한 서버는 건너뛰고 나머지 서버의 도구만 사용
+        for name, error in router.failed.items():
+            print(f"[⚠️ 연결 실패] {name}: {error}")
         
-        # MCP 도구들을 OpenAI 형식으로 변환
-        openai_tools = convert_mcp_tools_to_openai_format(mcp_tools)
+        # OpenAI 형식으로 변환된 도구 목록
+        openai_tools = router.openai_tools
         
         # 사용자와 계속 대화하기
         while True:
@@ -127,7 +119,7 @@ async def main():
                     # 도구들을 실행하고 결과 얻기
                     await run_tools_and_get_results(
                         llm_response, 
-                        mcp_server, 
+                        router, 
                         conversation_history
                     )
                 else:
@@ -0,0 +1,180 @@
+"""OpenAI-compatible stand-in for the chat completions API.
+
+Answers `POST /v1/chat/completions` (streaming and non-streaming) from a
+script instead of a model, with the timing of a real one: a fixed delay
+before the first token, optional prefill time per prompt token, and a
+steady output rate. Point `AsyncOpenAI(base_url="http://127.0.0.1:8100/v1")`
+at it to run the chat client without a live LLM.
+
+The script is the same file replay.py runs. Each turn maps a user message
+to the assistant responses that follow it, one per LLM call; a response is
+either text or tool calls, optionally with its own `ttft_ms`:
+
+    {"conversations": [{"name": "two additions", "turns": [
+        {"user": "100과 200을 더한 다음 50을 더해줘", "assistant": [
+            {"tool_calls": [{"name": "add", "arguments": {"a": 100, "b": 200}}]},
+            {"tool_calls": [{"name": "add", "arguments": {"a": 300, "b": 50}}]},
+            {"content": "최종 결과는 350입니다."}]}]}]}
+
+The response is picked by the last user message and the number of
+assistant messages after it, so the server keeps no state and any number
+of conversations can run at once.
+
+Usage:
+    python mock_llm.py conversations.json [--port 8100] [--ttft-ms 300] [--tokens-per-sec 50]
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class Timing:
+    ttft_ms: float = 300
+    tokens_per_sec: float = 50
+    prefill_tokens_per_sec: float = 0  # 0: prompt length does not matter
+
+
+def load_script(path: str) -> dict[str, list[dict[str, Any]]]:
+    """user message -> scripted assistant responses"""
+    with open(path) as f:
+        conversations = json.load(f)["conversations"]
+    return {turn["user"]: turn["assistant"] for conversation in conversations for turn in conversation["turns"]}
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def split_tokens(text: str) -> list[str]:
+    return [text[i : i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+
+def pick_response(script: dict[str, list[dict[str, Any]]], messages: list[dict[str, Any]]) -> dict[str, Any]:
+    last_user = max((i for i, message in enumerate(messages) if message["role"] == "user"), default=None)
+    if last_user is None:
+        return {"content": "Hello! How can I help?"}
+    user_text = messages[last_user]["content"]
+    step = sum(1 for message in messages[last_user + 1 :] if message["role"] == "assistant")
+    responses = script.get(user_text)
+    if responses is None:
+        return {"content": f"(mock) {user_text}"}
+    return responses[min(step, len(responses) - 1)]
+
+
+def build_tool_calls(response: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}), ensure_ascii=False)},
+        }
+        for call in response.get("tool_calls", [])
+    ]
+
+
+def create_app(script: dict[str, list[dict[str, Any]]], timing: Timing) -> Starlette:
+    async def chat_completions(request: Request):
+        body = await request.json()
+        response = pick_response(script, body["messages"])
+        content = response.get("content")
+        tool_calls = build_tool_calls(response)
+        prompt_tokens = count_tokens(json.dumps(body["messages"], ensure_ascii=False))
+        completion_tokens = (count_tokens(content) if content else 0) + sum(
+            count_tokens(call["function"]["name"] + call["function"]["arguments"]) for call in tool_calls
+        )
+        ttft = response.get("ttft_ms", timing.ttft_ms) / 1000
+        if timing.prefill_tokens_per_sec:
+            ttft += prompt_tokens / timing.prefill_tokens_per_sec
+        completion = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+        }
+        finish_reason = "tool_calls" if tool_calls else "stop"
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft + completion_tokens / timing.tokens_per_sec)
+            message = {"role": "assistant", "content": content, "tool_calls": tool_calls or None}
+            return JSONResponse(
+                {
+                    **completion,
+                    "object": "chat.completion",
+                    "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                    "usage": usage,
+                }
+            )
+
+        def chunk(delta: dict[str, Any], finish: str | None = None) -> str:
+            data = {
+                **completion,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        async def events():
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": ""})
+            # Tokens are paced against the clock, so slow consumers do not slow the rate down
+            start = time.perf_counter()
+            sent = 0
+
+            async def pace():
+                nonlocal sent
+                sent += 1
+                delay = start + sent / timing.tokens_per_sec - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            for token in split_tokens(content or ""):
+                await pace()
+                yield chunk({"content": token})
+            for index, call in enumerate(tool_calls):
+                await pace()
+                header = {"index": index, "id": call["id"], "type": "function"}
+                yield chunk({"tool_calls": [{**header, "function": {"name": call["function"]["name"], "arguments": ""}}]})
+                for token in split_tokens(call["function"]["arguments"]):
+                    await pace()
+                    yield chunk({"tool_calls": [{"index": index, "function": {"arguments": token}}]})
+            yield chunk({}, finish_reason)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield f"data: {json.dumps({**completion, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return Starlette(routes=[Route("/v1/chat/completions", chat_completions, methods=["POST"])])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock LLM server")
+    parser.add_argument("script")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--tokens-per-sec", type=float, default=50)
+    parser.add_argument("--prefill-tokens-per-sec", type=float, default=0)
+    options = parser.parse_args()
+    timing = Timing(options.ttft_ms, options.tokens_per_sec, options.prefill_tokens_per_sec)
+    uvicorn.run(create_app(load_script(options.script), timing), host="127.0.0.1", port=options.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
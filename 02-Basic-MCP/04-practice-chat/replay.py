@@ -0,0 +1,264 @@
+"""Replay recorded conversations through the chat client's agent loop.
+
+Each user message of conversations.json goes through the same loop as
+client.py: `ask_llm_and_get_response()` until the LLM stops asking for
+tools, with `run_tools_and_get_results()` calling the real MCP servers
+through `ToolRouter` in between. The LLM is mock_llm.py, started in this
+process with the given timing, unless `--base-url` points somewhere else.
+
+Reports time to first token (from the user message, and per LLM call),
+per-turn latency, and how each turn's time splits between the LLM, the
+tools and the client itself.
+
+Usage:
+    python replay.py [conversations.json] [--repeat 5] [--concurrency 1]
+                     [--ttft-ms 300] [--tokens-per-sec 50] [--no-stream]
+                     [--base-url URL] [--servers servers.json] [--verbose]
+
+Without `--servers`, server.py is started on port 8000 for the run.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+import httpx
+import uvicorn
+from openai import AsyncOpenAI
+from openai.lib.streaming.chat import ChatCompletionStreamState
+
+from client import (
+    DEFAULT_SERVERS,
+    ask_llm_and_get_response,
+    check_if_llm_wants_to_use_tools,
+    load_servers,
+    run_tools_and_get_results,
+)
+from mock_llm import Timing, create_app, load_script
+from router import ToolRouter
+
+MOCK_PORT = 8100
+
+
+@dataclass
+class LLMCall:
+    start: float
+    ttft: float
+    duration: float
+
+
+@dataclass
+class TurnResult:
+    conversation: str
+    ttft: float
+    latency: float
+    llm_time: float
+    tool_time: float
+    llm_calls: int
+    tool_calls: int
+
+
+class TimedLLM:
+    """Looks like `AsyncOpenAI` to client.py; records when tokens arrive.
+
+    Streams each completion and reassembles it, so client.py gets the same
+    `ChatCompletion` it would get without streaming.
+    """
+
+    def __init__(self, client: AsyncOpenAI, stream: bool = True):
+        self.client = client
+        self.stream = stream
+        self.calls: dict[str, LLMCall] = {}  # completion id -> timing
+        self.chat = self  # client.py calls llm_client.chat.completions.create()
+        self.completions = self
+
+    async def create(self, **kwargs):
+        start = time.perf_counter()
+        if not self.stream:
+            completion = await self.client.chat.completions.create(**kwargs)
+            duration = time.perf_counter() - start
+            self.calls[completion.id] = LLMCall(start, duration, duration)
+            return completion
+
+        state = ChatCompletionStreamState()
+        first_token = None
+        stream = await self.client.chat.completions.create(**kwargs, stream=True)
+        async for chunk in stream:
+            if first_token is None and any(c.delta.content or c.delta.tool_calls for c in chunk.choices):
+                first_token = time.perf_counter()
+            state.handle_chunk(chunk)
+        end = time.perf_counter()
+        completion = state.get_final_completion()
+        self.calls[completion.id] = LLMCall(start, (first_token or end) - start, end - start)
+        return completion
+
+
+async def replay_conversation(llm: TimedLLM, router: ToolRouter, conversation: dict) -> list[TurnResult]:
+    messages = []
+    results = []
+    for turn in conversation["turns"]:
+        messages.append({"role": "user", "content": turn["user"]})
+        start = time.perf_counter()
+        calls: list[LLMCall] = []
+        tool_time = 0.0
+        tool_calls = 0
+        while True:
+            llm_response = await ask_llm_and_get_response(llm, messages, router.openai_tools)
+            calls.append(llm.calls[llm_response.id])
+            if not check_if_llm_wants_to_use_tools(llm_response):
+                break
+            tool_calls += len(llm_response.choices[0].message.tool_calls)
+            tool_start = time.perf_counter()
+            await run_tools_and_get_results(llm_response, router, messages)
+            tool_time += time.perf_counter() - tool_start
+        results.append(
+            TurnResult(
+                conversation=conversation["name"],
+                ttft=calls[0].start + calls[0].ttft - start,
+                latency=time.perf_counter() - start,
+                llm_time=sum(call.duration for call in calls),
+                tool_time=tool_time,
+                llm_calls=len(calls),
+                tool_calls=tool_calls,
+            )
+        )
+    return results
+
+
+@contextlib.asynccontextmanager
+async def mock_llm_server(script_path: str, timing: Timing):
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(load_script(script_path), timing), host="127.0.0.1", port=MOCK_PORT, log_level="warning")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{MOCK_PORT}/v1"
+    finally:
+        server.should_exit = True
+        await task
+
+
+@contextlib.asynccontextmanager
+async def calculator_server():
+    process = subprocess.Popen([sys.executable, "server.py"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        async with httpx.AsyncClient() as http:
+            while True:
+                try:
+                    await http.get(DEFAULT_SERVERS["calculator"])
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or process.poll() is not None:
+                        raise RuntimeError("server.py did not start")
+                    await asyncio.sleep(0.1)
+        yield DEFAULT_SERVERS
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def report(turns: list[TurnResult], llm_calls: list[LLMCall], elapsed: float) -> None:
+    print(
+        f"{len(turns)} turns, {sum(t.llm_calls for t in turns)} LLM calls,"
+        f" {sum(t.tool_calls for t in turns)} tool calls in {elapsed:.2f}s\n"
+    )
+    print(f"{'':<24} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    rows = {
+        "TTFT (from user msg)": [t.ttft for t in turns],
+        "TTFT (per LLM call)": [call.ttft for call in llm_calls],
+        "turn latency": [t.latency for t in turns],
+        "LLM time per turn": [t.llm_time for t in turns],
+        "tool time per turn": [t.tool_time for t in turns],
+    }
+    for name, values in rows.items():
+        print(
+            f"{name:<24} {percentile(values, 0.5) * 1000:>8.1f} {percentile(values, 0.95) * 1000:>8.1f}"
+            f" {max(values) * 1000:>8.1f}"
+        )
+
+    total = sum(t.latency for t in turns)
+    llm = sum(t.llm_time for t in turns)
+    tools = sum(t.tool_time for t in turns)
+    print(
+        f"\ntime split: LLM {llm / total:.1%}, tools {tools / total:.1%},"
+        f" client {(total - llm - tools) / total:.1%}\n"
+    )
+
+    print(f"{'conversation':<24} {'turns':>6} {'mean turn ms':>13} {'mean TTFT ms':>13}")
+    for name in dict.fromkeys(t.conversation for t in turns):
+        group = [t for t in turns if t.conversation == name]
+        print(
+            f"{name:<24} {len(group):>6} {sum(t.latency for t in group) / len(group) * 1000:>13.1f}"
+            f" {sum(t.ttft for t in group) / len(group) * 1000:>13.1f}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("script", nargs="?", default="conversations.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--tokens-per-sec", type=float, default=50)
+    parser.add_argument("--prefill-tokens-per-sec", type=float, default=0)
+    parser.add_argument("--no-stream", action="store_true", help="non-streaming calls, as client.py makes them")
+    parser.add_argument("--base-url", help="use this OpenAI-compatible endpoint instead of the mock")
+    parser.add_argument("--servers", help="MCP servers config (default: start server.py)")
+    parser.add_argument("--verbose", action="store_true", help="show the chat client's output")
+    options = parser.parse_args()
+
+    with open(options.script) as f:
+        conversations = json.load(f)["conversations"]
+    timing = Timing(options.ttft_ms, options.tokens_per_sec, options.prefill_tokens_per_sec)
+
+    async with contextlib.AsyncExitStack() as stack:
+        if options.base_url:
+            base_url = options.base_url
+        else:
+            base_url = await stack.enter_async_context(mock_llm_server(options.script, timing))
+        if options.servers:
+            servers = load_servers(options.servers)
+        else:
+            servers = await stack.enter_async_context(calculator_server())
+        router = await stack.enter_async_context(ToolRouter(servers))
+        for name, error in router.failed.items():
+            print(f"server {name} unavailable: {error}", file=sys.stderr)
+
+        llm = TimedLLM(AsyncOpenAI(base_url=base_url, api_key=os.environ.get("OPENAI_API_KEY", "mock")), not options.no_stream)
+
+        semaphore = asyncio.Semaphore(options.concurrency)
+
+        async def run(conversation):
+            async with semaphore:
+                return await replay_conversation(llm, router, conversation)
+
+        output = contextlib.nullcontext() if options.verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with output:
+            results = await asyncio.gather(*(run(c) for _ in range(options.repeat) for c in conversations))
+        elapsed = time.perf_counter() - start
+
+    llm_name = options.base_url or f"mock (TTFT {timing.ttft_ms:.0f} ms, {timing.tokens_per_sec:.0f} tokens/s)"
+    print(
+        f"LLM: {llm_name}, {'non-streaming' if options.no_stream else 'streaming'};"
+        f" {options.repeat} x {len(conversations)} conversations, concurrency {options.concurrency}"
+    )
+    report([turn for result in results for turn in result], list(llm.calls.values()), elapsed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,225 @@
+"""One tool list for the LLM, backed by many MCP servers.
+
+`ToolRouter` connects to every server concurrently, each with its own
+timeout, and merges their tools into a single OpenAI `tools` list. A tool
+name that exists on only one server is exposed as-is; names that collide
+are exposed as `<server>__<tool>` on every server that has them. Names
+are then made valid OpenAI function names, and one that still clashes
+with an earlier name gets a short hash suffix. Calls are routed through a
+dict from exposed name to (server, tool), and the tool calls of one LLM
+turn run concurrently, so a slow or dead server only delays or fails its
+own calls. A server that fails a call is reconnected with exponential
+backoff; until then its calls fail at once.
+
+    servers = {
+        "calculator": "http://127.0.0.1:8000/mcp",
+        "files": {"command": "python", "args": ["files_server.py"]},
+    }
+    async with ToolRouter(servers) as router:
+        tools = router.openai_tools
+        results = await router.call_tools(tool_calls)
+"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from mcp.shared.exceptions import McpError
+
+SEPARATOR = "__"
+# OpenAI function names: ^[a-zA-Z0-9_-]{1,64}$
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_-]")
+
+
+@dataclass
+class Route:
+    server: str
+    tool: str
+    client: Client
+
+
+class ToolRouter:
+    def __init__(
+        self,
+        servers: dict[str, Any],
+        connect_timeout: float = 10,
+        call_timeout: float = 60,
+        retries: int = 2,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 30,
+    ):
+        """`servers` maps a server name to anything `Client` accepts (URL,
+        script path, transport) or to one `mcpServers` entry of an MCP config
+        ({"url": ...} or {"command": ..., "args": [...]}).
+
+        A call that fails because its server did (not a tool error) is sent
+        again up to `retries` times, each after reconnecting; the wait before
+        a reconnect doubles from `retry_delay` up to `max_retry_delay`. A call
+        that timed out is not sent again, since it may still be running."""
+        self.servers = servers
+        self.connect_timeout = connect_timeout
+        self.call_timeout = call_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.clients: dict[str, Client] = {}
+        self.failed: dict[str, str] = {}
+        self.connect_times: dict[str, float] = {}
+        self.openai_tools: list[dict[str, Any]] = []
+        self._routes: dict[str, Route] = {}
+        self._failures: dict[str, int] = {}
+        self._retry_at: dict[str, float] = {}
+        self._reconnecting: dict[str, asyncio.Lock] = {}
+
+    async def __aenter__(self) -> "ToolRouter":
+        results = await asyncio.gather(*(self._connect(name, target) for name, target in self.servers.items()))
+        catalogs = {name: tools for name, tools in zip(self.servers, results) if tools is not None}
+        self._merge(catalogs)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await asyncio.gather(*(client.close() for client in self.clients.values()), return_exceptions=True)
+        self.clients.clear()
+
+    async def _connect(self, name: str, target: Any) -> list | None:
+        if isinstance(target, dict):
+            target = {"mcpServers": {name: target}}
+        client = Client(target)
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.connect_timeout):
+                await client.__aenter__()
+                tools = await client.list_tools()
+        except Exception as e:
+            self.failed[name] = "connection timed out" if isinstance(e, TimeoutError) else str(e)
+            await _abandon(client)
+            return None
+        finally:
+            self.connect_times[name] = time.perf_counter() - start
+        self.clients[name] = client
+        return tools
+
+    def _merge(self, catalogs: dict[str, list]) -> None:
+        owners: dict[str, int] = {}
+        for tools in catalogs.values():
+            for tool in tools:
+                owners[tool.name] = owners.get(tool.name, 0) + 1
+
+        for server, tools in catalogs.items():
+            for tool in tools:
+                name = f"{server}{SEPARATOR}{tool.name}" if owners[tool.name] > 1 else tool.name
+                name = _INVALID_NAME_CHARS.sub("_", name)[:64]
+                if name in self._routes:
+                    # Sanitizing or truncating made two names equal
+                    digest = hashlib.sha1(f"{server}/{tool.name}".encode()).hexdigest()[:8]
+                    name = f"{name[:55]}_{digest}"
+                self._routes[name] = Route(server, tool.name, self.clients[server])
+                self.openai_tools.append(
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": name,
+                            "description": tool.description or "",
+                            "parameters": tool.inputSchema or {"type": "object", "properties": {}},
+                        },
+                    }
+                )
+
+    def route(self, name: str) -> Route:
+        try:
+            return self._routes[name]
+        except KeyError:
+            raise ToolError(f"Unknown tool: {name}") from None
+
+    async def call_tool(self, name: str, arguments: dict[str, Any] | None = None):
+        """Call a tool by its exposed name on the server that owns it."""
+        route = self.route(name)
+        for attempt in range(self.retries + 1):
+            client = await self._client(route.server, wait=attempt > 0)
+            try:
+                return await client.call_tool(route.tool, arguments, timeout=self.call_timeout)
+            except ToolError:
+                raise
+            except Exception as e:
+                error = e
+                await self._fail(route.server, client, e)
+                if _timed_out(e):
+                    break
+        raise ToolError(f"Server {route.server!r} failed: {str(error) or type(error).__name__}") from error
+
+    async def _client(self, server: str, wait: bool) -> Client:
+        """The server's client, reconnecting it if it failed and its backoff is over.
+
+        While the backoff runs, raise at once, or with `wait`, sleep it out.
+        """
+        if server not in self.failed:
+            return self.clients[server]
+        delay = self._retry_at[server] - time.monotonic()
+        if delay > 0:
+            if not wait:
+                raise ToolError(f"Server {server!r} is unavailable: {self.failed[server]}")
+            await asyncio.sleep(delay)
+        # Concurrent calls to a failed server share one reconnect
+        async with self._reconnecting.setdefault(server, asyncio.Lock()):
+            if server not in self.failed:
+                return self.clients[server]
+            if await self._connect(server, self.servers[server]) is None:
+                self._schedule_retry(server)
+                raise ToolError(f"Server {server!r} is unavailable: {self.failed[server]}")
+            del self.failed[server]
+            self._failures.pop(server, None)
+            client = self.clients[server]
+            for route in self._routes.values():
+                if route.server == server:
+                    route.client = client
+            return client
+
+    async def _fail(self, server: str, client: Client, error: Exception) -> None:
+        # Only the first of several concurrent failures on one connection counts
+        if self.clients.get(server) is not client:
+            return
+        self.failed[server] = str(error) or type(error).__name__
+        del self.clients[server]
+        self._schedule_retry(server)
+        await _abandon(client)
+
+    def _schedule_retry(self, server: str) -> None:
+        failures = self._failures[server] = self._failures.get(server, 0) + 1
+        delay = min(self.retry_delay * 2 ** (failures - 1), self.max_retry_delay)
+        self._retry_at[server] = time.monotonic() + delay
+
+    async def call_tools(self, tool_calls) -> list[str]:
+        """Run the `tool_calls` of one LLM response concurrently.
+
+        Returns the content for each `role: "tool"` message, in order; errors
+        are returned as text so the LLM can see them and carry on.
+        """
+
+        async def run(tool_call) -> str:
+            try:
+                arguments = json.loads(tool_call.function.arguments or "{}")
+                return str(await self.call_tool(tool_call.function.name, arguments))
+            except Exception as e:
+                return f"Error: {e}"
+
+        return await asyncio.gather(*(run(tool_call) for tool_call in tool_calls))
+
+
+def _timed_out(error: Exception) -> bool:
+    return isinstance(error, TimeoutError) or (
+        isinstance(error, McpError) and error.error.code == httpx.codes.REQUEST_TIMEOUT
+    )
+
+
+async def _abandon(client: Client, grace: float = 0.1) -> None:
+    # A connect that timed out can be stuck starting its transport, and close()
+    # waits for that; cancelling close() after `grace` cancels the connect too
+    with contextlib.suppress(Exception):
+        await asyncio.wait_for(client.close(), grace)
@@ -0,0 +1,25 @@
+"""같은 `add` 서버를 원하는 전송 방식으로 실행합니다.
+
+사용법:
+    python add_server.py stdio
+    python add_server.py sse  [port]
+    python add_server.py http [port]
+"""
+import sys
+
+from fastmcp import FastMCP
+
+mcp = FastMCP(name="CalculatorServer")
+
+@mcp.tool
+def add(a: int, b: int) -> int:
+    """Adds two integer numbers together."""
+    return a + b
+
+if __name__ == "__main__":
+    transport = sys.argv[1] if len(sys.argv) > 1 else "stdio"
+    if transport == "stdio":
+        mcp.run(show_banner=False)
+    else:
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+        mcp.run(transport=transport, host="127.0.0.1", port=port, show_banner=False, log_level="warning")
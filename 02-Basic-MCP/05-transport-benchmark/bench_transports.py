@@ -0,0 +1,262 @@
+"""stdio, SSE, streamable HTTP 전송 방식 벤치마크
+
+같은 `add` 서버(add_server.py)를 전송 방식마다 띄우고 다음을 측정합니다.
+
+- handshake: 클라이언트 연결 + initialize 완료까지 (stdio는 서버 프로세스 시작 포함)
+- latency: 한 세션에서 순차 호출한 `add`의 p50 / p90 / p99
+- throughput: 한 세션에서 동시 호출 수(concurrency)별 초당 호출 수
+- memory: 세션을 여러 개 열었을 때 서버 쪽 RSS가 세션당 늘어난 양과,
+  그때의 서버 RSS 합계 (stdio는 세션마다 띄운 서버 프로세스 전부의 합)
+
+결과는 표로 출력하고, 같은 조건으로 다시 실행해 비교할 수 있도록
+실행 환경과 함께 --output-dir(기본값 results/)의 report.md와 report.json에 저장합니다.
+
+사용법:
+    python bench_transports.py
+    python bench_transports.py --transports http sse --calls 2000 --concurrency 1 16 64
+    python bench_transports.py --output-dir results/after-upgrade
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from importlib.metadata import version
+
+import httpx
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+try:
+    import psutil
+except ImportError:  # /proc로 대신 읽음 (Linux)
+    psutil = None
+
+SERVER = "add_server.py"
+PORTS = {"sse": 8801, "http": 8802}
+PATHS = {"sse": "/sse", "http": "/mcp"}
+
+
+def rss_bytes(pid: int) -> int:
+    if psutil is not None:
+        return psutil.Process(pid).memory_info().rss
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("RSS is not available on this platform (install psutil)")
+
+
+def stdio_server_pids() -> list[int]:
+    """이 프로세스가 띄운 stdio 서버 프로세스들"""
+    if psutil is not None:
+        return [p.pid for p in psutil.Process().children() if SERVER in " ".join(p.cmdline())]
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        if ppid == os.getpid() and SERVER in cmdline:
+            pids.append(int(entry))
+    return pids
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def make_client(transport: str) -> Client:
+    if transport == "stdio":
+        return Client(PythonStdioTransport(SERVER, args=["stdio"], keep_alive=False))
+    return Client(f"http://127.0.0.1:{PORTS[transport]}{PATHS[transport]}")
+
+
+async def start_server(transport: str) -> subprocess.Popen | None:
+    if transport == "stdio":
+        return None
+    process = subprocess.Popen(
+        [sys.executable, SERVER, transport, str(PORTS[transport])],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    async with httpx.AsyncClient() as http:
+        while True:
+            try:
+                await http.get(f"http://127.0.0.1:{PORTS[transport]}/", timeout=0.5)
+                return process
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    process.kill()
+                    raise RuntimeError(f"{transport} server did not start")
+                await asyncio.sleep(0.1)
+
+
+async def measure_handshake(transport: str, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        client = make_client(transport)
+        start = time.perf_counter()
+        async with client:
+            times.append(time.perf_counter() - start)
+    return {"p50": percentile(times, 0.5), "max": max(times)}
+
+
+async def measure_latency(client: Client, calls: int) -> dict:
+    times = []
+    for i in range(calls):
+        start = time.perf_counter()
+        await client.call_tool("add", {"a": i, "b": 1})
+        times.append(time.perf_counter() - start)
+    return {"p50": percentile(times, 0.5), "p90": percentile(times, 0.9), "p99": percentile(times, 0.99)}
+
+
+async def measure_throughput(client: Client, concurrency: int, calls: int) -> float:
+    queue = iter(range(calls))
+
+    async def worker():
+        for i in queue:
+            await client.call_tool("add", {"a": i, "b": 1})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return calls / (time.perf_counter() - start)
+
+
+def server_rss(server: subprocess.Popen | None) -> int:
+    """서버 쪽 RSS 합계(바이트): HTTP 서버 프로세스, 또는 떠 있는 stdio 서버 프로세스 전부"""
+    if server:
+        return rss_bytes(server.pid)
+    return sum(rss_bytes(pid) for pid in stdio_server_pids())
+
+
+async def measure_memory(transport: str, server: subprocess.Popen | None, sessions: int) -> dict:
+    """세션 `sessions`개를 열었을 때 세션당 늘어난 서버 RSS와 서버 RSS 합계(바이트)
+
+    두 값 모두 전송 방식과 관계없이 같은 방법으로 잽니다. stdio는 세션을 열기 전에
+    서버 프로세스가 없으므로 늘어난 양이 곧 프로세스 RSS 전체입니다.
+    """
+    before = server_rss(server)
+    clients = [make_client(transport) for _ in range(sessions)]
+    await asyncio.gather(*(client.__aenter__() for client in clients))
+    try:
+        await asyncio.gather(*(client.call_tool("add", {"a": 1, "b": 1}) for client in clients))
+        await asyncio.sleep(0.5)
+        after = server_rss(server)
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+    return {"added_per_session": (after - before) / sessions, "total": after}
+
+
+async def run_transport(transport: str, options) -> dict:
+    server = await start_server(transport)
+    try:
+        result = {"handshake": await measure_handshake(transport, options.handshakes)}
+        async with make_client(transport) as client:
+            await measure_latency(client, 50)  # warm-up
+            result["latency"] = await measure_latency(client, options.calls)
+            result["throughput"] = {
+                str(level): await measure_throughput(client, level, options.calls) for level in options.concurrency
+            }
+        result["memory"] = await measure_memory(transport, server, options.sessions)
+        return result
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+def render_report(results: dict, options, environment: dict) -> str:
+    ms = lambda seconds: f"{seconds * 1000:.2f}"
+    lines = [
+        "# Transport benchmark",
+        "",
+        f"- 실행 시각: {environment['timestamp']}",
+        f"- 환경: Python {environment['python']}, fastmcp {environment['fastmcp']}, mcp {environment['mcp']},"
+        f" {environment['platform']}, CPU {environment['cpu_count']}개",
+        f"- 설정: calls={options.calls}, concurrency={options.concurrency}, sessions={options.sessions},"
+        f" handshakes={options.handshakes}",
+        "",
+        "## Handshake / latency (ms)",
+        "",
+        "| transport | handshake p50 | handshake max | call p50 | call p90 | call p99 |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for transport, result in results.items():
+        handshake, latency = result["handshake"], result["latency"]
+        lines.append(
+            f"| {transport} | {ms(handshake['p50'])} | {ms(handshake['max'])} |"
+            f" {ms(latency['p50'])} | {ms(latency['p90'])} | {ms(latency['p99'])} |"
+        )
+    lines += [
+        "",
+        "## Throughput (calls/s, 한 세션)",
+        "",
+        "| transport | " + " | ".join(f"c={level}" for level in options.concurrency) + " |",
+        "|---|" + "---:|" * len(options.concurrency),
+    ]
+    for transport, result in results.items():
+        cells = " | ".join(f"{result['throughput'][str(level)]:.0f}" for level in options.concurrency)
+        lines.append(f"| {transport} | {cells} |")
+    lines += [
+        "",
+        f"## Server memory (MB, 세션 {options.sessions}개)",
+        "",
+        "| transport | added RSS / session | server RSS total |",
+        "|---|---:|---:|",
+    ]
+    for transport, result in results.items():
+        memory = result["memory"]
+        lines.append(f"| {transport} | {memory['added_per_session'] / 1_000_000:.2f} | {memory['total'] / 1_000_000:.2f} |")
+    lines += [
+        "",
+        "stdio의 handshake는 서버 프로세스 시작을 포함하고, stdio의 server RSS total은 세션마다 띄운 프로세스 RSS의 합입니다.",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transports", nargs="+", default=["stdio", "sse", "http"], choices=["stdio", "sse", "http"])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32, 128])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--handshakes", type=int, default=5)
+    parser.add_argument("--output-dir", default="results")
+    options = parser.parse_args()
+
+    environment = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "fastmcp": version("fastmcp"),
+        "mcp": version("mcp"),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    results = {}
+    for transport in options.transports:
+        print(f"{transport} 측정 중...", file=sys.stderr)
+        results[transport] = await run_transport(transport, options)
+
+    report = render_report(results, options, environment)
+    print(report)
+    os.makedirs(options.output_dir, exist_ok=True)
+    with open(os.path.join(options.output_dir, "report.md"), "w") as f:
+        f.write(report)
+    with open(os.path.join(options.output_dir, "report.json"), "w") as f:
+        json.dump({"environment": environment, "options": vars(options), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
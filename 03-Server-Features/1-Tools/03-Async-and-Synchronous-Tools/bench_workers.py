@@ -0,0 +1,83 @@
+"""
+멀티 워커 벤치마크: 워커 수별 CPU 집약적 도구 처리량
+
+server.py를 워커 1개와 N개로 각각 띄우고, 동시에 여러 세션에서
+`cpu_tool`을 호출해 초당 처리한 호출 수를 비교합니다.
+
+사용법:
+    python bench_workers.py [workers] [sessions] [calls_per_session] [iterations]
+    (기본값: 4 8 4 2000000)
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+from fastmcp import Client
+
+URL = "http://localhost:9000/mcp"
+
+
+async def wait_for_server(timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while True:
+            try:
+                await http.post(URL, json={})
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+async def run_session(calls: int, iterations: int) -> set[int]:
+    pids = set()
+    async with Client(URL) as client:
+        for _ in range(calls):
+            await client.call_tool("cpu_tool", {"iterations": iterations})
+            stats = await client.call_tool("session_stats")
+            pids.add(stats.data["worker_pid"])
+    return pids
+
+
+async def measure(workers: int, sessions: int, calls: int, iterations: int) -> dict:
+    server = subprocess.Popen(
+        [sys.executable, "server.py", "--workers", str(workers)],
+        env={**os.environ, "MCP_SESSION_DB": "bench_sessions.db"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_server()
+        start = time.perf_counter()
+        pids = await asyncio.gather(*(run_session(calls, iterations) for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+    return {"elapsed": elapsed, "workers_used": len(set().union(*pids))}
+
+
+async def main(workers: int, sessions: int, calls: int, iterations: int) -> None:
+    total = sessions * calls
+    print(f"{sessions}개 세션 x cpu_tool {calls}회 (iterations={iterations:,}), CPU 코어 {os.cpu_count()}개")
+    print(f"{'workers':>8} {'소요 s':>8} {'calls/s':>8} {'사용된 워커':>10} {'배율':>6}")
+    baseline = None
+    for count in sorted({1, workers}):
+        result = await measure(count, sessions, calls, iterations)
+        throughput = total / result["elapsed"]
+        baseline = baseline or throughput
+        print(
+            f"{count:>8} {result['elapsed']:>8.2f} {throughput:>8.1f}"
+            f" {result['workers_used']:>10} {throughput / baseline:>5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [4, 8, 4, 2_000_000]
+    asyncio.run(main(*(args + defaults[len(args):])))
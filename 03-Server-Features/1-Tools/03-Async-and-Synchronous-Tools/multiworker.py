@@ -0,0 +1,150 @@
+"""
+멀티 워커 HTTP 서빙
+
+`mcp.run(transport="http")`는 프로세스 하나, 이벤트 루프 하나로 동작하므로
+`sync_tool` 같은 CPU 집약적 도구가 있으면 처리량이 코어 하나에 묶입니다.
+이 모듈은 uvicorn이 포트 하나를 미리 열고 워커 N개를 fork해서 나눠 받도록 합니다.
+
+워커마다 메모리가 따로이므로 streamable HTTP를 stateless 모드로 실행합니다.
+SDK의 stateless 모드는 세션 ID를 발급하지 않기 때문에 `SessionIdMiddleware`가
+대신 발급하고, 세션 상태는 공유 `SessionStore`에 둡니다. 따라서 어느 워커든
+세션의 어떤 요청이든 처리할 수 있습니다.
+"""
+
+import json
+import uuid
+
+import uvicorn
+from fastmcp import FastMCP
+from starlette.middleware import Middleware as ASGIMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from session_store import SessionStore
+
+SESSION_HEADER = b"mcp-session-id"
+
+
+class SessionIdMiddleware:
+    """stateless streamable HTTP 앱에 세션 ID를 붙이는 ASGI 미들웨어
+
+    - 세션 ID 없이 들어온 initialize 요청의 응답에 새 `mcp-session-id`를 넣고 저장소에 등록합니다.
+      클라이언트는 이후 모든 요청에 이 헤더를 보내므로 도구에서 `ctx.session_id`로 읽을 수 있습니다.
+    - 세션 ID 없는 다른 POST는 400, 저장소에 없는(만료·삭제된) 세션 ID는 404로 거절합니다.
+      404를 받은 클라이언트는 initialize부터 새 세션을 시작합니다.
+    - GET(서버 → 클라이언트 알림 스트림)은 워커 사이에서 이어질 수 없으므로 405로 거절합니다.
+      요청 중의 진행 상황 알림은 각 POST 응답 스트림으로 그대로 전달됩니다.
+    - DELETE(세션 종료)는 저장소에서 세션 상태를 지우고 204로 응답합니다.
+    """
+
+    def __init__(self, app: ASGIApp, store: SessionStore, path: str = "/mcp"):
+        self.app = app
+        self.store = store
+        self.path = path.rstrip("/")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].rstrip("/") != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        session_id = _header(scope, SESSION_HEADER)
+        method = scope["method"]
+
+        if method == "GET":
+            await _respond(send, 405, [(b"allow", b"POST, DELETE")])
+            return
+
+        if session_id and not await self.store.exists(session_id):
+            await _respond_error(send, 404, "Session not found")
+            return
+
+        if method == "DELETE":
+            if session_id:
+                await self.store.delete(session_id)
+            await _respond(send, 204)
+            return
+
+        if method != "POST" or session_id:
+            await self.app(scope, receive, send)
+            return
+
+        # 세션 ID는 initialize에만 새로 발급하므로 본문을 먼저 읽어 확인하고 앱에 다시 넘김
+        body = await _read_body(receive)
+        if not _is_initialize(body):
+            await _respond_error(send, 400, "Bad Request: Missing session ID")
+            return
+
+        new_session_id = uuid.uuid4().hex
+
+        replayed = False
+
+        async def replay() -> Message:
+            # 본문은 한 번만 돌려주고, 그 뒤로는 연결 종료 등을 원래 receive로 기다림
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_with_session_id(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await self.store.create(new_session_id)
+                message["headers"] = [*message.get("headers", []), (SESSION_HEADER, new_session_id.encode())]
+            await send(message)
+
+        await self.app(scope, replay, send_with_session_id)
+
+
+def create_multiworker_app(mcp: FastMCP, store: SessionStore, path: str = "/mcp"):
+    """워커 하나가 서빙할 stateless streamable HTTP 앱"""
+    return mcp.http_app(
+        path=path,
+        stateless_http=True,
+        middleware=[ASGIMiddleware(SessionIdMiddleware, store=store, path=path)],
+    )
+
+
+def run_workers(app_factory: str, workers: int, host: str = "0.0.0.0", port: int = 8000) -> None:
+    """`"module:factory"` 앱을 워커 `workers`개로 실행
+
+    각 워커는 모듈을 새로 import하고 factory를 호출해 앱을 만들기 때문에
+    앱 객체가 아닌 import 문자열을 받습니다.
+    """
+    uvicorn.run(app_factory, factory=True, host=host, port=port, workers=workers, log_level="warning")
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode()
+    return None
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def _is_initialize(body: bytes) -> bool:
+    try:
+        message = json.loads(body)
+    except ValueError:
+        return False
+    return isinstance(message, dict) and message.get("method") == "initialize"
+
+
+async def _respond(send: Send, status: int, headers: list[tuple[bytes, bytes]] | None = None, body: bytes = b"") -> None:
+    await send({"type": "http.response.start", "status": status, "headers": headers or []})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _respond_error(send: Send, status: int, message: str) -> None:
+    """SDK의 streamable HTTP 전송과 같은 모양의 JSON-RPC 오류 응답"""
+    error = {"jsonrpc": "2.0", "id": "server-error", "error": {"code": -32600, "message": message}}
+    await _respond(send, status, [(b"content-type", b"application/json")], json.dumps(error).encode())
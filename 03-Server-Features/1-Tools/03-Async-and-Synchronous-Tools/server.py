@@ -6,16 +6,29 @@ MCP 서버: 동기 vs 비동기 도구 예제
 이벤트 루프 블로킹을 방지합니다.
 """
 
-import anyio
-from fastmcp import FastMCP
+import os
+import sys
 from time import sleep
 
+import anyio
+from fastmcp import Context, FastMCP
+
+from multiworker import create_multiworker_app, run_workers
+from session_store import InMemorySessionStore, SQLiteSessionStore
+
 # 상수 정의
 CPU_TASK_DURATION = 1  # CPU 집약적 작업 시간 (초)
 
+# 워커 수와 세션 저장소 경로 (워커 프로세스도 환경 변수로 같은 값을 읽음)
+WORKERS = int(os.environ.get("MCP_WORKERS", "1"))
+SESSION_DB = os.environ.get("MCP_SESSION_DB", "sessions.db")
+
 # FastMCP 인스턴스 생성
 mcp = FastMCP()
 
+# 워커가 여러 개면 모든 워커가 공유하는 SQLite, 하나면 프로세스 메모리에 세션 상태 저장
+session_store = SQLiteSessionStore(SESSION_DB) if WORKERS > 1 else InMemorySessionStore()
+
 
 def _cpu_intensive_task() -> str:
     """
@@ -68,13 +81,54 @@ async def async_tool() -> str:
     return await anyio.to_thread.run_sync(_cpu_intensive_task)
 
 
+@mcp.tool
+def cpu_tool(iterations: int = 10_000_000) -> int:
+    """
+    반복 횟수를 지정할 수 있는 CPU 집약적 작업 도구 (멀티 워커 벤치마크용)
+
+    Returns:
+        int: 반복한 횟수
+    """
+    c = 0
+    for _ in range(iterations):
+        c += 1
+    return c
+
+
+@mcp.tool
+async def session_stats(ctx: Context) -> dict:
+    """
+    현재 세션에서 이 도구를 호출한 횟수와 요청을 처리한 워커 PID
+    
+    Note:
+        호출 횟수는 세션 저장소에 있으므로 요청마다 다른 워커가 처리해도
+        1, 2, 3, ... 으로 이어집니다.
+    """
+    calls = await session_store.incr(ctx.session_id, "calls") if ctx.session_id else 0
+    return {"session_id": ctx.session_id, "calls": calls, "worker_pid": os.getpid()}
+
+
+def create_app():
+    """
+    워커 프로세스마다 호출되는 앱 factory (uvicorn이 `server:create_app`으로 import)
+    """
+    return create_multiworker_app(mcp, session_store)
+
+
 def main() -> None:
     """
     MCP 서버 실행 함수
     
     HTTP 전송을 사용하여 모든 네트워크 인터페이스(0.0.0.0)의
     포트 9000에서 서버를 시작합니다.
+    `--workers N`(N > 1)을 주면 워커 N개가 같은 포트를 나눠 받습니다.
     """
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else WORKERS
+    if workers > 1:
+        os.environ["MCP_WORKERS"] = str(workers)
+        run_workers("server:create_app", workers=workers, host="0.0.0.0", port=9000)
+        return
+
     mcp.run(
         transport="http",
         host="0.0.0.0",
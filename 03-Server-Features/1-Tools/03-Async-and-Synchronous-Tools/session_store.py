@@ -0,0 +1,188 @@
+"""
+세션 상태 저장소
+
+여러 워커 프로세스가 같은 MCP 세션의 요청을 나눠 처리하려면 세션 상태를
+프로세스 메모리가 아닌 공유 저장소에 두어야 합니다. 도구는 `ctx.session_id`를
+키로 이 저장소를 읽고 씁니다.
+
+- InMemorySessionStore: 프로세스 안에서만 공유되는 로컬 대체 구현 (워커 1개 전용)
+- SQLiteSessionStore: 같은 호스트의 모든 워커가 파일 하나를 공유
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Protocol
+
+import anyio
+
+SESSION_MARKER = ""  # SQLiteSessionStore가 세션 등록에 쓰는 키
+
+# 만료되지 않은 세션 행의 시각을 갱신해 TTL을 연장
+_TOUCH_SESSION = "UPDATE session_state SET updated_at = ? WHERE session_id = ? AND updated_at >= ?"
+
+
+class SessionStore(Protocol):
+    """세션별 키-값 저장소 인터페이스 (값은 JSON으로 직렬화 가능해야 함)"""
+
+    async def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        """값을 읽고 세션의 만료 시간을 연장"""
+        ...
+
+    async def set(self, session_id: str, key: str, value: Any) -> None: ...
+
+    async def incr(self, session_id: str, key: str, amount: int = 1) -> int:
+        """원자적으로 증가시킨 뒤 새 값을 반환"""
+        ...
+
+    async def delete(self, session_id: str) -> None: ...
+
+    async def create(self, session_id: str) -> None:
+        """상태가 아직 없어도 `exists()`가 참이 되도록 세션을 등록"""
+        ...
+
+    async def exists(self, session_id: str) -> bool:
+        """등록된 뒤 만료되거나 삭제되지 않은 세션인지 확인하고, 살아 있으면 만료 시간을 연장"""
+        ...
+
+
+class InMemorySessionStore:
+    """프로세스 메모리에 두는 저장소
+
+    워커끼리 공유되지 않으므로 단일 워커나 테스트에서만 사용합니다.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._data: dict[str, dict[str, Any]] = {}
+        self._touched: dict[str, float] = {}
+
+    async def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        self._expire()
+        if session_id not in self._data:
+            return default
+        self._touched[session_id] = time.time()
+        return self._data[session_id].get(key, default)
+
+    async def set(self, session_id: str, key: str, value: Any) -> None:
+        self._data.setdefault(session_id, {})[key] = value
+        self._touched[session_id] = time.time()
+
+    async def incr(self, session_id: str, key: str, amount: int = 1) -> int:
+        self._expire()
+        value = self._data.setdefault(session_id, {}).get(key, 0) + amount
+        await self.set(session_id, key, value)
+        return value
+
+    async def delete(self, session_id: str) -> None:
+        self._data.pop(session_id, None)
+        self._touched.pop(session_id, None)
+
+    async def create(self, session_id: str) -> None:
+        self._data.setdefault(session_id, {})
+        self._touched[session_id] = time.time()
+
+    async def exists(self, session_id: str) -> bool:
+        self._expire()
+        if session_id not in self._data:
+            return False
+        self._touched[session_id] = time.time()
+        return True
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl
+        for session_id in [sid for sid, touched in self._touched.items() if touched < cutoff]:
+            self._data.pop(session_id, None)
+            self._touched.pop(session_id, None)
+
+
+class SQLiteSessionStore:
+    """SQLite 파일에 두는 저장소
+
+    WAL 모드로 열어 여러 워커 프로세스가 동시에 읽고 쓸 수 있습니다.
+    쿼리는 워커 스레드에서 실행해 이벤트 루프를 막지 않고,
+    `ttl`초 동안 읽히지도 쓰이지도 않은 세션은 주기적으로 지웁니다.
+    """
+
+    def __init__(self, path: str = "sessions.db", ttl: float = 3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_state (
+                session_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (session_id, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS session_state_updated ON session_state (updated_at)")
+
+    async def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        row = await anyio.to_thread.run_sync(self._get, session_id, key)
+        return json.loads(row[0]) if row else default
+
+    async def set(self, session_id: str, key: str, value: Any) -> None:
+        await self._run(
+            "INSERT INTO session_state VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (session_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            (session_id, key, json.dumps(value), time.time()),
+        )
+
+    async def incr(self, session_id: str, key: str, amount: int = 1) -> int:
+        # 읽기-수정-쓰기를 SQL 한 문장으로 처리해 워커 간 경쟁 상태를 피함
+        # 만료된 행은 아직 지워지지 않았어도 없는 것으로 보고 `amount`부터 다시 셈
+        now = time.time()
+        row = await self._run(
+            "INSERT INTO session_state VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (session_id, key) DO UPDATE SET "
+            "value = CASE WHEN session_state.updated_at >= ? "
+            "THEN CAST(session_state.value AS INTEGER) + ? ELSE excluded.value END, "
+            "updated_at = excluded.updated_at "
+            "RETURNING value",
+            (session_id, key, json.dumps(amount), now, now - self.ttl, amount),
+            fetch=True,
+        )
+        return int(row[0])
+
+    async def delete(self, session_id: str) -> None:
+        await self._run("DELETE FROM session_state WHERE session_id = ?", (session_id,))
+
+    async def create(self, session_id: str) -> None:
+        # 상태가 없는 세션도 찾을 수 있도록 빈 키로 표시 행을 넣음
+        await self.set(session_id, SESSION_MARKER, None)
+
+    async def exists(self, session_id: str) -> bool:
+        # 읽기만 하는 세션도 만료되지 않도록 살아 있는 행의 시각을 모두 갱신
+        now = time.time()
+        row = await self._run(_TOUCH_SESSION + " RETURNING 1", (now, session_id, now - self.ttl), fetch=True)
+        return row is not None
+
+    async def _run(self, sql: str, params: tuple, fetch: bool = False):
+        return await anyio.to_thread.run_sync(self._execute, sql, params, fetch)
+
+    def _get(self, session_id: str, key: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(_TOUCH_SESSION, (now, session_id, now - self.ttl))
+            return self._conn.execute(
+                "SELECT value FROM session_state WHERE session_id = ? AND key = ? AND updated_at >= ?",
+                (session_id, key, now - self.ttl),
+            ).fetchone()
+
+    def _execute(self, sql: str, params: tuple, fetch: bool):
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone() if fetch else self._conn.execute(sql, params)
+            if not sql.startswith("SELECT"):
+                self._writes += 1
+                if self._writes % 1000 == 0:
+                    self._conn.execute("DELETE FROM session_state WHERE updated_at < ?", (time.time() - self.ttl,))
+            return row if fetch else None
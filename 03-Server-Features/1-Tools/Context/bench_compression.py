@@ -0,0 +1,169 @@
+"""Benchmark: response compression over streamable HTTP by payload size.
+
+Serves a tool that returns log-like text and a resource of the same text
+through CompressionMiddleware on a local port, then reads each payload size
+with every client Accept-Encoding. Reports bytes on the wire (counted after
+compression), median latency on loopback, and the latency estimated for a
+slower link, where the smaller payload matters more than the CPU spent.
+
+A last table covers a long-running tool: it reports small progress events
+for longer than the middleware's `max_delay`, then returns the large text
+on the same event stream.
+
+Usage:
+    python bench_compression.py [size_kb ...]   # default: 1 10 100 1000 5000
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import uvicorn
+from fastmcp import Client, Context, FastMCP
+from fastmcp.client.transports import StreamableHttpTransport
+from starlette.middleware import Middleware as ASGIMiddleware
+
+from compression import CompressionMiddleware, available_encodings
+
+PORT = 8765
+URL = f"http://127.0.0.1:{PORT}/mcp"
+REPEAT = 5
+LINK_MBPS = 100
+PROGRESS_STEPS = 5
+PROGRESS_INTERVAL = 0.1  # longer than CompressionMiddleware's max_delay
+
+_texts: dict[int, str] = {}
+
+
+def make_text(size_kb: int) -> str:
+    """Log-like text of roughly `size_kb` kilobytes (built once per size)."""
+    if size_kb not in _texts:
+        lines = []
+        length = 0
+        i = 0
+        while length < size_kb * 1000:
+            line = f"2025-01-{i % 28 + 1:02d} 12:{i % 60:02d}:{i * 7 % 60:02d} INFO worker-{i % 8} request {i} handled in {i % 97} ms"
+            lines.append(line)
+            length += len(line) + 1
+            i += 1
+        _texts[size_kb] = "\n".join(lines)
+    return _texts[size_kb]
+
+
+class WireCounter:
+    """Outermost ASGI middleware: counts response body bytes as sent on the socket."""
+
+    total = 0
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        async def counting_send(message):
+            if message["type"] == "http.response.body":
+                WireCounter.total += len(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, counting_send if scope["type"] == "http" else send)
+
+
+def build_app():
+    mcp = FastMCP(name="CompressionBench")
+
+    @mcp.tool
+    def get_log(size_kb: int) -> str:
+        """Return log text of the given size."""
+        return make_text(size_kb)
+
+    @mcp.tool
+    async def get_log_slowly(size_kb: int, ctx: Context) -> str:
+        """Report progress for a while, then return log text of the given size."""
+        for step in range(PROGRESS_STEPS):
+            await ctx.report_progress(step, PROGRESS_STEPS)
+            await asyncio.sleep(PROGRESS_INTERVAL)
+        return make_text(size_kb)
+
+    @mcp.resource("log://{size_kb}", mime_type="text/plain")
+    def log_resource(size_kb: int) -> str:
+        """Log text of the given size as a resource."""
+        return make_text(int(size_kb))
+
+    return mcp.http_app(
+        middleware=[ASGIMiddleware(WireCounter), ASGIMiddleware(CompressionMiddleware, minimum_size=1024)]
+    )
+
+
+async def measure(encoding: str, size_kb: int) -> dict:
+    transport = StreamableHttpTransport(URL, headers={"Accept-Encoding": encoding})
+    latencies, wire = [], []
+    async with Client(transport) as client:
+        for i in range(REPEAT):
+            before = WireCounter.total
+            start = time.perf_counter()
+            if i % 2:
+                text = (await client.read_resource(f"log://{size_kb}"))[0].text
+            else:
+                text = (await client.call_tool("get_log", {"size_kb": size_kb})).data
+            latencies.append(time.perf_counter() - start)
+            wire.append(WireCounter.total - before)
+    assert text == make_text(size_kb)
+    return {"latency": statistics.median(latencies), "bytes": statistics.median(wire)}
+
+
+async def measure_progress(encoding: str, size_kb: int) -> dict:
+    transport = StreamableHttpTransport(URL, headers={"Accept-Encoding": encoding})
+    events = 0
+
+    async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+        nonlocal events
+        events += 1
+
+    async with Client(transport) as client:
+        before = WireCounter.total
+        result = await client.call_tool("get_log_slowly", {"size_kb": size_kb}, progress_handler=on_progress)
+        wire = WireCounter.total - before
+    assert result.data == make_text(size_kb) and events == PROGRESS_STEPS
+    return {"bytes": wire}
+
+
+async def main(sizes: list[int]) -> None:
+    server = uvicorn.Server(uvicorn.Config(build_app(), host="127.0.0.1", port=PORT, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    encodings = ["identity", *available_encodings()]
+    try:
+        print(f"{'size':>7} {'encoding':>9} {'wire KB':>9} {'ratio':>6} {'loopback ms':>12} {f'@{LINK_MBPS}Mbps ms':>13}")
+        print("-" * 62)
+        for size_kb in sizes:
+            make_text(size_kb)
+            baseline = None
+            for encoding in encodings:
+                result = await measure(encoding, size_kb)
+                baseline = baseline or result["bytes"]
+                link_ms = result["latency"] * 1000 + result["bytes"] * 8 / (LINK_MBPS * 1000)
+                print(
+                    f"{size_kb:>5}KB {encoding:>9} {result['bytes'] / 1000:>9.1f} {baseline / result['bytes']:>5.1f}x"
+                    f" {result['latency'] * 1000:>12.1f} {link_ms:>13.1f}"
+                )
+            print()
+
+        print(f"progress then result ({PROGRESS_STEPS} events over {PROGRESS_STEPS * PROGRESS_INTERVAL:.1f}s)")
+        print(f"{'size':>7} {'encoding':>9} {'wire KB':>9} {'ratio':>6}")
+        print("-" * 34)
+        for size_kb in sizes:
+            baseline = None
+            for encoding in encodings:
+                result = await measure_progress(encoding, size_kb)
+                baseline = baseline or result["bytes"]
+                print(f"{size_kb:>5}KB {encoding:>9} {result['bytes'] / 1000:>9.1f} {baseline / result['bytes']:>5.1f}x")
+            print()
+    finally:
+        server.should_exit = True
+        await serve_task
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100, 1000, 5000]
+    asyncio.run(main(sizes))
@@ -0,0 +1,240 @@
+"""Benchmark: recovering a long tool call after the connection drops.
+
+`long_task(steps, interval)` sends one progress notification per step,
+carrying the step as a partial result. The client talks to the server
+through a TCP proxy that cuts every connection at fixed times during the
+call, and refuses new ones for `outage` seconds afterwards.
+
+    restart  what the example clients do today: open a new session, run
+             initialize and call the tool again from the start
+    resume   ResumableSession: reconnect to the same session and resume the
+             call from the last event id; the server keeps 1000 events
+    resume/5 same, with only 5 events kept per session, so a long enough
+             outage loses events
+
+Per drop, "recovery" is the time from the cut until the client receives a
+step it had not seen before. "lost" counts steps the client never saw,
+"rerun" the steps the server ran beyond one call's worth: calls started
+again, and abandoned calls that kept running.
+
+Usage:
+    python bench_resume.py [runs] [steps] [interval_ms] [outage_ms]
+    (default: 5 40 25 200)
+"""
+import asyncio
+import contextlib
+import logging
+import statistics
+import sys
+import time
+
+import httpx
+import uvicorn
+from fastmcp import Context, FastMCP
+from mcp.client.session import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from partial_results import decode_partial_results, encode_partial_results
+from resumable import ResumableSession, resumable_http_app
+
+SERVER_PORT = 8830
+PROXY_PORT = 8831
+URL = f"http://127.0.0.1:{PROXY_PORT}/mcp"
+DROPS_AT = (0.25, 0.55)  # fractions of the undisturbed call time
+
+
+class DropProxy:
+    """TCP proxy in front of the server that can cut all connections at once."""
+
+    def __init__(self, port: int, target_port: int):
+        self.port = port
+        self.target_port = target_port
+        self.down_until = 0.0
+        self._connections: set[asyncio.Future] = set()
+        self._server = None
+
+    async def __aenter__(self) -> "DropProxy":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", self.port)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        self.drop(0)
+        await self._server.wait_closed()
+
+    def drop(self, outage: float) -> None:
+        """Reset every open connection and refuse new ones for `outage` seconds."""
+        self.down_until = time.perf_counter() + outage
+        for pipes in list(self._connections):
+            pipes.cancel()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if time.perf_counter() < self.down_until:
+            writer.transport.abort()
+            return
+        up_reader, up_writer = await asyncio.open_connection("127.0.0.1", self.target_port)
+        pipes = asyncio.gather(_pipe(reader, up_writer), _pipe(up_reader, writer))
+        self._connections.add(pipes)
+        try:
+            await pipes
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(pipes)
+            # abort() resets the connection, as a network failure would
+            writer.transport.abort()
+            up_writer.transport.abort()
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    while data := await reader.read(65536):
+        writer.write(data)
+        await writer.drain()
+    writer.close()
+
+
+def build_server() -> tuple[FastMCP, dict]:
+    server = FastMCP(name="Bench-resume")
+    counters = {"steps_run": 0}
+
+    @server.tool
+    async def long_task(steps: int, interval: float, ctx: Context) -> dict:
+        """Run `steps` steps of `interval` seconds, reporting each as a partial result."""
+        for step in range(1, steps + 1):
+            await asyncio.sleep(interval)
+            counters["steps_run"] += 1
+            await ctx.report_progress(step, steps, encode_partial_results([step]))
+        return {"steps": steps}
+
+    return server, counters
+
+
+@contextlib.asynccontextmanager
+async def running_server(max_events: int):
+    server, counters = build_server()
+    app = resumable_http_app(server, max_events=max_events)
+    uv = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=SERVER_PORT, log_level="critical"))
+    task = asyncio.create_task(uv.serve())
+    while not uv.started:
+        await asyncio.sleep(0.05)
+    try:
+        yield app.state.event_store, counters
+    finally:
+        uv.should_exit = True
+        await task
+
+
+class Timeline:
+    """Steps as the client receives them."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.arrivals: list[tuple[float, int]] = []
+
+    async def on_progress(self, progress: float, total: float | None, message: str | None) -> None:
+        for step in decode_partial_results(message):
+            self.arrivals.append((time.perf_counter() - self.start, step))
+
+    def recovery(self, drop_time: float) -> float | None:
+        """Time from a drop until a step not seen before it arrives."""
+        seen = {step for at, step in self.arrivals if at < drop_time}
+        for at, step in self.arrivals:
+            if at >= drop_time and step not in seen:
+                return at - drop_time
+        return None
+
+
+async def call_resume(timeline: Timeline, steps: int, interval: float) -> None:
+    async with ResumableSession(URL, retries=8, retry_delay=0.02) as session:
+        result = await session.call_tool("long_task", {"steps": steps, "interval": interval}, progress_handler=timeline.on_progress)
+        if result.isError:
+            raise RuntimeError(result.content[0].text)
+
+
+async def call_restart(timeline: Timeline, steps: int, interval: float) -> None:
+    for attempt in range(20):
+        await asyncio.sleep(0.02 * attempt)
+        dropped = asyncio.Event()
+
+        async def on_message(message):
+            if isinstance(message, httpx.TransportError):
+                dropped.set()
+
+        try:
+            async with streamablehttp_client(URL) as (read, write, _):
+                async with ClientSession(read, write, message_handler=on_message) as session:
+                    await session.initialize()
+                    call = asyncio.create_task(
+                        session.call_tool("long_task", {"steps": steps, "interval": interval}, progress_callback=timeline.on_progress)
+                    )
+                    watch = asyncio.create_task(dropped.wait())
+                    done, _ = await asyncio.wait({call, watch}, return_when=asyncio.FIRST_COMPLETED)
+                    watch.cancel()
+                    if call in done:
+                        call.result()
+                        return
+                    call.cancel()
+        except Exception:
+            pass
+    raise ConnectionError("gave up")
+
+
+async def measure(mode: str, runs: int, steps: int, interval: float, outage: float) -> dict:
+    call = call_restart if mode == "restart" else call_resume
+    max_events = 5 if mode == "resume/5" else 1000
+    duration = steps * interval
+    completions, recoveries, lost, duplicated, rerun = [], [], 0, 0, 0
+    async with running_server(max_events) as (stores, counters), DropProxy(PROXY_PORT, SERVER_PORT) as proxy:
+        for _ in range(runs):
+            counters["steps_run"] = 0
+            timeline = Timeline()
+            task = asyncio.create_task(call(timeline, steps, interval))
+            drop_times = []
+            for fraction in DROPS_AT:
+                await asyncio.sleep(max(0.0, duration * fraction - (time.perf_counter() - timeline.start)))
+                drop_times.append(time.perf_counter() - timeline.start)
+                proxy.drop(outage)
+            try:
+                await asyncio.wait_for(task, duration * 10 + 10)
+            except Exception as e:
+                print(f"{mode}: call failed: {e!r}", file=sys.stderr)
+            completions.append(time.perf_counter() - timeline.start)
+            recoveries += [r for r in (timeline.recovery(t) for t in drop_times) if r is not None]
+            received = [step for _, step in timeline.arrivals]
+            lost += len(set(range(1, steps + 1)) - set(received))
+            duplicated += len(received) - len(set(received))
+            rerun += counters["steps_run"] - steps
+        stats = stores.stats()
+    return {
+        "completion": statistics.median(completions),
+        "recovery_p50": statistics.median(recoveries) if recoveries else float("nan"),
+        "recovery_max": max(recoveries) if recoveries else float("nan"),
+        "lost": lost,
+        "duplicated": duplicated,
+        "rerun": rerun,
+        "gaps": stats["gaps"],
+    }
+
+
+async def main(runs: int, steps: int, interval_ms: int, outage_ms: int) -> None:
+    interval, outage = interval_ms / 1000, outage_ms / 1000
+    print(
+        f"long_task: {steps} steps x {interval_ms} ms; {len(DROPS_AT)} drops per call,"
+        f" {outage_ms} ms outage each; {runs} runs per mode\n"
+    )
+    print(f"{'mode':>9} {'call s':>7} {'recovery p50 ms':>16} {'max ms':>7} {'lost':>5} {'dup':>4} {'rerun':>6} {'gaps':>5}")
+    print("-" * 66)
+    for mode in ("restart", "resume", "resume/5"):
+        r = await measure(mode, runs, steps, interval, outage)
+        print(
+            f"{mode:>9} {r['completion']:>7.2f} {r['recovery_p50'] * 1000:>16.1f} {r['recovery_max'] * 1000:>7.1f}"
+            f" {r['lost']:>5} {r['duplicated']:>4} {r['rerun']:>6} {r['gaps']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    # The SDK logs every broken stream with a traceback; the drops here are deliberate
+    logging.getLogger("mcp.client.streamable_http").setLevel(logging.CRITICAL)
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [5, 40, 25, 200]
+    asyncio.run(main(*(args + defaults[len(args):])))
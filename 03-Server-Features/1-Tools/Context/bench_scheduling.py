@@ -0,0 +1,131 @@
+"""Benchmark: a noisy client vs quiet clients, first-come-first-served and with FairScheduler.
+
+A CPU-bound sync tool `crunch(ms)` is called by one noisy client, which
+fires a burst of long calls at once, and by quiet clients that each make
+short calls one after another. Clients identify themselves with
+`_meta.client_id`, which the server sees as `ctx.client_id`.
+
+    fifo        no scheduler: sync tools run on the event loop in arrival order
+    fair        FairScheduler: 2 slots, cost = ms, tools offloaded to threads
+    fair+limit  same, and the noisy client is limited to 5 calls/s (burst 10)
+
+Usage:
+    python bench_scheduling.py [noisy_calls] [noisy_ms] [quiet_clients] [quiet_calls] [quiet_ms]
+    (default: 30 100 3 10 10)
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import mcp.types
+from fastmcp import Client, FastMCP
+
+from scheduling import FairScheduler, Quota
+
+
+def build_server(mode: str) -> tuple[FastMCP, FairScheduler | None]:
+    scheduler = None
+    if mode != "fifo":
+        quotas = {"noisy": Quota(rate=5, burst=10)} if mode == "fair+limit" else {}
+        scheduler = FairScheduler(
+            max_concurrency=2,
+            quotas=quotas,
+            default_quota=Quota(rate=1000, burst=1000),
+            cost=lambda name, arguments: arguments.get("ms", 1),
+        )
+    server = FastMCP(name=f"Bench-{mode}", middleware=[scheduler] if scheduler else [])
+
+    @server.tool
+    def crunch(ms: int) -> int:
+        """Busy-loop for `ms` milliseconds of CPU time."""
+        deadline = time.thread_time() + ms / 1000
+        n = 0
+        while time.thread_time() < deadline:
+            n += 1
+        return n
+
+    return server, scheduler
+
+
+async def call_as(client: Client, client_id: str, ms: int) -> float:
+    """Call `crunch` with `_meta.client_id` set; returns the latency."""
+    request = mcp.types.ClientRequest(
+        mcp.types.CallToolRequest(
+            method="tools/call",
+            params=mcp.types.CallToolRequestParams(name="crunch", arguments={"ms": ms}, _meta={"client_id": client_id}),
+        )
+    )
+    start = time.perf_counter()
+    result = await client.session.send_request(request, mcp.types.CallToolResult)
+    if result.isError:
+        raise RuntimeError(result.content[0].text)
+    return time.perf_counter() - start
+
+
+async def measure(mode: str, noisy_calls: int, noisy_ms: int, quiet_clients: int, quiet_calls: int, quiet_ms: int) -> dict:
+    server, scheduler = build_server(mode)
+    noisy = Client(server)
+    quiet = [Client(server) for _ in range(quiet_clients)]
+    async with noisy:
+        for client in quiet:
+            await client.__aenter__()
+
+        async def noisy_burst():
+            start = time.perf_counter()
+            results = await asyncio.gather(*(call_as(noisy, "noisy", noisy_ms) for _ in range(noisy_calls)), return_exceptions=True)
+            done = [r for r in results if not isinstance(r, BaseException)]
+            return time.perf_counter() - start, len(done), len(results) - len(done)
+
+        async def quiet_client(i: int):
+            await asyncio.sleep(0.05)  # arrive just after the burst
+            return [await call_as(quiet[i], f"quiet-{i}", quiet_ms) for _ in range(quiet_calls)]
+
+        (noisy_elapsed, noisy_done, noisy_rejected), *quiet_latencies = await asyncio.gather(
+            noisy_burst(), *(quiet_client(i) for i in range(quiet_clients))
+        )
+        for client in quiet:
+            await client.__aexit__(None, None, None)
+
+    latencies = sorted(latency for result in quiet_latencies for latency in result)
+    return {
+        "quiet_p50": statistics.median(latencies),
+        "quiet_p95": latencies[int(len(latencies) * 0.95)],
+        "quiet_max": latencies[-1],
+        "noisy_elapsed": noisy_elapsed,
+        "noisy_done": noisy_done,
+        "noisy_rejected": noisy_rejected,
+        "stats": scheduler.stats() if scheduler else None,
+    }
+
+
+async def main(noisy_calls: int, noisy_ms: int, quiet_clients: int, quiet_calls: int, quiet_ms: int) -> None:
+    print(
+        f"noisy: {noisy_calls} x crunch({noisy_ms}) at once; "
+        f"quiet: {quiet_clients} clients x {quiet_calls} sequential crunch({quiet_ms})\n"
+    )
+    print(f"{'mode':>10} {'quiet p50 ms':>13} {'p95 ms':>8} {'max ms':>8} {'noisy done':>11} {'rejected':>9} {'noisy s':>8}")
+    print("-" * 74)
+    results = {}
+    for mode in ("fifo", "fair", "fair+limit"):
+        result = results[mode] = await measure(mode, noisy_calls, noisy_ms, quiet_clients, quiet_calls, quiet_ms)
+        print(
+            f"{mode:>10} {result['quiet_p50'] * 1000:>13.1f} {result['quiet_p95'] * 1000:>8.1f}"
+            f" {result['quiet_max'] * 1000:>8.1f} {result['noisy_done']:>11} {result['noisy_rejected']:>9}"
+            f" {result['noisy_elapsed']:>8.2f}"
+        )
+
+    print("\nper-client metrics (fair):")
+    print(f"{'client':>10} {'calls':>6} {'rejected':>9} {'cost':>7} {'mean wait ms':>13} {'max wait ms':>12} {'run s':>7}")
+    for client, stats in results["fair"]["stats"].items():
+        print(
+            f"{client:>10} {stats['calls']:>6} {stats['rejected']:>9} {stats['cost']:>7.0f}"
+            f" {stats['wait_seconds'] / max(stats['calls'], 1) * 1000:>13.1f} {stats['max_wait_seconds'] * 1000:>12.1f}"
+            f" {stats['run_seconds']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [30, 100, 3, 10, 10]
+    asyncio.run(main(*(args + defaults[len(args):])))
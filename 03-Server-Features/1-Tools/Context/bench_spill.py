@@ -0,0 +1,115 @@
+"""Benchmark: large tool results sent whole vs spilled to a resource.
+
+`export_rows(rows)` returns a dict with `rows` records (~100 bytes each).
+For each size the call is made against a plain server and against one
+with ResultSpill, and the size of the tools/call response and its latency
+are compared. With ResultSpill, reading one 32k range of the result (as
+the resource and with `fetch_spilled`) is timed as well.
+
+Also shows what the handle looks like for a `-> str` tool, and that a
+`-> list` tool, whose output schema has no room for a handle, is sent
+unchanged.
+
+Usage:
+    python bench_spill.py [rows ...] (default: 1000 10000 100000)
+"""
+import asyncio
+import json
+import sys
+import time
+
+from fastmcp import Client, FastMCP
+
+from spill import ResultSpill, is_spilled, read_spilled
+from structured import StructuredOnlyMiddleware, json_serializer
+
+RANGE = 32_000
+
+
+def build_server(spill: ResultSpill | None) -> FastMCP:
+    middleware = [spill] if spill else []
+    server = FastMCP(
+        name="Bench-spill" if spill else "Bench-plain",
+        middleware=middleware + [StructuredOnlyMiddleware()],
+        tool_serializer=json_serializer,
+    )
+    if spill:
+        spill.register(server)
+
+    def records(rows: int) -> list[dict]:
+        return [{"id": i, "name": f"item-{i}", "price": i * 0.25, "tags": ["a", "b", "c"]} for i in range(rows)]
+
+    @server.tool
+    def export_rows(rows: int) -> dict:
+        """Export `rows` records."""
+        return {"table": "items", "count": rows, "rows": records(rows)}
+
+    @server.tool
+    def export_csv(rows: int) -> str:
+        """Export `rows` records as CSV."""
+        return "id,name,price\n" + "\n".join(f"{r['id']},{r['name']},{r['price']}" for r in records(rows))
+
+    @server.tool
+    def export_list(rows: int) -> list[dict]:
+        """Export `rows` records as a bare list."""
+        return records(rows)
+
+    return server
+
+
+def response_size(result) -> int:
+    """Bytes of the tools/call result as JSON, roughly what goes over the wire."""
+    size = sum(len(block.text.encode()) for block in result.content if block.type == "text")
+    if result.structured_content is not None:
+        size += len(json.dumps(result.structured_content, separators=(",", ":")).encode())
+    return size
+
+
+async def timed(coro):
+    start = time.perf_counter()
+    value = await coro
+    return value, time.perf_counter() - start
+
+
+async def main(sizes: list[int]) -> None:
+    spill = ResultSpill(threshold=RANGE)
+    async with Client(build_server(None)) as plain, Client(build_server(spill)) as spilled:
+        print(f"{'rows':>8} {'plain KB':>10} {'plain ms':>9} {'spill KB':>9} {'spill ms':>9} {'range ms':>9} {'fetch ms':>9}")
+        print("-" * 70)
+        for rows in sizes:
+            await plain.call_tool("export_rows", {"rows": rows})  # warm up
+            full, plain_time = await timed(plain.call_tool("export_rows", {"rows": rows}))
+            handle, spill_time = await timed(spilled.call_tool("export_rows", {"rows": rows}))
+            if is_spilled(handle.structured_content):
+                uri = handle.structured_content["uri"]
+                _, range_time = await timed(read_spilled(spilled, uri, offset=len(handle.structured_content["preview"]), length=RANGE))
+                _, fetch_time = await timed(spilled.call_tool("fetch_spilled", {"uri": uri, "offset": 0, "length": RANGE}))
+                ranges = f"{range_time * 1000:>9.1f} {fetch_time * 1000:>9.1f}"
+            else:
+                ranges = f"{'-':>9} {'-':>9}"
+            print(
+                f"{rows:>8} {response_size(full) / 1024:>10.1f} {plain_time * 1000:>9.1f}"
+                f" {response_size(handle) / 1024:>9.1f} {spill_time * 1000:>9.1f} {ranges}"
+            )
+
+        rows = max(sizes)
+        handle = await spilled.call_tool("export_rows", {"rows": rows})
+        whole = await read_spilled(spilled, handle.structured_content)
+        assert json.loads(whole) == (await plain.call_tool("export_rows", {"rows": rows})).structured_content
+        print(f"\nfull payload read back from {handle.structured_content['uri']}: {len(whole):,} chars, identical")
+        print(f"spill store: {len(spill.store)} entries, {spill.store.chars:,} chars")
+
+        handle = (await spilled.call_tool("export_rows", {"rows": rows})).structured_content
+        print("\nexport_rows handle:")
+        print(json.dumps({**handle, "preview": handle["preview"][:60] + "..."}, indent=2, ensure_ascii=False))
+
+        # A `-> str` tool's schema only allows a string, so the handle comes back as JSON text
+        text = json.loads((await spilled.call_tool("export_csv", {"rows": rows})).structured_content["result"])
+        print(f"\nexport_csv -> {{'result': '<handle as JSON>'}}, summary {text['summary']}")
+
+        result = await spilled.call_tool("export_list", {"rows": rows})
+        print(f"export_list (list schema) -> spilled: {is_spilled(result.structured_content)}, {response_size(result) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]))
@@ -0,0 +1,112 @@
+"""Benchmark: large structured tool results with and without the text copy.
+
+Runs the same dict-returning tool in three server setups and measures the
+server time (tool call + JSON encoding of the response), the client time
+(JSON decoding of the response) and the bytes that would go over the wire.
+
+    default          text JSON block + structured content (FastMCP default)
+    orjson           same two copies, text block encoded with orjson
+    structured-only  structured content only (StructuredOnlyMiddleware)
+
+Usage:
+    python bench_structured.py [size_mb ...]   # default: 1 2 5 10
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import mcp.types
+from fastmcp import Client, FastMCP
+
+from structured import STRUCTURED_ONLY_META, StructuredOnlyMiddleware, json_serializer
+
+REPEAT = 5
+
+_payloads: dict[float, dict] = {}
+
+
+def make_payload(size_mb: float) -> dict:
+    """Build (once) a dict of records whose JSON is roughly `size_mb` megabytes."""
+    if size_mb not in _payloads:
+        record_count = int(size_mb * 1_000_000 / 100)
+        _payloads[size_mb] = {
+            "records": [
+                {"id": i, "name": f"record-{i}", "score": i * 0.5, "tags": ["alpha", "beta"], "ok": True}
+                for i in range(record_count)
+            ],
+            "count": record_count,
+        }
+    return _payloads[size_mb]
+
+
+def build_server(mode: str) -> FastMCP:
+    if mode == "default":
+        server = FastMCP(name="BenchDefault")
+    else:
+        server = FastMCP(
+            name=f"Bench-{mode}",
+            middleware=[StructuredOnlyMiddleware()],
+            tool_serializer=json_serializer,
+        )
+
+    @server.tool
+    def get_records(size_mb: float) -> dict:
+        """Return a large structured payload."""
+        return make_payload(size_mb)
+
+    return server
+
+
+async def measure(mode: str, size_mb: float) -> dict:
+    meta = {STRUCTURED_ONLY_META: True} if mode == "structured-only" else None
+    request = mcp.types.ClientRequest(
+        mcp.types.CallToolRequest(
+            method="tools/call",
+            params=mcp.types.CallToolRequestParams(name="get_records", arguments={"size_mb": size_mb}, _meta=meta),
+        )
+    )
+
+    server_times, client_times, wire_sizes = [], [], []
+    async with Client(build_server(mode)) as client:
+        for _ in range(REPEAT):
+            # The in-memory transport passes objects, so encode/decode like a real transport would
+            start = time.perf_counter()
+            result = await client.session.send_request(request, mcp.types.CallToolResult)
+            wire = result.model_dump_json(by_alias=True, exclude_none=True)
+            server_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            decoded = mcp.types.CallToolResult.model_validate_json(wire)
+            client_times.append(time.perf_counter() - start)
+            wire_sizes.append(len(wire.encode()))
+
+    assert decoded.structuredContent["count"] == make_payload(size_mb)["count"]
+    return {
+        "server": statistics.median(server_times),
+        "client": statistics.median(client_times),
+        "bytes": statistics.median(wire_sizes),
+    }
+
+
+async def main(sizes: list[float]) -> None:
+    modes = ["default", "orjson", "structured-only"]
+    print(f"{'size':>6} {'mode':>16} {'server ms':>10} {'client ms':>10} {'wire MB':>8} {'vs default':>11}")
+    print("-" * 66)
+    for size_mb in sizes:
+        make_payload(size_mb)
+        baseline = None
+        for mode in modes:
+            result = await measure(mode, size_mb)
+            total = result["server"] + result["client"]
+            baseline = baseline or total
+            print(
+                f"{size_mb:>5}M {mode:>16} {result['server'] * 1000:>10.1f} {result['client'] * 1000:>10.1f}"
+                f" {result['bytes'] / 1_000_000:>8.2f} {baseline / total:>10.2f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1, 2, 5, 10]
+    asyncio.run(main(sizes))
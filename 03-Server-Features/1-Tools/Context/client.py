@@ -1,18 +1,30 @@
 from fastmcp import Client
 import asyncio
+import sys
+import time
+
+from partial_results import decode_partial_results
+from resumable import ResumableSession
+from sampling_handler import BatchingSamplingHandler, LocalSamplingBackend
+from structured import call_tool_structured
+
+# Answers the server's ctx.sample() requests with a deterministic local backend
+sampling_handler = BatchingSamplingHandler(LocalSamplingBackend(), max_batch_size=8, max_concurrency=2)
 
 async def test_context_features():
     """Test all Context features provided by the server."""
     
-    async with Client("http://localhost:8000/mcp") as client:
+    async with Client("http://localhost:8000/mcp", sampling_handler=sampling_handler) as client:
         print("🧪 FastMCP Context Features Demo")
         print("=" * 60)
         
+        # Dict results are requested structured-only, so each is serialized once
+        
         # Test 1: Logging demonstration
         print("\n1️⃣ Testing Logging Features")
         print("-" * 40)
         try:
-            result = await client.call_tool("demonstrate_logging", {
+            result = await call_tool_structured(client, "demonstrate_logging", {
                 "message": "Hello from client!"
             })
             print(f"✅ Result: {result.get('message')}")
@@ -24,10 +36,19 @@ async def test_context_features():
         print("\n2️⃣ Testing Progress Reporting")
         print("-" * 40)
         try:
-            result = await client.call_tool("process_with_progress", {
-                "task_name": "Data Processing Demo",
-                "steps": 5
-            })
+            # Consume each step's output while the tool is still running
+            async def print_partial_results(progress, total, message):
+                for step_result in decode_partial_results(message):
+                    print(f"⏳ Partial result: {step_result}")
+
+            # If the connection drops mid-task, the call resumes from the last event
+            # it received instead of starting over in a new session
+            async with ResumableSession("http://localhost:8000/mcp") as session:
+                call_result = await session.call_tool("process_with_progress", {
+                    "task_name": "Data Processing Demo",
+                    "steps": 5
+                }, progress_handler=print_partial_results)
+            result = call_result.structuredContent
             print(f"✅ Task: {result.get('task_name')}")
             print(f"📊 Status: {result.get('status')}")
             print(f"📈 Steps completed: {result.get('total_steps')}")
@@ -47,27 +68,28 @@ async def test_context_features():
         # Test different analysis types
         analysis_types = ["summary", "sentiment", "keywords"]
         
-        for analysis_type in analysis_types:
-            try:
-                result = await client.call_tool("analyze_data_with_llm", {
-                    "data": test_data,
-                    "analysis_type": analysis_type
-                })
+        # One tool call fans the three prompts out concurrently on the server
+        try:
+            result = await call_tool_structured(client, "analyze_data_multi", {
+                "data": test_data,
+                "analysis_types": analysis_types
+            })
+            for analysis_type, analysis in result.get('analyses', {}).items():
                 print(f"📊 {analysis_type.upper()} Analysis:")
-                print(f"   Status: {result.get('status')}")
-                if result.get('status') == 'success':
-                    print(f"   Result: {result.get('analysis_result')}")
+                print(f"   Status: {analysis.get('status')}")
+                if analysis.get('status') == 'success':
+                    print(f"   Result: {analysis.get('analysis_result')}")
                 else:
-                    print(f"   Error: {result.get('error')}")
+                    print(f"   Error: {analysis.get('error')}")
                 print()
-            except Exception as e:
-                print(f"❌ {analysis_type} analysis failed: {e}")
+        except Exception as e:
+            print(f"❌ Analysis failed: {e}")
         
         # Test 4: Resource reading (will likely fail as demo)
         print("\n4️⃣ Testing Resource Reading")
         print("-" * 40)
         try:
-            result = await client.call_tool("read_and_process_resource", {
+            result = await call_tool_structured(client, "read_and_process_resource", {
                 "resource_uri": "file:///tmp/demo.txt"
             })
             print(f"📁 Resource URI: {result.get('resource_uri')}")
@@ -91,7 +113,7 @@ async def test_context_features():
             clients, process data, and provide intelligent insights.
             """
             
-            result = await client.call_tool("comprehensive_demo", {
+            result = await call_tool_structured(client, "comprehensive_demo", {
                 "input_text": demo_text
             })
             
@@ -106,7 +128,7 @@ async def test_context_features():
         print(f"\n{'='*60}")
         print("📊 Context Features Test Summary:")
         print("✅ Logging: Debug, Info, Warning, Error levels")
-        print("✅ Progress: Real-time progress reporting")
+        print("✅ Progress: Real-time progress reporting and partial results")
         print("✅ LLM Sampling: Text analysis and processing")
         print("✅ Resource Access: File and URI reading")
         print("✅ Request Info: Client and request identification")
@@ -118,7 +140,7 @@ async def interactive_demo():
     print("\n🎮 Interactive Context Demo")
     print("Enter text to analyze, or 'quit' to exit:")
     
-    async with Client("http://localhost:8000/mcp") as client:
+    async with Client("http://localhost:8000/mcp", sampling_handler=sampling_handler) as client:
         while True:
             user_input = input("\n📝 Enter text: ").strip()
             
@@ -132,7 +154,7 @@ async def interactive_demo():
             
             try:
                 print("\n🔄 Processing...")
-                result = await client.call_tool("comprehensive_demo", {
+                result = await call_tool_structured(client, "comprehensive_demo", {
                     "input_text": user_input
                 })
                 
@@ -144,6 +166,29 @@ async def interactive_demo():
             except Exception as e:
                 print(f"❌ Error: {e}")
 
+async def sampling_load_test(sessions: int = 20, calls_per_session: int = 5):
+    """Load-test sampling-heavy tools against the local backend."""
+    
+    print(f"\n🏋️ Sampling load test: {sessions} sessions x {calls_per_session} calls")
+    
+    async def run_session(session_id: int):
+        async with Client("http://localhost:8000/mcp", sampling_handler=sampling_handler) as client:
+            for call in range(calls_per_session):
+                # Unique data per call so the server-side sampling cache does not hide the load
+                await client.call_tool("analyze_data_with_llm", {
+                    "data": f"Load test session {session_id} call {call}: FastMCP sampling round trip.",
+                    "analysis_type": "summary"
+                })
+    
+    start = time.time()
+    await asyncio.gather(*(run_session(i) for i in range(sessions)))
+    elapsed = time.time() - start
+    
+    total = sessions * calls_per_session
+    print(f"✅ {total} sampled tool calls in {elapsed:.2f}s ({total / elapsed:.1f} calls/s)")
+    print(f"📦 Backend batches: {sampling_handler.batches} (avg size {sampling_handler.average_batch_size:.1f})")
+    print(f"🔢 Estimated tokens used: {sampling_handler.tokens_used}")
+
 async def main():
     """Main function to run Context feature tests."""
     try:
@@ -160,4 +205,7 @@ async def main():
         print("💡 Make sure the server is running: python server.py")
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "load":
+        asyncio.run(sampling_load_test(*(int(arg) for arg in sys.argv[2:4])))
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,236 @@
+import zlib
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # optional codec
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional codec
+    brotli = None
+
+# Preferred first; only codecs whose library is installed are offered
+DEFAULT_ENCODINGS = ("zstd", "br", "gzip")
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+# encoding -> (codec, default level), fast levels since this runs per response
+_CODECS = {
+    "gzip": (_Gzip, 6),
+    "zstd": (_Zstd, 3) if zstandard is not None else None,
+    "br": (_Brotli, 4) if brotli is not None else None,
+}
+
+
+def available_encodings() -> list[str]:
+    return [name for name, codec in _CODECS.items() if codec is not None]
+
+
+def choose_encoding(accept_encoding: str, offered: tuple[str, ...]) -> str | None:
+    """Pick the first offered encoding the client accepts (q > 0)."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in offered:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Negotiated response compression for the streamable HTTP and SSE transports.
+
+    - Picks zstd, br or gzip from `Accept-Encoding` (server preference order).
+    - Bodies smaller than `minimum_size` are sent as-is, so `add`-sized
+      results pay nothing.
+    - Streamed responses (SSE) are compressed incrementally with a flush
+      after every chunk, so each event reaches the client when it is sent.
+      Until `minimum_size` bytes have been produced the chunks are held for
+      at most `max_delay` seconds; a stream that ends sooner goes out
+      uncompressed. An event stream still below `minimum_size` by then is
+      compressed anyway, since a long-running tool may send small progress
+      events first and its large result last. Other streams pass through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: tuple[str, ...] = DEFAULT_ENCODINGS,
+        levels: dict[str, int] | None = None,
+        max_delay: float = 0.05,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = tuple(name for name in encodings if _CODECS.get(name) is not None)
+        self.levels = levels or {}
+        self.max_delay = max_delay
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        async with anyio.create_task_group() as tg:
+            responder = _CompressingResponder(self, encoding, send, tg)
+            await self.app(scope, receive, responder.send)
+            # The response is complete, so a pending delayed flush has nothing left to do
+            tg.cancel_scope.cancel()
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send, tg):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._tg = tg
+        self._lock = anyio.Lock()
+        self._start: Message | None = None
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._compressor = None
+        self._started = False
+        self._passthrough = False
+        self._event_stream = False
+
+    async def send(self, message: Message) -> None:
+        async with self._lock:
+            await self._handle(message)
+
+    async def _handle(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                self._passthrough = True
+                await self._send(message)
+                return
+            self._start = message
+            self._event_stream = content_type.startswith("text/event-stream")
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is not None:
+            data = self._compressor.chunk(body) if more_body else self._compressor.finish(body)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        if body:
+            if not self._pending and more_body:
+                self._schedule_flush()
+            self._pending.append(body)
+            self._pending_size += len(body)
+
+        if not more_body:
+            if self._pending_size < self.middleware.minimum_size:
+                await self._send_uncompressed(streaming=False)
+            else:
+                await self._begin_compressed(streaming=False)
+        elif self._pending_size >= self.middleware.minimum_size:
+            await self._begin_compressed(streaming=True)
+
+    def _schedule_flush(self) -> None:
+        async def flush_after_delay():
+            await anyio.sleep(self.middleware.max_delay)
+            async with self._lock:
+                # Reaching `minimum_size` would have started compression already, so less is pending
+                if self._compressor is None and self._pending and not self._started:
+                    if self._event_stream:
+                        # Later events may be large; decide now rather than pass them all through
+                        await self._begin_compressed(streaming=True)
+                    else:
+                        await self._send_uncompressed(streaming=True)
+
+        self._tg.start_soon(flush_after_delay)
+
+    async def _send_uncompressed(self, streaming: bool) -> None:
+        self._started = True
+        # The rest of a stream passes through unchanged
+        self._passthrough = streaming
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": b"".join(self._pending), "more_body": streaming})
+        self._pending.clear()
+
+    async def _begin_compressed(self, streaming: bool) -> None:
+        codec, default_level = _CODECS[self.encoding]
+        self._compressor = codec(self.middleware.levels.get(self.encoding, default_level))
+        self._started = True
+
+        headers = MutableHeaders(raw=list(self._start["headers"]))
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        body = b"".join(self._pending)
+        if streaming:
+            del headers["content-length"]
+            data = self._compressor.chunk(body)
+        else:
+            data = self._compressor.finish(body)
+            headers["content-length"] = str(len(data))
+
+        await self._send({**self._start, "headers": headers.raw})
+        await self._send({"type": "http.response.body", "body": data, "more_body": streaming})
+        self._pending.clear()
@@ -0,0 +1,285 @@
+import contextvars
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+import pydantic_core
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from structured import estimate_json_size
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Timestamps taken by the wrapped tool function for the request in flight
+_phase_marks: contextvars.ContextVar[dict | None] = contextvars.ContextVar("phase_marks", default=None)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class MetricsMiddleware(Middleware):
+    """Per-tool and per-resource call metrics, rendered in Prometheus text format.
+
+    Records call and error counts, latency and payload-size histograms, and
+    the time spent in each phase of a tool call:
+
+    - validation: from the middleware to the tool function (argument parsing)
+    - execution: inside the tool function
+    - serialization: from the tool function back to the middleware
+
+    The last `recent_requests` calls are also kept per `ctx.request_id`.
+    """
+
+    def __init__(self, recent_requests: int = 256):
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.latency: dict[tuple, Histogram] = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.request_size: dict[tuple, Histogram] = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.response_size: dict[tuple, Histogram] = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.phase_seconds: Counter = Counter()
+        self.recent: deque[dict] = deque(maxlen=recent_requests)
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        name = context.message.name
+        ctx = context.fastmcp_context
+        if ctx is not None:
+            await self._instrument_tool(ctx.fastmcp, name)
+
+        marks = {}
+        token = _phase_marks.set(marks)
+        start = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            self._record("tool", name, context, start, marks, error=True)
+            raise
+        finally:
+            _phase_marks.reset(token)
+
+        self._record("tool", name, context, start, marks, result=result.content, structured=result.structured_content)
+        return result
+
+    async def on_read_resource(self, context: MiddlewareContext, call_next):
+        uri = str(context.message.uri)
+        start = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            self._record("resource", uri, context, start, {}, error=True)
+            raise
+
+        self._record("resource", uri, context, start, {}, result=[item.content for item in result])
+        return result
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP mcp_calls_total Tool calls and resource reads.",
+            "# TYPE mcp_calls_total counter",
+            *(f"mcp_calls_total{{{_labels(key)}}} {value}" for key, value in sorted(self.calls.items())),
+            "# HELP mcp_errors_total Tool calls and resource reads that raised.",
+            "# TYPE mcp_errors_total counter",
+            *(f"mcp_errors_total{{{_labels(key)}}} {value}" for key, value in sorted(self.errors.items())),
+            "# HELP mcp_phase_seconds_total Time spent per call phase.",
+            "# TYPE mcp_phase_seconds_total counter",
+            *(
+                f'mcp_phase_seconds_total{{{_labels(key[:2])},phase="{key[2]}"}} {value}'
+                for key, value in sorted(self.phase_seconds.items())
+            ),
+        ]
+        for name, help_text, histograms in (
+            ("mcp_call_duration_seconds", "End-to-end latency inside the server.", self.latency),
+            ("mcp_request_size_bytes", "Size of the JSON-encoded arguments.", self.request_size),
+            ("mcp_response_size_bytes", "Size of the returned content, structured content estimated.", self.response_size),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for key, histogram in sorted(histograms.items()):
+                lines += histogram.render(name, _labels(key))
+        return "\n".join(lines) + "\n"
+
+    def recent_requests(self) -> list[dict]:
+        return list(self.recent)
+
+    async def _instrument_tool(self, server, name: str) -> None:
+        try:
+            tool = await server.get_tool(name)
+        except Exception:
+            return
+        fn = getattr(tool, "fn", None)
+        if fn is not None and not getattr(fn, "__metrics_timed__", False):
+            tool.fn = _timed(fn)
+
+    def _record(
+        self,
+        kind: str,
+        name: str,
+        context: MiddlewareContext,
+        start: float,
+        marks: dict,
+        result=None,
+        structured=None,
+        error: bool = False,
+    ) -> None:
+        end = time.perf_counter()
+        key = (kind, name)
+        self.calls[key] += 1
+        if error:
+            self.errors[key] += 1
+        self.latency[key].observe(end - start)
+
+        if "start" in marks and "end" in marks:
+            phases = {
+                "validation": marks["start"] - start,
+                "execution": marks["end"] - marks["start"],
+                "serialization": end - marks["end"],
+            }
+        else:
+            phases = {"execution": end - start}
+        for phase, seconds in phases.items():
+            self.phase_seconds[(kind, name, phase)] += seconds
+
+        # Measured after the clock stopped so sizing does not count as latency
+        arguments = getattr(context.message, "arguments", None)
+        request_bytes = len(pydantic_core.to_json(arguments)) if arguments is not None else 0
+        response_bytes = _content_size(result) if result is not None else 0
+        if structured is not None:
+            # Structured-only calls carry no text block; estimate rather than serialize again
+            response_bytes += estimate_json_size(structured)
+        self.request_size[key].observe(request_bytes)
+        self.response_size[key].observe(response_bytes)
+
+        ctx = context.fastmcp_context
+        self.recent.append({
+            "request_id": _safe(lambda: ctx.request_id),
+            "client_id": _safe(lambda: ctx.client_id),
+            "kind": kind,
+            "name": name,
+            "status": "error" if error else "ok",
+            "duration": end - start,
+            "phases": phases,
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+        })
+
+
+class SamplingProfiler:
+    """Wall-clock stack sampler over all Python threads.
+
+    `run()` blocks for `duration` seconds, so call it from a worker thread.
+    The result is in collapsed-stack format ("frame;frame;frame count"),
+    which flamegraph.pl and speedscope read directly.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def run(self, duration: float) -> str:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            stacks: Counter = Counter()
+            own_thread = threading.get_ident()
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != own_thread:
+                        stacks[_collapse(frame)] += 1
+                time.sleep(self.interval)
+        finally:
+            self._lock.release()
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+
+
+def _timed(fn):
+    """Wrap a tool function so the middleware can see when it starts and ends."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            marks = _phase_marks.get()
+            if marks is not None:
+                marks["start"] = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                if marks is not None:
+                    marks["end"] = time.perf_counter()
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            marks = _phase_marks.get()
+            if marks is not None:
+                marks["start"] = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if marks is not None:
+                    marks["end"] = time.perf_counter()
+
+    wrapper.__metrics_timed__ = True
+    return wrapper
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _content_size(items: list) -> int:
+    """Approximate payload size from text and binary content without re-encoding it."""
+    size = 0
+    for item in items:
+        if isinstance(item, (str, bytes)):
+            size += len(item)
+        else:
+            size += len(getattr(item, "text", None) or getattr(item, "data", None) or "")
+    return size
+
+
+def _labels(key: tuple) -> str:
+    kind, name = key
+    name = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'kind="{kind}",name="{name}"'
+
+
+def _safe(getter):
+    try:
+        return getter()
+    except Exception:
+        return None
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from typing import Any
+
+from fastmcp import Client
+
+# Partial results ride on progress notifications: the progress token ties them
+# to one tools/call request, and the `message` field carries this JSON payload.
+PARTIAL_RESULTS_KEY = "partial_results"
+
+_DONE = object()
+
+
+def encode_partial_results(items: list[Any], message: str | None = None) -> str:
+    """Pack partial results (and an optional status message) into a progress message."""
+    payload = {PARTIAL_RESULTS_KEY: items}
+    if message is not None:
+        payload["message"] = message
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def decode_partial_results(message: str | None) -> list[Any]:
+    """Return the partial results carried by a progress message, if any."""
+    if not message or not message.startswith("{"):
+        return []
+    try:
+        payload = json.loads(message)
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(payload, dict):
+        return []
+    return payload.get(PARTIAL_RESULTS_KEY, [])
+
+
+class ToolCallStream:
+    """Async iterator over the partial results of a single tool call.
+
+    Partial results are yielded as soon as they arrive; the final tool result
+    is available as `stream.result` once iteration ends.
+
+    Example:
+        async with stream_tool_call(client, "process_with_progress", args) as stream:
+            async for step in stream:
+                print(step)
+        print(stream.result.data)
+    """
+
+    def __init__(self, client: Client, name: str, arguments: dict[str, Any] | None = None, timeout: float | None = None):
+        self._client = client
+        self._name = name
+        self._arguments = arguments or {}
+        self._timeout = timeout
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+        self.result = None
+        self.progress: float | None = None
+        self.total: float | None = None
+
+    async def __aenter__(self) -> "ToolCallStream":
+        self._task = asyncio.create_task(self._call())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def __aiter__(self) -> "ToolCallStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        item = await self._queue.get()
+        if item is _DONE:
+            # Leave the marker in place so iterating again also stops
+            self._queue.put_nowait(_DONE)
+            await self._task  # re-raise the tool error, if any
+            raise StopAsyncIteration
+        return item
+
+    async def _call(self) -> None:
+        try:
+            self.result = await self._client.call_tool(
+                self._name,
+                self._arguments,
+                timeout=self._timeout,
+                progress_handler=self._on_progress,
+            )
+        finally:
+            self._queue.put_nowait(_DONE)
+
+    async def _on_progress(self, progress: float, total: float | None, message: str | None) -> None:
+        self.progress = progress
+        self.total = total
+        for item in decode_partial_results(message):
+            self._queue.put_nowait(item)
+
+
+def stream_tool_call(client: Client, name: str, arguments: dict[str, Any] | None = None, timeout: float | None = None) -> ToolCallStream:
+    """Call a tool and iterate over its partial results as they are produced."""
+    return ToolCallStream(client, name, arguments, timeout)
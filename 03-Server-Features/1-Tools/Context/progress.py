@@ -0,0 +1,149 @@
+import asyncio
+import math
+import time
+
+from fastmcp import Context
+
+from partial_results import encode_partial_results
+
+
+class ThrottledProgress:
+    """Rate-limited progress reporting that only sends the latest value.
+
+    `update()` is a cheap synchronous call that is safe to make from tight
+    loops. A background task sends at most one notification per
+    `min_interval` seconds, and only once the value has moved by at least
+    `min_delta` (a fraction of `total`, or absolute units when there is no
+    total). Skipped values are coalesced into the next notification, and
+    the final value (`total`) is delivered when the block exits.
+
+    `emit()` attaches partial results to the next notification. Partial
+    results are batched under the same rate limit but never dropped. A
+    notification is only sent when the progress value has increased, as
+    MCP requires, so partial results wait for the next `update()`. Any left
+    at exit with no new value to carry them go out with the value nudged
+    just past the last one sent (`math.nextafter`), which stays within
+    `total` because the flusher never sends `total` itself.
+
+    Example:
+        async with ThrottledProgress(ctx, total=len(items)) as progress:
+            for i, item in enumerate(items, start=1):
+                progress.update(i)
+                progress.emit(handle(item))
+    """
+
+    def __init__(
+        self,
+        ctx: Context,
+        total: float | None = None,
+        min_interval: float = 0.1,
+        min_delta: float = 0.01,
+    ):
+        self.total = total
+        self.min_interval = min_interval
+        self._ctx = ctx
+        self._min_step = min_delta * total if total else min_delta
+
+        # ctx.report_progress() is a no-op without a progress token, so skip
+        # all bookkeeping when the client did not ask for progress.
+        meta = ctx.request_context.meta
+        self.enabled = meta is not None and meta.progressToken is not None
+
+        self._latest: float | None = None
+        self._message: str | None = None
+        self._partials: list = []
+        self._sent: float | None = None
+        self._sent_at = float("-inf")
+        self._wakeup = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+
+        self.updates = 0
+        self.notifications = 0
+
+    async def __aenter__(self) -> "ThrottledProgress":
+        if self.enabled:
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._flusher is not None:
+            # Never cancel the flusher halfway through a send
+            async with self._send_lock:
+                self._flusher.cancel()
+                try:
+                    await self._flusher
+                except asyncio.CancelledError:
+                    pass
+            self._flusher = None
+
+        if not self.enabled:
+            return
+
+        # A successful run always ends on 100%, even if the tool never
+        # reported the last step; a failed run only flushes what it had.
+        if exc_type is None and self.total is not None:
+            self._latest = self.total
+        if self._latest is None:
+            if not self._partials:
+                return
+            self._latest = 0
+        if self._sent is not None and self._latest <= self._sent:
+            if not self._partials:
+                return
+            self._latest = math.nextafter(self._sent, math.inf)
+        await self._send()
+
+    def update(self, progress: float, message: str | None = None) -> None:
+        """Record the current progress; a notification is sent when due."""
+        self.updates += 1
+        self._latest = progress
+        if message is not None:
+            self._message = message
+
+        if not self.enabled or self._wakeup.is_set():
+            return
+        if self._sent is None or progress - self._sent >= self._min_step:
+            self._wakeup.set()
+
+    def emit(self, item) -> None:
+        """Queue a JSON-serializable partial result for the next notification."""
+        if not self.enabled:
+            return
+        self._partials.append(item)
+        if self._has_news():
+            self._wakeup.set()
+
+    def _is_final(self, progress: float) -> bool:
+        return self.total is not None and progress >= self.total
+
+    def _has_news(self) -> bool:
+        """Whether the latest value may be sent now: higher than the last one, and not the final one."""
+        if self._latest is None or self._is_final(self._latest):
+            return False
+        return self._sent is None or self._latest > self._sent
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            delay = self._sent_at + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self._send_lock:
+                self._wakeup.clear()
+                # The value may not have moved (emit() alone), or reached `total`, which exit sends
+                if self._has_news():
+                    await self._send()
+
+    async def _send(self) -> None:
+        progress = self._latest
+        message = self._message
+        if self._partials:
+            message = encode_partial_results(self._partials, message)
+            self._partials = []
+
+        self._sent = progress
+        self._sent_at = time.monotonic()
+        self.notifications += 1
+        await self._ctx.report_progress(progress=progress, total=self.total, message=message)
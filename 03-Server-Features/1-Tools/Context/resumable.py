@@ -0,0 +1,392 @@
+import asyncio
+import contextlib
+import contextvars
+import itertools
+import uuid
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+import anyio
+import httpx
+import mcp.types
+from fastmcp import FastMCP
+from fastmcp.server.http import create_streamable_http_app
+from mcp.client.session import ClientSession
+from mcp.client.streamable_http import MCP_PROTOCOL_VERSION, MCP_SESSION_ID, streamablehttp_client
+from mcp.server.streamable_http import MCP_SESSION_ID_HEADER, EventCallback, EventId, EventMessage, EventStore, StreamId
+from mcp.shared.message import ClientMessageMetadata
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.routing import Mount, Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ProgressHandler = Callable[[float, float | None, str | None], Awaitable[None]]
+
+
+class MemoryEventStore(EventStore):
+    """The server-to-client events of one session, oldest dropped beyond `max_events`.
+
+    Event ids are `<stream id>:<sequence number>`, so a client can resume a
+    stream even when the last event it saw has already been dropped; the
+    replay then starts at the oldest event still kept and `gaps` counts it.
+    """
+
+    def __init__(self, max_events: int = 1000):
+        self.max_events = max_events
+        self.dropped = 0
+        self.replays = 0
+        self.gaps = 0
+        self._events: deque[tuple[int, StreamId, mcp.types.JSONRPCMessage]] = deque()
+        self._sequence = itertools.count(1)
+
+    # Not __len__: the SDK checks `if self._event_store:`, and an empty store must still count
+    @property
+    def size(self) -> int:
+        return len(self._events)
+
+    async def store_event(self, stream_id: StreamId, message: mcp.types.JSONRPCMessage) -> EventId:
+        sequence = next(self._sequence)
+        self._events.append((sequence, stream_id, message))
+        if len(self._events) > self.max_events:
+            self._events.popleft()
+            self.dropped += 1
+        return f"{stream_id}:{sequence}"
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        stream_id, _, sequence = last_event_id.rpartition(":")
+        if not stream_id or not sequence.isdigit():
+            return None
+        after = int(sequence)
+        self.replays += 1
+        if self._events and self._events[0][0] > after + 1:
+            self.gaps += 1
+        # Copy first: new events may be stored while the callback awaits
+        for event_sequence, event_stream, message in list(self._events):
+            if event_sequence > after and event_stream == stream_id:
+                await send_callback(EventMessage(message, f"{event_stream}:{event_sequence}"))
+        return stream_id
+
+
+# The store of the session the current request belongs to; the SDK runs a session in a
+# task spawned while handling its initialize request, so the task inherits this
+_session_store: contextvars.ContextVar[MemoryEventStore | None] = contextvars.ContextVar("session_store", default=None)
+
+
+class SessionEventStores(EventStore):
+    """The one event store the SDK takes, backed by a MemoryEventStore per session.
+
+    With one shared store, stream ids (the JSON-RPC request ids) of
+    different sessions would collide; a store per session also keeps one
+    session from replaying another's events. `_SessionStoreApp` picks the
+    store for each request, and a session's events go with it when the
+    session ends.
+    """
+
+    def __init__(self, max_events: int = 1000):
+        self.max_events = max_events
+        # Each store is kept alive by its session's task, which holds it in `_session_store`
+        self._by_session: weakref.WeakValueDictionary[str, MemoryEventStore] = weakref.WeakValueDictionary()
+
+    def new_store(self) -> MemoryEventStore:
+        return MemoryEventStore(self.max_events)
+
+    def assign(self, session_id: str, store: MemoryEventStore) -> None:
+        self._by_session[session_id] = store
+
+    def for_session(self, session_id: str) -> MemoryEventStore | None:
+        return self._by_session.get(session_id)
+
+    async def store_event(self, stream_id: StreamId, message: mcp.types.JSONRPCMessage) -> EventId:
+        store = _session_store.get()
+        if store is None:
+            raise RuntimeError("Event stored outside a session started through resumable_http_app()")
+        return await store.store_event(stream_id, message)
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        store = _session_store.get()
+        if store is None:
+            return None
+        return await store.replay_events_after(last_event_id, send_callback)
+
+    def stats(self) -> dict[str, int]:
+        stores = list(self._by_session.values())
+        return {
+            "sessions": len(stores),
+            "events": sum(store.size for store in stores),
+            "dropped": sum(store.dropped for store in stores),
+            "replays": sum(store.replays for store in stores),
+            "gaps": sum(store.gaps for store in stores),
+        }
+
+
+class _SessionStoreApp:
+    """ASGI wrapper around the MCP endpoint that sets `_session_store` for each request.
+
+    A request without `Mcp-Session-Id` may start a session, so it gets a
+    new store, which is filed under the session id the response carries.
+    """
+
+    def __init__(self, app: ASGIApp, stores: SessionEventStores):
+        self.app = app
+        self.stores = stores
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session_id = Headers(scope=scope).get(MCP_SESSION_ID_HEADER)
+        if session_id is not None:
+            store = self.stores.for_session(session_id)
+            wrapped_send = send
+        else:
+            store = self.stores.new_store()
+
+            async def wrapped_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    new_session_id = Headers(raw=message["headers"]).get(MCP_SESSION_ID_HEADER)
+                    if new_session_id is not None:
+                        self.stores.assign(new_session_id, store)
+                await send(message)
+
+        token = _session_store.set(store)
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            _session_store.reset(token)
+
+
+def resumable_http_app(
+    server: FastMCP,
+    path: str = "/mcp",
+    max_events: int = 1000,
+    middleware: list | None = None,
+) -> Starlette:
+    """Streamable HTTP app for `server`, like `server.http_app()`, with resumable sessions.
+
+    Every event sent on a session's SSE streams is kept (up to `max_events`
+    per session), and a client that lost a stream can GET it again with the
+    `Last-Event-ID` header to receive what it missed, then the rest of the
+    stream. Custom routes and auth are included as in `server.http_app()`;
+    the event stores are at `app.state.event_store`.
+    """
+    stores = SessionEventStores(max_events)
+    app = create_streamable_http_app(server, path, event_store=stores, auth=server.auth, middleware=list(middleware or []))
+    # The MCP endpoint comes as a Mount, which redirects `path` to `path/`; serve `path` itself instead
+    for index, route in enumerate(app.router.routes):
+        if isinstance(route, Mount) and route.path == path.rstrip("/"):
+            app.router.routes[index] = Route(path, endpoint=_SessionStoreApp(route.app, stores))
+            break
+    else:
+        raise RuntimeError(f"No MCP endpoint at {path} in the app built for {server.name}")
+    app.state.event_store = stores
+    return app
+
+
+@dataclass
+class _Connection:
+    session: ClientSession
+    dropped: asyncio.Event
+    closing: asyncio.Event
+    task: asyncio.Task
+
+
+class ResumableSession:
+    """Streamable HTTP client whose tool calls survive a dropped connection.
+
+    When a stream breaks, it reconnects with the same `Mcp-Session-Id`
+    (without running `initialize` again) and resumes each call in flight
+    from the last event it received, so the server does not restart the
+    call and progress, log and partial-result notifications sent in the
+    meantime are replayed in order. Needs a server built with
+    `resumable_http_app()`.
+
+    A call that drops before its first event arrived has nothing to resume
+    from, and the server may already be running it. It raises
+    `ConnectionError` rather than risk running the tool twice, unless it
+    was made with `idempotent=True`, in which case it is sent again.
+
+    Example:
+        async with ResumableSession("http://localhost:8000/mcp") as session:
+            result = await session.call_tool("process_with_progress", {...}, progress_handler=on_progress)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        retries: int = 5,
+        retry_delay: float = 0.1,
+        connect_timeout: float = 10,
+        logging_callback=None,
+        sampling_callback=None,
+    ):
+        self.url = url
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.connect_timeout = connect_timeout
+        self.logging_callback = logging_callback
+        self.sampling_callback = sampling_callback
+        self.session_id: str | None = None
+        self.protocol_version: str | None = None
+        self.reconnects = 0
+        self.resumed_calls = 0
+        self._connection: _Connection | None = None
+        self._lock = asyncio.Lock()
+        self._progress_handlers: dict[str, ProgressHandler] = {}
+
+    async def __aenter__(self) -> "ResumableSession":
+        await self._live_connection()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Disconnect and end the session on the server."""
+        if self._connection is not None:
+            await self._disconnect(self._connection)
+            self._connection = None
+        if self.session_id is not None:
+            session_id, self.session_id = self.session_id, None
+            async with httpx.AsyncClient(follow_redirects=True) as http:
+                try:
+                    response = await http.delete(self.url, headers={MCP_SESSION_ID: session_id})
+                except httpx.TransportError:
+                    return  # the server is gone, and the session with it
+            # 404: already ended; 405: the server does not let clients end sessions
+            if not response.is_success and response.status_code not in (404, 405):
+                raise ConnectionError(f"Ending session {session_id} failed: HTTP {response.status_code}")
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: dict[str, Any] | None = None,
+        progress_handler: ProgressHandler | None = None,
+        timeout: float | None = None,
+        idempotent: bool = False,
+    ) -> mcp.types.CallToolResult:
+        # Our own progress token, so replayed notifications still find their handler after reconnecting
+        token = uuid.uuid4().hex
+        request = mcp.types.ClientRequest(
+            mcp.types.CallToolRequest(
+                method="tools/call",
+                params=mcp.types.CallToolRequestParams(name=name, arguments=arguments or {}, _meta={"progressToken": token}),
+            )
+        )
+        last_event_id = None
+
+        async def remember(event_id: str) -> None:
+            nonlocal last_event_id
+            last_event_id = event_id
+
+        if progress_handler is not None:
+            self._progress_handlers[token] = progress_handler
+        try:
+            async with asyncio.timeout(timeout):
+                connection = await self._live_connection()
+                failures = 0
+                while True:
+                    if last_event_id is not None:
+                        self.resumed_calls += 1
+                    resumed_from = last_event_id
+                    metadata = ClientMessageMetadata(resumption_token=last_event_id, on_resumption_token_update=remember)
+                    call = asyncio.create_task(connection.session.send_request(request, mcp.types.CallToolResult, metadata=metadata))
+                    dropped = asyncio.create_task(connection.dropped.wait())
+                    try:
+                        done, _ = await asyncio.wait({call, dropped}, return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        dropped.cancel()
+                        if not call.done():
+                            call.cancel()
+                    if call in done:
+                        try:
+                            return call.result()
+                        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+                            pass  # the session's streams closed under the call: a dropped connection too
+                    if last_event_id is None and not idempotent:
+                        # No event id to resume from, and sending the call again might run the tool twice
+                        await self._live_connection(failed=connection)
+                        raise ConnectionError(
+                            f"Lost the connection to {self.url} before {name} sent any event; "
+                            "pass idempotent=True to send it again"
+                        )
+                    # Back off only while the call makes no progress; any new event resets the count
+                    failures = 0 if last_event_id != resumed_from else failures + 1
+                    if failures > self.retries:
+                        raise ConnectionError(f"Lost the connection to {self.url} during {name}")
+                    await asyncio.sleep(self.retry_delay * 2**failures)
+                    connection = await self._live_connection(failed=connection)
+        finally:
+            self._progress_handlers.pop(token, None)
+
+    async def _live_connection(self, failed: _Connection | None = None) -> _Connection:
+        """The current connection; replaces `failed` if it is still the current one.
+
+        Reconnecting sends nothing until a call resumes, so it does not fail
+        while the server is unreachable; the resumed call does.
+        """
+        async with self._lock:
+            if failed is not None and self._connection is failed:
+                await self._disconnect(failed)
+                self._connection = None
+            if self._connection is None:
+                self._connection = await self._connect()
+                if failed is not None:
+                    self.reconnects += 1
+            return self._connection
+
+    async def _connect(self) -> _Connection:
+        ready = asyncio.get_running_loop().create_future()
+        dropped, closing = asyncio.Event(), asyncio.Event()
+        task = asyncio.create_task(self._run_connection(ready, dropped, closing))
+        try:
+            session = await asyncio.wait_for(asyncio.shield(ready), self.connect_timeout)
+        except BaseException:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            raise
+        return _Connection(session, dropped, closing, task)
+
+    async def _run_connection(self, ready: asyncio.Future, dropped: asyncio.Event, closing: asyncio.Event) -> None:
+        """Own the transport and session of one connection, so they are opened and closed in the same task."""
+        headers = {}
+        if self.session_id is not None:
+            headers[MCP_SESSION_ID] = self.session_id
+            headers[MCP_PROTOCOL_VERSION] = self.protocol_version
+        try:
+            # terminate_on_close=False: dropping this connection must not end the session
+            async with streamablehttp_client(self.url, headers=headers, terminate_on_close=False) as (read, write, get_session_id):
+                async with ClientSession(
+                    read,
+                    write,
+                    message_handler=partial(self._on_message, dropped),
+                    logging_callback=self.logging_callback,
+                    sampling_callback=self.sampling_callback,
+                ) as session:
+                    if self.session_id is None:
+                        result = await session.initialize()
+                        self.session_id = get_session_id()
+                        self.protocol_version = str(result.protocolVersion)
+                    ready.set_result(session)
+                    await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            dropped.set()
+
+    async def _disconnect(self, connection: _Connection) -> None:
+        connection.closing.set()
+        try:
+            await asyncio.wait_for(connection.task, 1)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+
+    async def _on_message(self, dropped: asyncio.Event, message) -> None:
+        if isinstance(message, httpx.TransportError):
+            dropped.set()
+        elif isinstance(message, mcp.types.ServerNotification) and isinstance(message.root, mcp.types.ProgressNotification):
+            params = message.root.params
+            handler = self._progress_handlers.get(params.progressToken)
+            if handler is not None:
+                await handler(params.progress, params.total, params.message)
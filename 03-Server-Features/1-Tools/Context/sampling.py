@@ -0,0 +1,185 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+
+from fastmcp import Context
+from mcp.types import ModelPreferences
+
+BATCH_INSTRUCTIONS = (
+    "Answer each of the following {count} tasks independently.\n"
+    "Respond with only a JSON array of {count} strings, where element i is the answer to task i.\n"
+)
+
+
+class SamplingCache:
+    """LRU cache of sampling results keyed by prompt and model preferences."""
+
+    def __init__(self, max_entries: int = 256, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        model_preferences: ModelPreferences | str | list[str] | None = None,
+    ) -> str:
+        if isinstance(model_preferences, ModelPreferences):
+            model_preferences = model_preferences.model_dump(mode="json", exclude_none=True)
+        return json.dumps(
+            [prompt, system_prompt, temperature, max_tokens, model_preferences],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None or (self.ttl is not None and time.monotonic() - entry[0] > self.ttl):
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, text: str) -> None:
+        self._entries[key] = (time.monotonic(), text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SamplingFanout:
+    """Send several sampling prompts to the client and return the texts in order.
+
+    `sample_many()` runs one `ctx.sample` per prompt, at most `max_concurrency`
+    at a time. `sample_batched()` packs all prompts into a single sampling
+    request and falls back to `sample_many()` if the reply cannot be split.
+    Identical prompts are only sent once, and with a `SamplingCache` repeated
+    prompts never leave the server.
+    """
+
+    def __init__(self, ctx: Context, max_concurrency: int = 4, cache: SamplingCache | None = None):
+        self._ctx = ctx
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = cache
+
+    async def sample(self, prompt: str, **options) -> str:
+        """Sample a single prompt, going through the cache."""
+        return (await self.sample_many([prompt], **options))[0]
+
+    async def sample_many(
+        self,
+        prompts: list[str],
+        *,
+        system_prompt: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        model_preferences: ModelPreferences | str | list[str] | None = None,
+        return_exceptions: bool = False,
+    ) -> list[str | BaseException]:
+        """Sample every prompt concurrently; results line up with `prompts`."""
+        options = {
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "model_preferences": model_preferences,
+        }
+        keys, texts, pending = self._lookup(prompts, options)
+        texts.update(await self._sample_each(pending, options, return_exceptions))
+        return [texts[key] for key in keys]
+
+    async def sample_batched(
+        self,
+        prompts: list[str],
+        *,
+        system_prompt: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        model_preferences: ModelPreferences | str | list[str] | None = None,
+    ) -> list[str]:
+        """Sample all prompts in one request; results line up with `prompts`."""
+        options = {
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "model_preferences": model_preferences,
+        }
+        keys, texts, pending = self._lookup(prompts, options)
+        answers = await self._sample_as_batch(pending, options) if len(pending) > 1 else None
+        if answers is None:
+            if len(pending) > 1:
+                await self._ctx.warning("Batched sampling reply could not be split, retrying per prompt")
+            answers = await self._sample_each(pending, options)
+        texts.update(answers)
+        return [texts[key] for key in keys]
+
+    def _lookup(self, prompts: list[str], options: dict) -> tuple[list[str], dict[str, str], dict[str, str]]:
+        """Split prompts into cached texts and unique prompts still to sample."""
+        keys = [SamplingCache.make_key(prompt, **options) for prompt in prompts]
+        texts: dict[str, str] = {}
+        pending: dict[str, str] = {}
+        for key, prompt in zip(keys, prompts):
+            if key in texts or key in pending:
+                continue
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is None:
+                pending[key] = prompt
+            else:
+                texts[key] = cached
+        return keys, texts, pending
+
+    async def _sample_each(
+        self, pending: dict[str, str], options: dict, return_exceptions: bool = False
+    ) -> dict[str, str | BaseException]:
+        async def _sample_one(prompt: str) -> str:
+            async with self._semaphore:
+                response = await self._ctx.sample(prompt, **options)
+            return response.text
+
+        texts = await asyncio.gather(
+            *(_sample_one(prompt) for prompt in pending.values()),
+            return_exceptions=return_exceptions,
+        )
+        self._remember(pending, texts)
+        return dict(zip(pending, texts))
+
+    async def _sample_as_batch(self, pending: dict[str, str], options: dict) -> dict[str, str] | None:
+        tasks = "\n".join(f"Task {i}:\n{prompt}\n" for i, prompt in enumerate(pending.values(), start=1))
+        batch_options = dict(options, max_tokens=(options["max_tokens"] or 512) * len(pending))
+        async with self._semaphore:
+            response = await self._ctx.sample(
+                BATCH_INSTRUCTIONS.format(count=len(pending)) + "\n" + tasks, **batch_options
+            )
+
+        answers = _parse_batch_reply(response.text, len(pending))
+        if answers is None:
+            return None
+        self._remember(pending, answers)
+        return dict(zip(pending, answers))
+
+    def _remember(self, pending: dict[str, str], texts: list) -> None:
+        if self.cache is None:
+            return
+        for key, text in zip(pending, texts):
+            if isinstance(text, str):
+                self.cache.set(key, text)
+
+
+def _parse_batch_reply(text: str, count: int) -> list[str] | None:
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return None
+    try:
+        answers = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(answers, list) or len(answers) != count:
+        return None
+    return [answer if isinstance(answer, str) else json.dumps(answer, ensure_ascii=False) for answer in answers]
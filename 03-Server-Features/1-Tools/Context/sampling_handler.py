@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from fastmcp.client.sampling import SamplingMessage, SamplingParams
+
+
+@dataclass
+class SamplingRequest:
+    """One queued sampling request, flattened for a backend."""
+
+    prompt: str
+    system_prompt: str | None = None
+    max_tokens: int = 512
+    temperature: float | None = None
+    model_hints: list[str] = field(default_factory=list)
+
+    @property
+    def estimated_tokens(self) -> int:
+        # Rough 4-characters-per-token estimate plus the completion budget
+        return len(self.prompt) // 4 + self.max_tokens
+
+
+class SamplingBackend(Protocol):
+    """Anything that can turn a batch of sampling requests into texts, in order."""
+
+    async def generate(self, batch: list[SamplingRequest]) -> list[str]: ...
+
+
+class LocalSamplingBackend:
+    """Deterministic, offline stand-in for an LLM backend.
+
+    Every batch costs `batch_latency` seconds plus `token_latency` per
+    generated token of the longest reply, like a batched inference server.
+    The same prompt always produces the same reply, so sampling-heavy tools
+    can be load-tested and compared run to run without network access.
+    """
+
+    def __init__(self, batch_latency: float = 0.05, token_latency: float = 0.0005):
+        self.batch_latency = batch_latency
+        self.token_latency = token_latency
+
+    async def generate(self, batch: list[SamplingRequest]) -> list[str]:
+        replies = [self.complete(request) for request in batch]
+        longest = max(len(reply.split()) for reply in replies)
+        await asyncio.sleep(self.batch_latency + self.token_latency * longest)
+        return replies
+
+    def complete(self, request: SamplingRequest) -> str:
+        digest = hashlib.sha256(request.prompt.encode()).hexdigest()[:8]
+        words = request.prompt.split(":", 1)[-1].split()
+
+        # Batched prompts (see sampling.py) expect a JSON array of answers
+        batch = re.search(r"following (\d+) tasks", request.prompt)
+        if batch:
+            count = int(batch.group(1))
+            answers = ", ".join(f'"[local {digest}] answer {i}"' for i in range(1, count + 1))
+            return f"[{answers}]"
+
+        if "sentiment" in request.prompt.lower():
+            return f"[local {digest}] neutral - {' '.join(words[:10])}"
+        if "keywords" in request.prompt.lower():
+            keywords = sorted({word.strip(".,").lower() for word in words if len(word) > 6})[:5]
+            return f"[local {digest}] " + ", ".join(keywords)
+        return f"[local {digest}] " + " ".join(words[:min(15, request.max_tokens)])
+
+
+class BatchingSamplingHandler:
+    """Client sampling handler that queues requests and sends them to a backend in batches.
+
+    Pass one instance as `sampling_handler=` to any number of `Client`s.
+    Requests arriving within `max_wait` seconds of each other are grouped
+    into batches of up to `max_batch_size` requests or `max_batch_tokens`
+    estimated tokens. At most `max_concurrency` batches run at once, and
+    once `token_budget` estimated tokens have been spent further requests
+    fail with an error that is returned to the server.
+
+    Note that the MCP client session handles server requests one at a time,
+    so batches form across sessions (or across servers), not within one.
+    """
+
+    def __init__(
+        self,
+        backend: SamplingBackend,
+        max_batch_size: int = 8,
+        max_wait: float = 0.01,
+        max_concurrency: int = 2,
+        max_batch_tokens: int = 8192,
+        token_budget: int | None = None,
+    ):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_batch_tokens = max_batch_tokens
+        self.token_budget = token_budget
+        self._concurrency = asyncio.Semaphore(max_concurrency)
+        self._queue: asyncio.Queue[tuple[SamplingRequest, asyncio.Future]] = asyncio.Queue()
+        self._dispatcher: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+        self._carried: tuple[SamplingRequest, asyncio.Future] | None = None
+
+        self.requests = 0
+        self.batches = 0
+        self.tokens_used = 0
+
+    async def __call__(self, messages: list[SamplingMessage], params: SamplingParams, context) -> str:
+        request = SamplingRequest(
+            prompt="\n".join(m.content.text for m in messages if m.content.type == "text"),
+            system_prompt=params.systemPrompt,
+            max_tokens=params.maxTokens,
+            temperature=params.temperature,
+            model_hints=[hint.name for hint in (params.modelPreferences.hints or [])]
+            if params.modelPreferences
+            else [],
+        )
+
+        # Reserve the tokens up front so concurrent requests cannot overspend the budget
+        if self.token_budget is not None and self.tokens_used + request.estimated_tokens > self.token_budget:
+            raise RuntimeError(f"Sampling token budget of {self.token_budget} tokens exhausted")
+        self.tokens_used += request.estimated_tokens
+        self.requests += 1
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        try:
+            return await future
+        except BaseException:
+            # Nothing was generated, so give the reservation back
+            self.tokens_used -= request.estimated_tokens
+            raise
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    async def aclose(self) -> None:
+        """Stop dispatching, fail requests still queued and wait for in-flight batches."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        pending = [self._carried] if self._carried is not None else []
+        self._carried = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending)
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            if self._carried is not None:
+                batch, self._carried = [self._carried], None
+            else:
+                batch = [await self._queue.get()]
+            try:
+                batch_tokens = batch[0][0].estimated_tokens
+                deadline = time.monotonic() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if batch_tokens + item[0].estimated_tokens > self.max_batch_tokens:
+                        # Over the cap: the request starts the next batch instead
+                        self._carried = item
+                        break
+                    batch.append(item)
+                    batch_tokens += item[0].estimated_tokens
+
+                await self._concurrency.acquire()
+            except asyncio.CancelledError:
+                # Closed before the batch started: it is neither queued nor running
+                self._fail(batch)
+                raise
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    @staticmethod
+    def _fail(batch: list[tuple[SamplingRequest, asyncio.Future]]) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Sampling handler closed before the request was sent"))
+
+    async def _run_batch(self, batch: list[tuple[SamplingRequest, asyncio.Future]]) -> None:
+        self.batches += 1
+        try:
+            replies = await self.backend.generate([request for request, _ in batch])
+            for (_, future), reply in zip(batch, replies):
+                if not future.done():
+                    future.set_result(reply)
+            if len(replies) != len(batch):
+                raise RuntimeError(f"Sampling backend returned {len(replies)} replies for {len(batch)} requests")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._concurrency.release()
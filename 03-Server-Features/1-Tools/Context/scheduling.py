@@ -0,0 +1,298 @@
+import asyncio
+import functools
+import inspect
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import anyio
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+
+@dataclass
+class Quota:
+    """Limits for one client.
+
+    - rate / burst: token bucket; each call takes one token, `rate` tokens
+      come back per second, at most `burst` are saved up
+    - weight: share of the execution slots while other clients are waiting
+    - max_concurrency: slots this client may hold at once (None: no cap)
+    - max_queued: calls this client may have waiting for a slot
+    """
+
+    rate: float = 10.0
+    burst: int = 20
+    weight: float = 1.0
+    max_concurrency: int | None = None
+    max_queued: int = 100
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self, amount: float = 1.0) -> float:
+        """Take `amount` tokens; returns 0, or the seconds until they would be available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+@dataclass
+class _Waiter:
+    finish: float
+    order: int
+    future: asyncio.Future
+
+
+@dataclass(eq=False)
+class _ClientState:
+    quota: Quota
+    bucket: TokenBucket
+    queue: deque = field(default_factory=deque)
+    last_finish: float = 0.0
+    running: int = 0
+    calls: int = 0
+    rejected: int = 0
+    errors: int = 0
+    cost: float = 0.0
+    wait_seconds: float = 0.0
+    max_wait: float = 0.0
+    run_seconds: float = 0.0
+
+
+def default_client_key(ctx) -> str:
+    """`ctx.client_id` if the client sent one, else its transport session.
+
+    On streamable HTTP that is the `Mcp-Session-Id` header of the request
+    (`ctx.session_id` reads the header of a request context that tool calls
+    do not run in, so it is None there); on other transports, the
+    ServerSession object, labelled with the client's name.
+    """
+    if ctx is None:
+        return "anonymous"
+    for getter in (
+        lambda: ctx.client_id,
+        lambda: ctx.request_context.request.headers.get("mcp-session-id"),
+        lambda: f"{ctx.session.client_params.clientInfo.name}#{id(ctx.session):x}",
+    ):
+        try:
+            key = getter()
+        except Exception:
+            key = None
+        if key:
+            return str(key)
+    return "anonymous"
+
+
+class FairScheduler(Middleware):
+    """Per-client rate limits and weighted fair queuing of tool execution.
+
+    At most `max_concurrency` tool calls run at once. A call first takes a
+    token from its client's bucket (or is rejected with a retry hint), then
+    waits for an execution slot. Free slots go to the waiting call with the
+    smallest virtual finish time, where each call advances its client's
+    clock by `cost / weight`; so a client with a long backlog of expensive
+    calls does not delay the next cheap call of a quiet client.
+
+    A client with nothing queued or running is forgotten after
+    `idle_timeout` seconds without calls (and not before its bucket has
+    refilled, so forgetting it does not reset a rate limit); its counters
+    drop out of `stats()` with it.
+
+    `cost(name, arguments)` estimates the work of a call (default 1). With
+    `offload_sync`, sync tool functions run in worker threads instead of
+    on the event loop, so they are scheduled like async tools and a long
+    one does not block the server.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        quotas: dict[str, Quota] | None = None,
+        default_quota: Quota | None = None,
+        cost: Callable[[str, dict[str, Any]], float] | None = None,
+        client_key: Callable[[Any], str] = default_client_key,
+        offload_sync: bool = True,
+        idle_timeout: float = 600,
+    ):
+        self.max_concurrency = max_concurrency
+        self.quotas = quotas or {}
+        self.default_quota = default_quota or Quota()
+        self.cost = cost or (lambda name, arguments: 1.0)
+        self.client_key = client_key
+        self.offload_sync = offload_sync
+        self.idle_timeout = idle_timeout
+        self._clients: dict[str, _ClientState] = {}
+        # Clients with calls waiting, so dispatch does not scan idle ones
+        self._backlogged: set[_ClientState] = set()
+        self._next_eviction = time.monotonic() + idle_timeout
+        self._running = 0
+        self._virtual_time = 0.0
+        self._order = itertools.count()
+        self._threads = anyio.CapacityLimiter(max_concurrency)
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        ctx = context.fastmcp_context
+        name = context.message.name
+        arguments = context.message.arguments or {}
+        client = self.client_key(ctx)
+        state = self._client(client)
+
+        retry_after = state.bucket.take()
+        if retry_after:
+            state.rejected += 1
+            raise ToolError(f"Rate limit exceeded for client {client!r}, retry in {retry_after:.2f}s")
+        if len(state.queue) >= state.quota.max_queued:
+            state.rejected += 1
+            raise ToolError(f"Too many queued calls for client {client!r}")
+
+        if self.offload_sync and ctx is not None:
+            await self._offload(ctx.fastmcp, name)
+
+        cost = max(float(self.cost(name, arguments)), 0.0)
+        queued = time.perf_counter()
+        await self._acquire(state, cost)
+        started = time.perf_counter()
+        waited = started - queued
+        state.calls += 1
+        state.cost += cost
+        state.wait_seconds += waited
+        state.max_wait = max(state.max_wait, waited)
+        try:
+            return await call_next(context)
+        except Exception:
+            state.errors += 1
+            raise
+        finally:
+            state.run_seconds += time.perf_counter() - started
+            self._release(state)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-client counters, for the /metrics/clients endpoint."""
+        return {
+            client: {
+                "calls": state.calls,
+                "rejected": state.rejected,
+                "errors": state.errors,
+                "running": state.running,
+                "queued": len(state.queue),
+                "cost": state.cost,
+                "wait_seconds": state.wait_seconds,
+                "max_wait_seconds": state.max_wait,
+                "run_seconds": state.run_seconds,
+                "tokens": state.bucket.tokens,
+                "weight": state.quota.weight,
+            }
+            for client, state in self._clients.items()
+        }
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric, kind, help_text, field_name in (
+            ("mcp_client_calls_total", "counter", "Tool calls run per client.", "calls"),
+            ("mcp_client_rejected_total", "counter", "Tool calls rejected by rate limit or queue size.", "rejected"),
+            ("mcp_client_wait_seconds_total", "counter", "Time spent waiting for an execution slot.", "wait_seconds"),
+            ("mcp_client_run_seconds_total", "counter", "Time spent running tool calls.", "run_seconds"),
+            ("mcp_client_queued", "gauge", "Tool calls waiting for an execution slot.", "queued"),
+            ("mcp_client_running", "gauge", "Tool calls running.", "running"),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for client, values in sorted(self.stats().items()):
+                label = client.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{metric}{{client="{label}"}} {values[field_name]}')
+        return "\n".join(lines) + "\n"
+
+    def _client(self, client: str) -> _ClientState:
+        state = self._clients.get(client)
+        if state is None:
+            self._evict_idle()
+            quota = self.quotas.get(client, self.default_quota)
+            state = self._clients[client] = _ClientState(quota, TokenBucket(quota.rate, quota.burst))
+        return state
+
+    def _evict_idle(self) -> None:
+        """Forget idle clients; runs at most once per `idle_timeout`, when a new client appears."""
+        now = time.monotonic()
+        if now < self._next_eviction:
+            return
+        self._next_eviction = now + self.idle_timeout
+        for client, state in list(self._clients.items()):
+            idle = now - state.bucket.updated
+            refilled = idle >= state.bucket.burst / state.bucket.rate
+            if not state.queue and not state.running and idle >= self.idle_timeout and refilled:
+                del self._clients[client]
+
+    async def _acquire(self, state: _ClientState, cost: float) -> None:
+        start = max(self._virtual_time, state.last_finish)
+        state.last_finish = start + cost / state.quota.weight
+        waiter = _Waiter(state.last_finish, next(self._order), asyncio.get_running_loop().create_future())
+        state.queue.append(waiter)
+        self._backlogged.add(state)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was granted just as the caller gave up
+                self._release(state)
+            else:
+                state.queue.remove(waiter)
+                if not state.queue:
+                    self._backlogged.discard(state)
+            raise
+
+    def _release(self, state: _ClientState) -> None:
+        self._running -= 1
+        state.running -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_concurrency:
+            best = None
+            for state in self._backlogged:
+                if state.quota.max_concurrency is not None and state.running >= state.quota.max_concurrency:
+                    continue
+                head = state.queue[0]
+                if best is None or (head.finish, head.order) < (best[1].finish, best[1].order):
+                    best = (state, head)
+            if best is None:
+                return
+            state, waiter = best
+            state.queue.popleft()
+            if not state.queue:
+                self._backlogged.discard(state)
+            self._running += 1
+            state.running += 1
+            self._virtual_time = max(self._virtual_time, waiter.finish)
+            waiter.future.set_result(None)
+
+    async def _offload(self, server, name: str) -> None:
+        try:
+            tool = await server.get_tool(name)
+        except Exception:
+            return
+        fn = getattr(tool, "fn", None)
+        if fn is not None and not inspect.iscoroutinefunction(fn) and not getattr(fn, "__offloaded__", False):
+            tool.fn = _in_thread(fn, self._threads)
+
+
+def _in_thread(fn, limiter: anyio.CapacityLimiter):
+    """Wrap a sync tool function so it runs in a worker thread."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs), limiter=limiter)
+
+    wrapper.__offloaded__ = True
+    return wrapper
@@ -2,7 +2,62 @@ from fastmcp import FastMCP, Context
 import asyncio
 import time
 
-mcp = FastMCP(name="ContextDemo")
+import anyio
+import uvicorn
+from starlette.middleware import Middleware as ASGIMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from compression import CompressionMiddleware
+from metrics import MetricsMiddleware, SamplingProfiler
+from progress import ThrottledProgress
+from resumable import resumable_http_app
+from sampling import SamplingCache, SamplingFanout
+from scheduling import FairScheduler, Quota
+from spill import ResultSpill
+from structured import StructuredOnlyMiddleware, json_serializer
+
+metrics = MetricsMiddleware()
+profiler = SamplingProfiler(interval=0.005)
+
+def _estimate_cost(name: str, arguments: dict) -> float:
+    """Relative work of a tool call, so long tasks count for more in fair queuing."""
+    if name == "process_with_progress":
+        return max(1, arguments.get("steps", 1))
+    if name == "process_many_items":
+        return max(1, arguments.get("item_count", 0) / 100_000)
+    return 1
+
+# Per-client rate limits and fair sharing of 8 execution slots; no client holds more than 4
+scheduler = FairScheduler(
+    max_concurrency=8,
+    default_quota=Quota(rate=5, burst=20, max_concurrency=4),
+    cost=_estimate_cost,
+)
+
+# Results over 32k characters are kept on the server for 10 minutes and returned as a spill:// handle
+spill = ResultSpill(threshold=32_000, ttl=600)
+
+mcp = FastMCP(
+    name="ContextDemo",
+    middleware=[metrics, scheduler, spill, StructuredOnlyMiddleware()],
+    tool_serializer=json_serializer,
+)
+spill.register(mcp)
+
+# Shared across requests so repeated analyses of the same input skip the client's LLM
+sampling_cache = SamplingCache(max_entries=256, ttl=600)
+
+def _build_analysis_prompt(data: str, analysis_type: str) -> str:
+    """Build the LLM prompt for one analysis type."""
+    if analysis_type == "summary":
+        return f"Summarize this text in exactly 15 words: {data[:500]}"
+    elif analysis_type == "sentiment":
+        return f"Analyze the sentiment of this text (positive/negative/neutral) and explain briefly: {data[:300]}"
+    elif analysis_type == "keywords":
+        return f"Extract 5 key topics/keywords from this text: {data[:400]}"
+    else:
+        return f"Analyze this text and provide insights: {data[:200]}"
 
 @mcp.tool
 async def demonstrate_logging(message: str, ctx: Context) -> dict:
@@ -30,23 +85,26 @@ async def demonstrate_logging(message: str, ctx: Context) -> dict:
 
 @mcp.tool
 async def process_with_progress(task_name: str, steps: int, ctx: Context) -> dict:
-    """Demonstrate progress reporting during task execution."""
+    """Demonstrate progress reporting and partial results during task execution."""
     
     await ctx.info(f"Starting task: {task_name} with {steps} steps")
     
     results = []
-    for i in range(steps):
-        # Report progress
-        progress = i + 1
-        await ctx.report_progress(progress=progress, total=steps)
-        
-        # Simulate work
-        await asyncio.sleep(0.5)
-        
-        step_result = f"Step {progress}/{steps}: Processing..."
-        results.append(step_result)
-        
-        await ctx.debug(f"Completed step {progress}")
+    async with ThrottledProgress(ctx, total=steps) as progress:
+        for i in range(steps):
+            step = i + 1
+            
+            # Simulate work
+            await asyncio.sleep(0.5)
+            
+            step_result = f"Step {step}/{steps}: Processing..."
+            results.append(step_result)
+            
+            # Report progress with the step's output (coalesced, at most every 100ms)
+            progress.update(step)
+            progress.emit(step_result)
+            
+            await ctx.debug(f"Completed step {step}")
     
     await ctx.info(f"Task '{task_name}' completed successfully!")
     
@@ -57,6 +115,32 @@ async def process_with_progress(task_name: str, steps: int, ctx: Context) -> dic
         "status": "completed"
     }
 
+@mcp.tool
+async def process_many_items(item_count: int, ctx: Context) -> dict:
+    """Demonstrate fine-grained progress from a tight loop over many items."""
+    
+    await ctx.info(f"Processing {item_count} items")
+    
+    checksum = 0
+    async with ThrottledProgress(ctx, total=item_count, min_interval=0.25) as progress:
+        for i in range(item_count):
+            checksum = (checksum + i * i) % 1_000_003
+            progress.update(i + 1)
+            
+            # Yield to the event loop now and then so notifications can go out
+            if i % 10_000 == 0:
+                await asyncio.sleep(0)
+    
+    await ctx.info(f"Sent {progress.notifications} progress notifications for {progress.updates} updates")
+    
+    return {
+        "item_count": item_count,
+        "checksum": checksum,
+        "progress_updates": progress.updates,
+        "progress_notifications": progress.notifications,
+        "status": "completed"
+    }
+
 @mcp.tool
 async def analyze_data_with_llm(data: str, analysis_type: str, ctx: Context) -> dict:
     """Demonstrate LLM sampling for data analysis."""
@@ -65,22 +149,14 @@ async def analyze_data_with_llm(data: str, analysis_type: str, ctx: Context) ->
     await ctx.report_progress(progress=25, total=100)
     
     # Different types of analysis using LLM sampling
-    if analysis_type == "summary":
-        prompt = f"Summarize this text in exactly 15 words: {data[:500]}"
-    elif analysis_type == "sentiment":
-        prompt = f"Analyze the sentiment of this text (positive/negative/neutral) and explain briefly: {data[:300]}"
-    elif analysis_type == "keywords":
-        prompt = f"Extract 5 key topics/keywords from this text: {data[:400]}"
-    else:
-        prompt = f"Analyze this text and provide insights: {data[:200]}"
+    prompt = _build_analysis_prompt(data, analysis_type)
     
     await ctx.report_progress(progress=50, total=100)
     await ctx.info("Requesting LLM analysis...")
     
     try:
-        # Request analysis from client's LLM
-        response = await ctx.sample(prompt)
-        analysis_result = response.text
+        # Request analysis from client's LLM (cached per prompt)
+        analysis_result = await SamplingFanout(ctx, cache=sampling_cache).sample(prompt)
         
         await ctx.report_progress(progress=100, total=100)
         await ctx.info("Analysis completed successfully")
@@ -101,6 +177,44 @@ async def analyze_data_with_llm(data: str, analysis_type: str, ctx: Context) ->
             "status": "failed"
         }
 
+@mcp.tool
+async def analyze_data_multi(data: str, analysis_types: list[str], ctx: Context, batched: bool = False) -> dict:
+    """Run several LLM analyses of the same data concurrently or as one batched request."""
+    
+    await ctx.info(f"Starting {', '.join(analysis_types)} analysis of data")
+    prompts = [_build_analysis_prompt(data, analysis_type) for analysis_type in analysis_types]
+    fanout = SamplingFanout(ctx, max_concurrency=4, cache=sampling_cache)
+    
+    try:
+        if batched:
+            results = await fanout.sample_batched(prompts)
+        else:
+            results = await fanout.sample_many(prompts, return_exceptions=True)
+    except Exception as e:
+        await ctx.error(f"LLM analysis failed: {str(e)}")
+        return {
+            "analysis_types": analysis_types,
+            "data_length": len(data),
+            "error": str(e),
+            "status": "failed"
+        }
+    
+    analyses = {}
+    for analysis_type, result in zip(analysis_types, results):
+        if isinstance(result, BaseException):
+            analyses[analysis_type] = {"error": str(result), "status": "failed"}
+        else:
+            analyses[analysis_type] = {"analysis_result": result, "status": "success"}
+    
+    await ctx.info(f"Analysis completed (cache hits: {sampling_cache.hits}, misses: {sampling_cache.misses})")
+    
+    return {
+        "analysis_types": analysis_types,
+        "data_length": len(data),
+        "analyses": analyses,
+        "status": "success"
+    }
+
 @mcp.tool
 async def read_and_process_resource(resource_uri: str, ctx: Context) -> dict:
     """Demonstrate resource reading and processing."""
@@ -155,63 +269,103 @@ async def comprehensive_demo(input_text: str, ctx: Context) -> dict:
     """Comprehensive demonstration of all Context features."""
     
     demo_start = time.time()
+    async with ThrottledProgress(ctx, total=100) as progress:
+        # Step 1: Logging
+        await ctx.info("=== Comprehensive Context Demo Started ===")
+        await ctx.debug(f"Input text length: {len(input_text)}")
+        progress.update(10)
+        
+        # Step 2: Request information
+        request_info = {
+            "request_id": ctx.request_id,
+            "client_id": ctx.client_id,
+            "timestamp": demo_start
+        }
+        await ctx.info(f"Request details: {request_info}")
+        progress.update(25)
+        progress.emit({"request_info": request_info})
+        
+        # Step 3: LLM Analysis
+        await ctx.info("Performing LLM analysis...")
+        try:
+            summary_response = await ctx.sample(f"Create a brief summary of this text: {input_text[:300]}")
+            summary = summary_response.text
+            await ctx.info("LLM analysis completed")
+        except Exception as e:
+            await ctx.warning(f"LLM analysis failed: {e}")
+            summary = "Analysis unavailable"
+        
+        progress.update(60)
+        progress.emit({"summary": summary})
+        
+        # Step 4: Processing simulation
+        await ctx.info("Simulating data processing...")
+        await asyncio.sleep(1)  # Simulate processing time
+        
+        processed_data = {
+            "original_length": len(input_text),
+            "word_count": len(input_text.split()),
+            "summary": summary,
+            "processing_time": time.time() - demo_start
+        }
+        
+        progress.update(90)
+        progress.emit({"processed_data": processed_data})
+        
+        # Step 5: Final results
+        final_result = {
+            "demo_status": "completed",
+            "request_info": request_info,
+            "processed_data": processed_data,
+            "context_features_used": [
+                "logging (debug, info, warning)",
+                "progress_reporting",
+                "partial_results",
+                "llm_sampling",
+                "request_information"
+            ]
+        }
     
-    # Step 1: Logging
-    await ctx.info("=== Comprehensive Context Demo Started ===")
-    await ctx.debug(f"Input text length: {len(input_text)}")
-    await ctx.report_progress(progress=10, total=100)
-    
-    # Step 2: Request information
-    request_info = {
-        "request_id": ctx.request_id,
-        "client_id": ctx.client_id,
-        "timestamp": demo_start
-    }
-    await ctx.info(f"Request details: {request_info}")
-    await ctx.report_progress(progress=25, total=100)
-    
-    # Step 3: LLM Analysis
-    await ctx.info("Performing LLM analysis...")
-    try:
-        summary_response = await ctx.sample(f"Create a brief summary of this text: {input_text[:300]}")
-        summary = summary_response.text
-        await ctx.info("LLM analysis completed")
-    except Exception as e:
-        await ctx.warning(f"LLM analysis failed: {e}")
-        summary = "Analysis unavailable"
-    
-    await ctx.report_progress(progress=60, total=100)
-    
-    # Step 4: Processing simulation
-    await ctx.info("Simulating data processing...")
-    await asyncio.sleep(1)  # Simulate processing time
-    
-    processed_data = {
-        "original_length": len(input_text),
-        "word_count": len(input_text.split()),
-        "summary": summary,
-        "processing_time": time.time() - demo_start
-    }
-    
-    await ctx.report_progress(progress=90, total=100)
-    
-    # Step 5: Final results
-    final_result = {
-        "demo_status": "completed",
-        "request_info": request_info,
-        "processed_data": processed_data,
-        "context_features_used": [
-            "logging (debug, info, warning)",
-            "progress_reporting",
-            "llm_sampling",
-            "request_information"
-        ]
-    }
-    
-    await ctx.report_progress(progress=100, total=100)
     await ctx.info("=== Comprehensive Context Demo Completed ===")
     
     return final_result
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint for per-tool, per-resource and per-client metrics."""
+    return PlainTextResponse(
+        metrics.render_prometheus() + scheduler.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+@mcp.custom_route("/metrics/clients", methods=["GET"])
+async def client_metrics_endpoint(request: Request) -> JSONResponse:
+    """Per-client scheduling counters: calls, rejections, queue wait and run time."""
+    return JSONResponse(scheduler.stats())
+
+@mcp.custom_route("/metrics/requests", methods=["GET"])
+async def recent_requests_endpoint(request: Request) -> JSONResponse:
+    """Phase timings of the most recent calls, keyed by request_id."""
+    return JSONResponse(metrics.recent_requests())
+
+@mcp.custom_route("/debug/profile", methods=["GET"])
+async def profile_endpoint(request: Request) -> PlainTextResponse:
+    """Sample all thread stacks for ?seconds=N and return collapsed stacks."""
+    try:
+        seconds = float(request.query_params.get("seconds", 5))
+    except ValueError:
+        return PlainTextResponse("seconds must be a number", status_code=400)
+    if not 0 < seconds < float("inf"):
+        return PlainTextResponse("seconds must be a positive number", status_code=400)
+    seconds = min(seconds, 60)
+    try:
+        stacks = await anyio.to_thread.run_sync(profiler.run, seconds)
+    except RuntimeError as e:
+        return PlainTextResponse(str(e), status_code=409)
+    return PlainTextResponse(stacks)
+
 if __name__ == "__main__":
-    mcp.run(transport='http')
\ No newline at end of file
+    # Large results and resources are compressed on the wire; small ones go out as-is.
+    # Each session keeps its last 1000 events, so a client that loses its connection
+    # resumes from its last event id instead of calling the tool again.
+    app = resumable_http_app(mcp, middleware=[ASGIMiddleware(CompressionMiddleware, minimum_size=1024)])
+    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
@@ -0,0 +1,245 @@
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import jsonschema
+import mcp.types
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ResourceError, ToolError
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+
+from structured import dumps, json_size_up_to
+
+SPILL_SCHEME = "spill"
+FETCH_TOOL = "fetch_spilled"
+# A structured result counted at under threshold / ESCAPE_MARGIN is not serialized to measure it;
+# the margin leaves room for string escapes, which the count leaves out
+ESCAPE_MARGIN = 2
+
+
+@dataclass
+class _Entry:
+    text: str
+    mime_type: str
+    tool: str
+    expires: float
+
+
+class SpillStore:
+    """Spilled payloads by id, dropped after `ttl` seconds or when over `max_chars` (oldest first)."""
+
+    def __init__(self, ttl: float = 600, max_chars: int = 256_000_000):
+        self.ttl = ttl
+        self.max_chars = max_chars
+        self.chars = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def put(self, text: str, mime_type: str, tool: str) -> str:
+        self._prune()
+        spill_id = secrets.token_urlsafe(12)
+        self._entries[spill_id] = _Entry(text, mime_type, tool, time.monotonic() + self.ttl)
+        self.chars += len(text)
+        while self.chars > self.max_chars and len(self._entries) > 1:
+            self.discard(next(iter(self._entries)))
+        return spill_id
+
+    def get(self, spill_id: str) -> _Entry:
+        self._prune()
+        entry = self._entries.get(spill_id)
+        if entry is None:
+            raise ResourceError(f"Spilled result {spill_id!r} not found or expired")
+        self._entries.move_to_end(spill_id)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for spill_id in [key for key, entry in self._entries.items() if entry.expires <= now]:
+            self.discard(spill_id)
+
+    def discard(self, spill_id: str) -> None:
+        entry = self._entries.pop(spill_id, None)
+        if entry is not None:
+            self.chars -= len(entry.text)
+
+
+def summarize(data: Any, text: str) -> dict[str, Any]:
+    """Shape of the result without its bulk: sizes of lists and strings, small values as-is."""
+    if isinstance(data, dict):
+        fields = {}
+        for key, value in data.items():
+            if isinstance(value, (list, dict)):
+                fields[key] = f"{type(value).__name__}[{len(value)}]"
+            elif isinstance(value, str) and len(value) > 80:
+                fields[key] = f"str[{len(value)}]"
+            else:
+                fields[key] = value
+        return {"fields": fields}
+    if isinstance(data, list):
+        return {"items": len(data)}
+    return {"lines": text.count("\n") + 1, "chars": len(text)}
+
+
+class ResultSpill(Middleware):
+    """Store tool results above `threshold` characters as a TTL-bound resource.
+
+    The client gets a compact handle instead: the resource URI, the full
+    size, a summary and a short preview. The full payload stays on the
+    server and can be read in ranges, as the resource
+    `spill://{id}/{offset}/{length}` or with the `fetch_spilled` tool for
+    LLM clients that only see tools; `spill://{id}` returns all of it.
+    Offsets count characters.
+
+    Place it before StructuredOnlyMiddleware and call `register(mcp)` to
+    add the resources and the tool.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 32_000,
+        ttl: float = 600,
+        max_chars: int = 256_000_000,
+        preview_chars: int = 500,
+        summarize: Callable[[Any, str], dict[str, Any]] = summarize,
+    ):
+        self.threshold = threshold
+        self.preview_chars = preview_chars
+        self.summarize = summarize
+        self.store = SpillStore(ttl=ttl, max_chars=max_chars)
+        self._validators: dict[str, Any] = {}
+
+    def register(self, server: FastMCP) -> None:
+        store = self.store
+        max_range = self.threshold
+
+        @server.resource(f"{SPILL_SCHEME}://{{spill_id}}", mime_type="text/plain")
+        def spilled_result(spill_id: str) -> str:
+            """The full payload of a spilled tool result."""
+            return store.get(spill_id).text
+
+        @server.resource(f"{SPILL_SCHEME}://{{spill_id}}/{{offset}}/{{length}}", mime_type="text/plain")
+        def spilled_range(spill_id: str, offset: int, length: int) -> str:
+            """`length` characters of a spilled tool result, starting at `offset`."""
+            offset, length = int(offset), int(length)
+            if offset < 0 or length < 0:
+                raise ResourceError("offset and length must not be negative")
+            return store.get(spill_id).text[offset : offset + length]
+
+        @server.tool(name=FETCH_TOOL)
+        def fetch_spilled(uri: str, offset: int = 0, length: int = max_range) -> dict:
+            """Read part of a large tool result that was returned as a spill:// handle."""
+            if length > max_range:
+                raise ToolError(f"length must be at most {max_range}")
+            if offset < 0 or length < 0:
+                raise ToolError("offset and length must not be negative")
+            try:
+                entry = store.get(_spill_id(uri))
+            except ResourceError as e:
+                raise ToolError(str(e)) from None
+            chunk = entry.text[offset : offset + length]
+            return {
+                "uri": uri,
+                "offset": offset,
+                "length": len(chunk),
+                "total": len(entry.text),
+                "next_offset": offset + len(chunk) if offset + len(chunk) < len(entry.text) else None,
+                "text": chunk,
+            }
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        result = await call_next(context)
+        name = context.message.name
+        if name == FETCH_TOOL or result.content and any(block.type != "text" for block in result.content):
+            return result
+
+        texts = [block.text for block in result.content]
+        if texts:
+            size = sum(len(text) for text in texts)
+            if size <= self.threshold:
+                return result
+            text = "\n".join(texts)
+        elif result.structured_content is not None:
+            # Structured-only: no serialized copy exists yet, so skip clearly small results on a count
+            if json_size_up_to(result.structured_content, self.threshold) * ESCAPE_MARGIN <= self.threshold:
+                return result
+            text = dumps(result.structured_content)
+            if len(text) <= self.threshold:
+                return result
+        else:
+            return result
+
+        data = result.structured_content
+        if isinstance(data, dict) and set(data) == {"result"}:
+            data = data["result"]
+        mime_type = "application/json" if result.structured_content is not None else "text/plain"
+        spill_id = self.store.put(text, mime_type, name)
+        uri = f"{SPILL_SCHEME}://{spill_id}"
+        handle = {
+            "spilled": True,
+            "uri": uri,
+            "tool": name,
+            "mime_type": mime_type,
+            "size": len(text),
+            "expires_in": self.store.ttl,
+            "summary": self.summarize(data, text),
+            "preview": text[: self.preview_chars],
+            "fetch": f"{FETCH_TOOL}(uri, offset, length) or resource {uri}/{{offset}}/{{length}}",
+        }
+
+        structured = None
+        if result.structured_content is not None:
+            structured = await self._structured_handle(context, name, handle)
+            if structured is None:
+                # The tool's output schema has no room for a handle; send the result as it is
+                self.store.discard(spill_id)
+                return result
+        return ToolResult(content=[mcp.types.TextContent(type="text", text=dumps(handle))], structured_content=structured)
+
+    async def _structured_handle(self, context: MiddlewareContext, name: str, handle: dict) -> dict | None:
+        """The handle shaped to satisfy the tool's output schema, if it can be."""
+        if name not in self._validators:
+            validator = None
+            ctx = context.fastmcp_context
+            if ctx is not None:
+                try:
+                    schema = (await ctx.fastmcp.get_tool(name)).output_schema
+                except Exception:
+                    schema = None
+                if schema is not None:
+                    validator = jsonschema.validators.validator_for(schema)(schema)
+            self._validators[name] = validator
+        validator = self._validators[name]
+        for candidate in (handle, {"result": handle}, {"result": dumps(handle)}):
+            if validator is None or validator.is_valid(candidate):
+                return candidate
+        return None
+
+
+async def read_spilled(client: Client, handle: dict | str, offset: int = 0, length: int | None = None) -> str:
+    """Read a spilled result, or `length` characters of it from `offset`.
+
+    `handle` is the handle dict a tool returned, or its URI.
+    """
+    uri = handle["uri"] if isinstance(handle, dict) else handle
+    if length is not None:
+        uri = f"{uri}/{offset}/{length}"
+    elif offset:
+        raise ValueError("offset needs a length")
+    contents = await client.read_resource(uri)
+    return contents[0].text
+
+
+def is_spilled(data: Any) -> bool:
+    return isinstance(data, dict) and data.get("spilled") is True and "uri" in data
+
+
+def _spill_id(uri: str) -> str:
+    prefix = f"{SPILL_SCHEME}://"
+    if not uri.startswith(prefix) or "/" in uri[len(prefix):]:
+        raise ToolError(f"Not a spilled result URI: {uri}")
+    return uri[len(prefix):]
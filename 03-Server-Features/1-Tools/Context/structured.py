@@ -0,0 +1,184 @@
+import contextvars
+import datetime
+import itertools
+from typing import Any
+
+import mcp.types
+import pydantic_core
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+try:
+    import orjson
+except ImportError:  # optional faster codec
+    orjson = None
+
+# Request `_meta` flag a client sets to skip the text copy of structured results
+STRUCTURED_ONLY_META = "structuredOnly"
+
+# Placeholder text block used while the server decides whether a copy is needed
+_DEFERRED_TEXT = "\x00deferred-structured-text"
+
+_deferred: contextvars.ContextVar[dict | None] = contextvars.ContextVar("deferred_text", default=None)
+
+
+def dumps(data: Any) -> str:
+    """Serialize a tool result to JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, default=pydantic_core.to_jsonable_python, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            pass
+    return pydantic_core.to_json(data, fallback=str).decode()
+
+
+def estimate_json_size(data: Any, sample: int = 8) -> int:
+    """Approximate length of `dumps(data)` without serializing it.
+
+    Lists and dicts longer than `sample` items are extrapolated from their
+    first items, so the cost does not grow with the size of the result.
+    """
+    if isinstance(data, str):
+        return len(data) + 2
+    if isinstance(data, dict):
+        if not data:
+            return 2
+        head = list(itertools.islice(data.items(), sample))
+        size = sum(len(str(key)) + 4 + estimate_json_size(value, sample) for key, value in head)
+        return 2 + size * len(data) // len(head)
+    if isinstance(data, (list, tuple)):
+        if not data:
+            return 2
+        head = data[:sample]
+        return 2 + sum(estimate_json_size(item, sample) + 1 for item in head) * len(data) // len(head)
+    if data is None or isinstance(data, bool):
+        return 5
+    if isinstance(data, (int, float)):
+        return len(repr(data))
+    return len(str(data)) + 2
+
+
+def json_size_up_to(data: Any, limit: int) -> int:
+    """Length of `dumps(data)` not counting string escapes, exact enough to compare with `limit`.
+
+    Unlike `estimate_json_size` every item is counted, so one large value
+    among small ones is not missed; counting stops once the total passes
+    `limit`, so the cost is bounded by `limit` rather than by the result.
+    """
+    size = 0
+    stack = [data]
+    while stack and size <= limit:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            # Braces, colons and commas; keys are counted as strings
+            size += 2 * len(item) + 1 if item else 2
+            stack.extend(str(key) for key in item)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += len(item) + 1 if item else 2
+            stack.extend(item)
+        elif item is None or isinstance(item, bool):
+            size += 4
+        elif isinstance(item, (int, float)):
+            size += len(repr(item))
+        else:
+            size += len(str(item)) + 2
+    return size
+
+
+def json_serializer(data: Any) -> str:
+    """`tool_serializer` for FastMCP that can defer the text copy of a result.
+
+    Outside a structured-only request this is just a faster `dumps()`.
+    """
+    deferred = _deferred.get()
+    if deferred is None:
+        return dumps(data)
+    deferred["data"] = data
+    return _DEFERRED_TEXT
+
+
+class StructuredOnlyMiddleware(Middleware):
+    """Serialize structured tool results once for clients that opt out of the text copy.
+
+    By default a dict result is sent twice: as structured content and as a
+    JSON string in a text block. When the request's `_meta` carries
+    `structuredOnly: true`, the text block is never built, so the result
+    is serialized only once, by the transport. Results without structured
+    content still get their text block, serialized on demand.
+
+    Requires `tool_serializer=json_serializer` on the server.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        if not _wants_structured_only(context):
+            return await call_next(context)
+
+        deferred = {}
+        token = _deferred.set(deferred)
+        try:
+            result = await call_next(context)
+        finally:
+            _deferred.reset(token)
+
+        if "data" in deferred:
+            if result.structured_content is not None:
+                result.content = [block for block in result.content if not _is_deferred(block)]
+            else:
+                for block in result.content:
+                    if _is_deferred(block):
+                        block.text = dumps(deferred["data"])
+        return result
+
+
+async def call_tool_structured(
+    client: Client,
+    name: str,
+    arguments: dict[str, Any] | None = None,
+    timeout: float | None = None,
+) -> dict[str, Any] | list[mcp.types.ContentBlock]:
+    """Call a tool asking the server to skip the redundant text copy.
+
+    Returns the structured content as a plain dict, or the content blocks
+    when the tool has no structured output.
+    """
+    request = mcp.types.ClientRequest(
+        mcp.types.CallToolRequest(
+            method="tools/call",
+            params=mcp.types.CallToolRequestParams(
+                name=name,
+                arguments=arguments or {},
+                _meta={STRUCTURED_ONLY_META: True},
+            ),
+        )
+    )
+    result = await client.session.send_request(
+        request,
+        mcp.types.CallToolResult,
+        request_read_timeout_seconds=datetime.timedelta(seconds=timeout) if timeout else None,
+    )
+    if result.isError:
+        raise ToolError(result.content[0].text if result.content else f"Tool {name!r} failed")
+    if result.structuredContent is not None:
+        return result.structuredContent
+    return result.content
+
+
+def _wants_structured_only(context: MiddlewareContext) -> bool:
+    ctx = context.fastmcp_context
+    if ctx is None:
+        return False
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        return False
+    return bool(meta is not None and getattr(meta, STRUCTURED_ONLY_META, False))
+
+
+def _is_deferred(block) -> bool:
+    return getattr(block, "type", None) == "text" and block.text == _DEFERRED_TEXT
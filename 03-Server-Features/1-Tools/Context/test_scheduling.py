@@ -0,0 +1,143 @@
+"""FairScheduler: client keys, rate limits, fair queuing and per-client concurrency caps.
+
+Run with `python -m pytest test_scheduling.py` from this directory.
+"""
+import asyncio
+import socket
+
+import pytest
+import uvicorn
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+
+from scheduling import FairScheduler, Quota
+
+
+def build_server(quota: Quota | None = None, **kwargs) -> tuple[FastMCP, FairScheduler]:
+    scheduler = FairScheduler(default_quota=quota or Quota(rate=1000, burst=1000), **kwargs)
+    server = FastMCP(name="Test-scheduling", middleware=[scheduler])
+
+    @server.tool
+    def add(a: int, b: int) -> int:
+        """Adds two integer numbers together."""
+        return a + b
+
+    @server.tool
+    async def wait(ms: int) -> int:
+        """Sleeps for `ms` milliseconds."""
+        await asyncio.sleep(ms / 1000)
+        return ms
+
+    return server, scheduler
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def call_from_new_clients(targets: list) -> None:
+    for target in targets:
+        async with Client(target) as client:
+            assert (await client.call_tool("add", {"a": 1, "b": 2})).data == 3
+
+
+def test_http_clients_without_meta_are_scheduled_apart():
+    server, scheduler = build_server()
+    port = free_port()
+
+    async def run():
+        uv = uvicorn.Server(uvicorn.Config(server.http_app(), host="127.0.0.1", port=port, log_level="critical"))
+        task = asyncio.create_task(uv.serve())
+        while not uv.started:
+            await asyncio.sleep(0.05)
+        try:
+            await call_from_new_clients([f"http://127.0.0.1:{port}/mcp"] * 2)
+        finally:
+            uv.should_exit = True
+            await task
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+    assert len(stats) == 2
+    assert all(values["calls"] == 1 for values in stats.values())
+
+
+def test_in_memory_clients_without_meta_are_scheduled_apart():
+    server, scheduler = build_server()
+    asyncio.run(call_from_new_clients([server, server]))
+    assert len(scheduler.stats()) == 2
+
+
+def test_idle_clients_are_forgotten():
+    # A one-token bucket refills in a millisecond
+    server, scheduler = build_server(Quota(rate=1000, burst=1), idle_timeout=0)
+
+    async def run():
+        await call_from_new_clients([server])
+        await asyncio.sleep(0.01)
+        await call_from_new_clients([server])
+
+    asyncio.run(run())
+    assert len(scheduler.stats()) == 1
+
+
+def test_burst_beyond_the_bucket_is_rejected():
+    server, scheduler = build_server(Quota(rate=0.01, burst=2))
+
+    async def run():
+        async with Client(server) as client:
+            for _ in range(2):
+                assert (await client.call_tool("add", {"a": 1, "b": 2})).data == 3
+            with pytest.raises(ToolError, match="Rate limit exceeded"):
+                await client.call_tool("add", {"a": 1, "b": 2})
+
+    asyncio.run(run())
+    [stats] = scheduler.stats().values()
+    assert stats["calls"] == 2
+    assert stats["rejected"] == 1
+
+
+def test_quiet_client_overtakes_a_noisy_backlog():
+    server, _ = build_server(max_concurrency=1)
+    noisy_done = 0
+
+    async def noisy_call(client: Client) -> None:
+        nonlocal noisy_done
+        await client.call_tool("wait", {"ms": 50})
+        noisy_done += 1
+
+    async def run() -> int:
+        async with Client(server) as noisy, Client(server) as quiet:
+            burst = [asyncio.create_task(noisy_call(noisy)) for _ in range(10)]
+            await asyncio.sleep(0.02)
+            await quiet.call_tool("add", {"a": 1, "b": 2})
+            overtaken = noisy_done
+            await asyncio.gather(*burst)
+        return overtaken
+
+    # First come, first served would run all ten noisy calls first
+    assert asyncio.run(run()) <= 2
+
+
+def test_per_client_concurrency_cap():
+    server, scheduler = build_server(Quota(rate=1000, burst=1000, max_concurrency=2), max_concurrency=8)
+    running = peak = 0
+
+    @server.tool
+    async def hold() -> None:
+        """Sleeps briefly while counting concurrent calls."""
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    async def run():
+        async with Client(server) as client:
+            await asyncio.gather(*(client.call_tool("hold") for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert sum(values["calls"] for values in scheduler.stats().values()) == 6
@@ -0,0 +1,60 @@
+"""ResultSpill sizes structured-only results by every item, not by a sample.
+
+Run with `python -m pytest test_spill.py` from this directory.
+"""
+import asyncio
+import json
+
+from fastmcp import Client, FastMCP
+
+from spill import ResultSpill, is_spilled, read_spilled
+from structured import StructuredOnlyMiddleware, call_tool_structured, json_serializer
+
+THRESHOLD = 1000
+
+
+def build_server() -> FastMCP:
+    spill = ResultSpill(threshold=THRESHOLD)
+    server = FastMCP(
+        name="Test-spill",
+        middleware=[spill, StructuredOnlyMiddleware()],
+        tool_serializer=json_serializer,
+    )
+    spill.register(server)
+
+    @server.tool
+    def small_fields_then_blob(size: int) -> dict:
+        """Eight small fields followed by one large string."""
+        return {**{f"field{i}": i for i in range(8)}, "blob": "x" * size}
+
+    @server.tool
+    def small_rows_then_record(size: int) -> dict:
+        """Eight small rows followed by one large record."""
+        return {"rows": [{"id": i} for i in range(8)] + [{"id": 8, "payload": "y" * size}]}
+
+    return server
+
+
+async def call_structured_only(name: str, size: int) -> tuple[dict, str | None]:
+    async with Client(build_server()) as client:
+        result = await call_tool_structured(client, name, {"size": size})
+        full = await read_spilled(client, result) if is_spilled(result) else None
+    return result, full
+
+
+def test_one_large_value_after_small_fields_is_spilled():
+    result, full = asyncio.run(call_structured_only("small_fields_then_blob", 20 * THRESHOLD))
+    assert is_spilled(result)
+    assert json.loads(full)["blob"] == "x" * 20 * THRESHOLD
+
+
+def test_one_large_record_after_small_rows_is_spilled():
+    result, full = asyncio.run(call_structured_only("small_rows_then_record", 20 * THRESHOLD))
+    assert is_spilled(result)
+    assert len(json.loads(full)["rows"]) == 9
+
+
+def test_small_structured_result_is_sent_as_is():
+    result, _ = asyncio.run(call_structured_only("small_rows_then_record", 10))
+    assert not is_spilled(result)
+    assert result["rows"][-1]["payload"] == "y" * 10